@@ -99,7 +99,12 @@ KPI_PERIODO_DIAS: int = 90
 
 OUTPUT_FORMATS: list[str] = ["xlsx"]
 
-EXCEL_ENGINE: str = "openpyxl"
+# Opciones de xlsxwriter (el escritor de main.py usa su API directamente).
+# constant_memory: cada fila se vuelca a disco al terminarla, la memoria
+# no crece con el tamano de la hoja. Sin conversion automatica a links.
+EXCEL_ENGINE_KWARGS: dict[str, dict[str, bool]] = {
+    "options": {"constant_memory": True, "strings_to_urls": False},
+}
 
 EXCEL_NOMBRES: dict[str, str] = {
     "auditoria": "00_auditoria_cxc",
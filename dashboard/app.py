@@ -17,6 +17,12 @@ import streamlit as st
 ROOT = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(ROOT))
 
+from dashboard.data_loader import (
+    limpiar_cache_datos,
+    precargar_en_segundo_plano,
+    reiniciar_registro_cargas,
+)
+
 # ======================================================================
 # CONFIGURACIÓN GLOBAL DE LA APP
 # ======================================================================
@@ -35,106 +41,13 @@ st.set_page_config(
 # ======================================================================
 # ESTILOS GLOBALES
 # ======================================================================
-st.markdown(
-    """
-    <style>
-        /* Tipografía general */
-        html, body, [class*="css"] {
-            font-family: 'Segoe UI', sans-serif;
-        }
-
-        /* Header principal */
-        .main-header {
-            background: linear-gradient(135deg, #1e3a5f 0%, #2d6a9f 100%);
-            padding: 1.5rem 2rem;
-            border-radius: 10px;
-            margin-bottom: 1.5rem;
-        }
-        .main-header h1 {
-            color: white;
-            margin: 0;
-            font-size: 1.8rem;
-            font-weight: 700;
-        }
-        .main-header p {
-            color: #b8d4f0;
-            margin: 0.3rem 0 0 0;
-            font-size: 0.95rem;
-        }
-
-        /* Tarjetas de métricas */
-        [data-testid="metric-container"] {
-            background: white;
-            border: 1px solid #e2e8f0;
-            border-radius: 10px;
-            padding: 1rem;
-            box-shadow: 0 1px 3px rgba(0,0,0,0.08);
-        }
-        [data-testid="metric-container"]:hover {
-            box-shadow: 0 4px 12px rgba(0,0,0,0.12);
-            transform: translateY(-1px);
-            transition: all 0.2s ease;
-        }
-
-        /* Sidebar */
-        [data-testid="stSidebar"] {
-            background: #f8fafc;
-            border-right: 1px solid #e2e8f0;
-        }
-
-        /* Tablas */
-        [data-testid="stDataFrame"] {
-            border-radius: 8px;
-            overflow: hidden;
-        }
-
-        /* Botón de refresh */
-        .stButton > button {
-            border-radius: 8px;
-            border: 1px solid #2d6a9f;
-            color: #2d6a9f;
-            background: white;
-            font-weight: 600;
-            transition: all 0.2s;
-        }
-        .stButton > button:hover {
-            background: #2d6a9f;
-            color: white;
-        }
-
-        /* Alertas personalizadas */
-        .alert-critico {
-            background: #fef2f2;
-            border-left: 4px solid #ef4444;
-            padding: 0.75rem 1rem;
-            border-radius: 0 8px 8px 0;
-            margin: 0.5rem 0;
-            color: #7f1d1d;
-        }
-        .alert-warning {
-            background: #fffbeb;
-            border-left: 4px solid #f59e0b;
-            padding: 0.75rem 1rem;
-            border-radius: 0 8px 8px 0;
-            margin: 0.5rem 0;
-            color: #78350f;
-        }
-        .alert-ok {
-            background: #f0fdf4;
-            border-left: 4px solid #22c55e;
-            padding: 0.75rem 1rem;
-            border-radius: 0 8px 8px 0;
-            margin: 0.5rem 0;
-            color: #14532d;
-        }
-
-        /* Ocultar footer de Streamlit */
-        footer { visibility: hidden; }
-        #MainMenu { visibility: hidden; }
-    </style>
-    """,
-    unsafe_allow_html=True,
-)
+@st.cache_resource
+def _leer_css() -> str:
+    """Lee la hoja de estilos una sola vez por proceso."""
+    return (ROOT / "dashboard" / "static" / "style.css").read_text(encoding="utf-8")
+
+
+st.markdown(f"<style>{_leer_css()}</style>", unsafe_allow_html=True)
 
 # ======================================================================
 # NAVEGACIÓN MULTIPÁGINA
@@ -167,7 +80,8 @@ with st.sidebar:
     st.divider()
 
     if st.button("🔄 Refrescar datos", use_container_width=True):
-        st.cache_data.clear()
+        limpiar_cache_datos()
+        st.session_state["_precarga_lanzada"] = False
         st.success("Caché limpiado. Recargando...")
         st.rerun()
 
@@ -178,4 +92,12 @@ with st.sidebar:
 # ======================================================================
 # EJECUTAR PÁGINA ACTIVA
 # ======================================================================
-pg.run()
\ No newline at end of file
+reiniciar_registro_cargas()
+pg.run()
+
+# ======================================================================
+# PRECARGA DE LAS DEMÁS PÁGINAS (una vez por sesión)
+# ======================================================================
+if not st.session_state.get("_precarga_lanzada", False):
+    st.session_state["_precarga_lanzada"] = True
+    precargar_en_segundo_plano()
@@ -12,16 +12,32 @@ o variable global con timestamp). El resto del archivo no cambia.
 Uso desde cualquier página:
     from dashboard.data_loader import cargar_kpis, cargar_analytics
     kpis = cargar_kpis()
+
+Las páginas que necesitan varias vistas a la vez usan ``cargar_todo()``,
+que lanza en paralelo, sobre un pool compartido, solo los análisis pedidos:
+    from dashboard.data_loader import cargar_todo
+    datos = cargar_todo(("kpis", "analytics"))
+    kpis = datos["kpis"]
 """
 
 from __future__ import annotations
 
+import logging
+import os
 import sys
+import tempfile
+import threading
+import time
+from dataclasses import replace
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, Iterable
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
 import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 
 # Asegurar que la raiz del proyecto este en el path
 ROOT = Path(__file__).resolve().parent.parent
@@ -40,12 +56,412 @@ from src.data_transformer import DataTransformer
 from src.kpis import generar_kpis
 from src.reporte_cxc import generar_reporte_cxc
 
+logger = logging.getLogger(__name__)
+
+# Segundo nivel de cache: copia Arrow IPC de los datos crudos en disco,
+# compartida por todos los procesos de Streamlit.
+_CACHE_DISCO: Path = ROOT / ".cache" / "cxc.feather"
+_CACHE_DISCO_TTL: int = 3600
+
+# DataFrame vacio compartido que se devuelve cuando falta una vista. Es
+# solo lectura: nadie debe agregarle columnas ni filas.
+_VACIO: pd.DataFrame = pd.DataFrame()
+
+# Columnas de texto con pocos valores distintos que se repiten en muchas
+# filas; en las vistas del dashboard se guardan como ``category``.
+_COLUMNAS_CATEGORICAS: tuple[str, ...] = (
+    "NOMBRE_CLIENTE",
+    "VENDEDOR",
+    "RANGO_ANTIGUEDAD",
+    "ESTATUS_VENCIMIENTO",
+    "CLASIFICACION",
+    "CONCEPTO",
+    "CATEGORIA_MORA",
+    "ALERTA",
+    "TIPO_IMPTE",
+    "MOTIVO",
+)
+
+# Columnas que la pagina de auditoria muestra de cada hallazgo, en el
+# orden de la tabla. El resultado cacheado se recorta a ellas para no
+# guardar copias del DataFrame crudo completo.
+COLUMNAS_AUDITORIA: dict[str, tuple[str, ...]] = {
+    "importes_atipicos": (
+        "NOMBRE_CLIENTE", "FOLIO", "CONCEPTO", "FECHA_EMISION",
+        "IMPORTE", "ZSCORE_IMPORTE", "MOTIVO",
+    ),
+    "sin_tipo_cliente": (
+        "FOLIO", "CONCEPTO", "FECHA_EMISION", "IMPORTE",
+        "NOMBRE_CLIENTE", "TIPO_CLIENTE", "VENDEDOR", "MOTIVO",
+    ),
+    "sin_vendedor": (
+        "FOLIO", "CONCEPTO", "FECHA_EMISION", "IMPORTE",
+        "NOMBRE_CLIENTE", "TIPO_CLIENTE", "VENDEDOR", "MOTIVO",
+    ),
+    "documentos_cancelados": (
+        "NOMBRE_CLIENTE", "FOLIO", "CONCEPTO", "FECHA_EMISION",
+        "IMPORTE", "DIAS_HASTA_CANCELACION", "MOTIVO",
+    ),
+    "moras_atipicas": (
+        "NOMBRE_CLIENTE", "FOLIO", "CONCEPTO", "FECHA_VENCIMIENTO",
+        "IMPORTE", "DELTA_MORA", "ZSCORE_DELTA_MORA",
+    ),
+}
+
+
+# ======================================================================
+# OPTIMIZACION DE TIPOS
+# ======================================================================
+
+def _optimizar_tipos(vistas: dict[str, pd.DataFrame]) -> dict[str, pd.DataFrame]:
+    """Reduce la memoria de las vistas que consumen las páginas.
+
+    Convierte a ``category`` las columnas de ``_COLUMNAS_CATEGORICAS`` y
+    reduce los enteros al tipo más pequeño que los contiene. Los
+    importes se dejan en float64 para no perder precisión en centavos.
+    Las columnas numéricas que llegan con memoria no contigua (por
+    ejemplo, una rebanada de un bloque en orden Fortran) se copian a un
+    arreglo contiguo para que las sumas de las páginas no recorran la
+    memoria a saltos.
+
+    Solo se aplica a vistas terminales (KPIs, analytics y la copia del
+    reporte que reciben las páginas): el reporte original y los datos
+    crudos alimentan a los motores de src/, que rellenan nulos con
+    valores nuevos y agrupan por estas columnas.
+
+    Args:
+        vistas: Diccionario de DataFrames generado por un motor.
+
+    Returns:
+        dict[str, pd.DataFrame]: El mismo diccionario con tipos reducidos.
+    """
+    for df in vistas.values():
+        for col in _COLUMNAS_CATEGORICAS:
+            if col in df.columns and df[col].dtype == object:
+                df[col] = df[col].astype("category")
+        for col in df.select_dtypes(include="integer").columns:
+            df[col] = pd.to_numeric(df[col], downcast="integer")
+        for col in df.select_dtypes(include="number").columns:
+            valores = df[col].to_numpy()
+            if not valores.flags.c_contiguous:
+                df[col] = np.ascontiguousarray(valores)
+    return vistas
+
+
+# ======================================================================
+# ACCESO A VISTAS
+# ======================================================================
+
+def obtener_vista(datos: dict[str, Any], llave: str) -> pd.DataFrame:
+    """Devuelve una vista del diccionario o un DataFrame vacio compartido.
+
+    Evita construir un ``pd.DataFrame()`` nuevo como valor por defecto en
+    cada ``dict.get`` de las paginas.
+
+    Args:
+        datos: Diccionario devuelto por un cargador.
+        llave: Nombre de la vista.
+
+    Returns:
+        pd.DataFrame: La vista, o ``_VACIO`` si no existe.
+    """
+    return datos.get(llave, _VACIO)
+
+
+def buscar_kpi(indice: dict[str, dict[str, Any]], nombre: str) -> dict[str, Any]:
+    """Devuelve la fila del primer KPI cuyo nombre contiene ``nombre``.
+
+    Args:
+        indice: Llave ``indice_kpis`` de ``cargar_kpis``.
+        nombre: Texto a buscar, sin distinguir mayusculas.
+
+    Returns:
+        dict[str, Any]: Columnas de la fila (KPI, VALOR, UNIDAD,
+        INTERPRETACION), o un diccionario vacio si no hay coincidencia.
+    """
+    nombre = nombre.lower()
+    return next((fila for llave, fila in indice.items() if nombre in llave), {})
+
+
+# ======================================================================
+# RESUMENES PRECALCULADOS
+# ======================================================================
+# Agregados que las paginas leen en cada rerun. Se calculan una sola
+# vez dentro de los cargadores cacheados y viajan en el mismo diccionario.
+
+def _resumen_antiguedad(antiguedad: pd.DataFrame) -> dict[str, float]:
+    """Totales globales de la tabla de antiguedad de cartera.
+
+    Args:
+        antiguedad: Vista de antiguedad con RANGO_ANTIGUEDAD,
+            IMPORTE_TOTAL y NUM_DOCUMENTOS.
+
+    Returns:
+        dict[str, float]: ``total_cartera``, ``n_documentos``,
+        ``vencida`` (todo excepto el rango "Vigente") y ``pct_vencido``.
+    """
+    if antiguedad.empty or "IMPORTE_TOTAL" not in antiguedad.columns:
+        return {"total_cartera": 0.0, "n_documentos": 0, "vencida": 0.0, "pct_vencido": 0.0}
+
+    total_cartera = float(antiguedad["IMPORTE_TOTAL"].sum())
+    n_documentos = int(antiguedad["NUM_DOCUMENTOS"].sum()) if "NUM_DOCUMENTOS" in antiguedad.columns else 0
+    vencida = float(
+        antiguedad.loc[antiguedad["RANGO_ANTIGUEDAD"] != "Vigente", "IMPORTE_TOTAL"].sum()
+    )
+    pct_vencido = (vencida / total_cartera * 100) if total_cartera > 0 else 0.0
+    return {
+        "total_cartera": total_cartera,
+        "n_documentos": n_documentos,
+        "vencida": vencida,
+        "pct_vencido": pct_vencido,
+    }
+
+
+def _estadisticas_concentracion(concentracion: pd.DataFrame) -> dict[str, Any]:
+    """Conteos de la curva de concentracion ABC.
+
+    Args:
+        concentracion: Vista de concentracion con SALDO y CLASIFICACION.
+
+    Returns:
+        dict[str, Any]: ``saldo_total``, ``total_clientes``, ``n_clase_a``
+        y ``pct_concentracion``. Los dos ultimos son None si la vista no
+        trae clasificacion ABC.
+    """
+    saldo_total = 0.0
+    if not concentracion.empty and "SALDO" in concentracion.columns:
+        saldo_total = float(concentracion["SALDO"].sum())
+
+    total_clientes = len(concentracion)
+    n_clase_a = None
+    pct_concentracion = None
+    if not concentracion.empty and "CLASIFICACION" in concentracion.columns:
+        n_clase_a = int((concentracion["CLASIFICACION"] == "A").sum())
+        pct_concentracion = round(n_clase_a / total_clientes * 100, 1) if total_clientes else 0
+
+    return {
+        "saldo_total": saldo_total,
+        "total_clientes": total_clientes,
+        "n_clase_a": n_clase_a,
+        "pct_concentracion": pct_concentracion,
+    }
+
+
+def _indice_kpis(resumen: pd.DataFrame) -> dict[str, dict[str, Any]]:
+    """Indexa el resumen de KPIs por nombre en minusculas.
+
+    Args:
+        resumen: Vista ``kpis_resumen`` con una fila por indicador.
+
+    Returns:
+        dict[str, dict[str, Any]]: ``{kpi_en_minusculas: fila}``.
+    """
+    if resumen.empty or "KPI" not in resumen.columns:
+        return {}
+    return {str(fila["KPI"]).lower(): fila for fila in resumen.to_dict("records")}
+
+
+def _top_concentracion(concentracion: pd.DataFrame, n: int = 10) -> pd.DataFrame:
+    """Primeros ``n`` clientes de la curva de concentracion.
+
+    ``generar_kpis`` ya entrega la curva ordenada por saldo descendente
+    (el orden completo es necesario para el porcentaje acumulado), asi
+    que basta con tomar las primeras filas una sola vez.
+
+    Args:
+        concentracion: Vista de concentracion ordenada por saldo.
+        n: Numero de clientes a conservar.
+
+    Returns:
+        pd.DataFrame: Las primeras ``n`` filas de la vista.
+    """
+    return concentracion.head(n)
+
+
+def _resumen_abc(concentracion: pd.DataFrame) -> pd.DataFrame:
+    """Clientes y saldo por clase ABC con su peso sobre el total.
+
+    Args:
+        concentracion: Vista de concentracion con NOMBRE_CLIENTE, SALDO
+            y CLASIFICACION.
+
+    Returns:
+        pd.DataFrame: Una fila por clase con CLIENTES, SALDO, PCT_CLIENTES
+        y PCT_SALDO. Vacio si la vista no trae clasificacion.
+    """
+    if concentracion.empty or "CLASIFICACION" not in concentracion.columns:
+        return _VACIO
+
+    abc = concentracion.groupby("CLASIFICACION", observed=True).agg(
+        CLIENTES=("NOMBRE_CLIENTE", "count"),
+        SALDO=("SALDO", "sum"),
+    ).reset_index()
+
+    total_saldo = concentracion["SALDO"].sum()
+    total_clientes = len(concentracion)
+    abc["PCT_CLIENTES"] = abc["CLIENTES"] / total_clientes * 100 if total_clientes > 0 else 0.0
+    abc["PCT_SALDO"] = abc["SALDO"] / total_saldo * 100 if total_saldo > 0 else 0.0
+    return abc
+
+
+def _cargos_vivos(abiertos: pd.DataFrame) -> pd.DataFrame:
+    """Movimientos abiertos que son cargos (``TIPO_IMPTE == "C"``).
+
+    Args:
+        abiertos: Vista ``movimientos_abiertos_cxc`` del reporte.
+
+    Returns:
+        pd.DataFrame: Solo los cargos; la vista completa si no trae
+        TIPO_IMPTE.
+    """
+    if abiertos.empty or "TIPO_IMPTE" not in abiertos.columns:
+        return abiertos
+    return abiertos[abiertos["TIPO_IMPTE"] == "C"]
+
+
+def _top_vencido(morosidad: pd.DataFrame, n: int = 10) -> pd.DataFrame:
+    """Clientes con mayor saldo vencido.
+
+    Args:
+        morosidad: Vista de morosidad por cliente con SALDO_VENCIDO.
+        n: Numero de clientes a conservar.
+
+    Returns:
+        pd.DataFrame: Hasta ``n`` clientes con saldo vencido positivo,
+        de mayor a menor.
+    """
+    if morosidad.empty or "SALDO_VENCIDO" not in morosidad.columns:
+        return _VACIO
+    return morosidad[morosidad["SALDO_VENCIDO"] > 0].nlargest(n, "SALDO_VENCIDO")
+
+
+def _resumen_moras_atipicas(moras: pd.DataFrame) -> pd.DataFrame:
+    """Agrupa los cargos con mora atipica por cliente.
+
+    Args:
+        moras: Cargos con mora atipica (``AuditResult.moras_atipicas``).
+
+    Returns:
+        pd.DataFrame: NOMBRE_CLIENTE, NUM_DOCS, IMPORTE_TOTAL y DIAS_MAX,
+        de mayor a menor importe; vacio si faltan columnas.
+    """
+    if moras.empty or not {"NOMBRE_CLIENTE", "IMPORTE", "DELTA_MORA"} <= set(moras.columns):
+        return _VACIO
+    return (
+        moras.groupby("NOMBRE_CLIENTE", sort=False, observed=True)
+        .agg(
+            NUM_DOCS=("IMPORTE", "count"),
+            IMPORTE_TOTAL=("IMPORTE", "sum"),
+            DIAS_MAX=("DELTA_MORA", "max"),
+        )
+        .reset_index()
+        .sort_values("IMPORTE_TOTAL", ascending=False)
+    )
+
+
+# ======================================================================
+# CACHE EN DISCO (ARROW IPC)
+# ======================================================================
+
+def _leer_cache_disco() -> tuple[pd.DataFrame, float] | None:
+    """Lee los datos crudos del archivo Arrow si existe y sigue vigente.
+
+    Returns:
+        tuple[pd.DataFrame, float] | None: Datos crudos y la fecha de su
+        extraccion (``st_mtime`` del archivo), o None si no hay archivo,
+        expiró o no se pudo leer.
+    """
+    try:
+        extraido = _CACHE_DISCO.stat().st_mtime
+    except FileNotFoundError:
+        return None
+    if time.time() - extraido >= _CACHE_DISCO_TTL:
+        return None
+    try:
+        df = pd.read_feather(_CACHE_DISCO)
+    except Exception as e:
+        logger.warning("No se pudo leer la cache en disco %s: %s", _CACHE_DISCO, e)
+        return None
+    logger.info("Datos crudos leidos de cache en disco (%d filas)", len(df))
+    return df, extraido
+
+
+def _escribir_cache_disco(df: pd.DataFrame) -> None:
+    """Guarda los datos crudos como Arrow IPC de forma atomica.
+
+    Escribe primero en un temporal del mismo directorio y lo renombra
+    con ``os.replace``, de modo que otro proceso nunca lee un archivo a
+    medio escribir. Un fallo al escribir solo se registra: la cache en
+    disco es una optimizacion y no debe impedir la carga.
+
+    Args:
+        df: Datos crudos devueltos por el DataTransformer.
+    """
+    tmp_path: str | None = None
+    try:
+        _CACHE_DISCO.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(
+            dir=_CACHE_DISCO.parent, prefix=_CACHE_DISCO.stem, suffix=".tmp",
+        )
+        os.close(fd)
+        df.reset_index(drop=True).to_feather(tmp_path)
+        os.replace(tmp_path, _CACHE_DISCO)
+        tmp_path = None
+    except Exception as e:
+        logger.warning("No se pudo escribir la cache en disco %s: %s", _CACHE_DISCO, e)
+    finally:
+        if tmp_path is not None:
+            Path(tmp_path).unlink(missing_ok=True)
+
+
+def invalidar_cache_disco() -> None:
+    """Elimina la copia en disco para forzar una nueva lectura de Firebird."""
+    _CACHE_DISCO.unlink(missing_ok=True)
+
 
 # ======================================================================
 # CARGA DE DATOS PRINCIPAL
 # ======================================================================
 
-@st.cache_data(ttl=3600)
+@st.cache_resource(ttl=3600, show_spinner=False)
+def _extraer_datos_crudos() -> tuple[pd.DataFrame, float]:
+    """Obtiene los datos crudos y la fecha en que se extrajeron.
+
+    Lee la copia en disco si sigue vigente; si no, consulta Firebird y
+    la reescribe. La fecha es la del archivo leido o la de la consulta,
+    de modo que cambia con cada extraccion aunque la escritura a disco
+    falle.
+
+    Returns:
+        tuple[pd.DataFrame, float]: Datos crudos y su marca de tiempo.
+    """
+    leido = _leer_cache_disco()
+    if leido is not None:
+        return leido
+
+    connector = FirebirdConnector(FIREBIRD_CONFIG)
+    transformer = DataTransformer(connector)
+    df = transformer.get_master_cxc_data()
+    extraido = time.time()
+    _escribir_cache_disco(df)
+    return df, extraido
+
+
+def _datos_crudos_vigentes() -> tuple[pd.DataFrame, float]:
+    """Devuelve los datos crudos en memoria mientras no rebasen 1 hora.
+
+    El TTL de ``st.cache_resource`` cuenta desde que el recurso se creó,
+    no desde la extraccion: una copia en disco leida a los 59 minutos
+    seguiria en memoria otra hora completa. Por eso la edad se revisa
+    contra la fecha de extraccion en cada acceso.
+    """
+    df, extraido = _extraer_datos_crudos()
+    if time.time() - extraido >= _CACHE_DISCO_TTL:
+        _extraer_datos_crudos.clear()
+        df, extraido = _extraer_datos_crudos()
+    return df, extraido
+
+
 def cargar_datos_crudos() -> pd.DataFrame:
     """Extrae y transforma los datos desde Firebird en memoria.
 
@@ -53,74 +469,435 @@ def cargar_datos_crudos() -> pd.DataFrame:
     de cuentas por cobrar sin exponer la logica a nivel de sentencias
     SQL en la base de datos.
 
+    Se cachea como recurso: todas las sesiones comparten el mismo
+    DataFrame por referencia en lugar de deserializar una copia en
+    cada acceso. Por eso debe tratarse como solo lectura; los motores
+    de src/ ya trabajan sobre una copia propia.
+
+    La extraccion completa se respalda ademas en un archivo Arrow IPC
+    (``.cache/cxc.feather``). Un proceso nuevo de Streamlit, o uno cuya
+    cache en memoria expiro, lo lee en lugar de volver a consultar
+    Firebird. En memoria o en disco, los datos tienen como maximo 1 hora
+    desde su extraccion.
+
     Returns:
         pd.DataFrame: Conjunto de datos transaccional maestro.
     """
-    connector = FirebirdConnector(FIREBIRD_CONFIG)
-    transformer = DataTransformer(connector)
-    return transformer.get_master_cxc_data()
+    return _datos_crudos_vigentes()[0]
+
+
+def _version_datos() -> float:
+    """Devuelve la version de los datos crudos vigentes.
+
+    Asegura primero que el DataFrame crudo este cargado y usa la fecha
+    de su extraccion como version. Cada nueva extraccion la cambia, asi
+    que las vistas derivadas cacheadas con la version anterior dejan de
+    usarse aunque su TTL no haya vencido.
+
+    Returns:
+        float: Marca de tiempo de la extraccion vigente.
+    """
+    return _datos_crudos_vigentes()[1]
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _cargar_reporte(version: float) -> dict[str, pd.DataFrame]:
+    """Genera el reporte operativo para una version de los datos."""
+    df = cargar_datos_crudos()
+    return generar_reporte_cxc(df)
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _cargar_reporte_paginas(version: float) -> dict[str, Any]:
+    """Copia del reporte con tipos reducidos para las páginas.
+
+    Se cachea aparte de ``_cargar_reporte`` porque analytics y auditoria
+    necesitan el reporte con las columnas de texto originales. Agrega la
+    llave ``cargos_vivos``: los movimientos abiertos que son cargos, ya
+    separados de sus abonos parciales.
+    """
+    reporte: dict[str, Any] = _optimizar_tipos(_cargar_reporte(version))
+    reporte["cargos_vivos"] = _cargos_vivos(obtener_vista(reporte, "movimientos_abiertos_cxc"))
+    return reporte
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _cargar_kpis(version: float) -> dict[str, Any]:
+    """Calcula los KPIs para una version de los datos."""
+    df = cargar_datos_crudos()
+    kpis: dict[str, Any] = _optimizar_tipos(generar_kpis(df, KPI_PERIODO_DIAS))
+    concentracion = obtener_vista(kpis, "kpis_concentracion")
+    kpis["estadisticas_concentracion"] = _estadisticas_concentracion(concentracion)
+    kpis["top10_concentracion"] = _top_concentracion(concentracion)
+    kpis["indice_kpis"] = _indice_kpis(obtener_vista(kpis, "kpis_resumen"))
+    kpis["resumen_abc"] = _resumen_abc(concentracion)
+    kpis["top10_vencido"] = _top_vencido(obtener_vista(kpis, "kpis_morosidad_cliente"))
+    return kpis
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _cargar_analytics(version: float) -> dict[str, Any]:
+    """Procesa el analisis avanzado para una version de los datos."""
+    reporte = _cargar_reporte(version)
+    vistas_analytics = {
+        "movimientos_abiertos_cxc": obtener_vista(reporte, "movimientos_abiertos_cxc"),
+        "movimientos_totales_cxc": obtener_vista(reporte, "movimientos_totales_cxc"),
+    }
+    engine = Analytics(RANGOS_ANTIGUEDAD)
+    analytics: dict[str, Any] = _optimizar_tipos(engine.run_analytics(vistas_analytics))
+    analytics["resumen_antiguedad"] = _resumen_antiguedad(
+        obtener_vista(analytics, "antiguedad_cartera")
+    )
+    return analytics
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _cargar_auditoria(version: float) -> Any:
+    """Ejecuta la auditoria para una version de los datos."""
+    df = cargar_datos_crudos()
+    reporte = _cargar_reporte(version)
+    reporte_cxc_df = obtener_vista(reporte, "reporte_cxc")
+
+    auditor = Auditor(ANOMALIAS)
+    return _proyectar_auditoria(auditor.run_audit(df, df_reporte=reporte_cxc_df))
+
+
+def _proyectar_auditoria(audit: Any) -> Any:
+    """Recorta cada hallazgo a las columnas de ``COLUMNAS_AUDITORIA``.
+
+    Las columnas que no existan en un hallazgo se omiten; los atributos
+    sin entrada en el diccionario se conservan completos. Los recortes
+    pasan por ``_optimizar_tipos``: NOMBRE_CLIENTE y MOTIVO quedan como
+    ``category`` y las agrupaciones de la pagina operan sobre codigos.
+
+    Args:
+        audit: ``AuditResult`` de ``Auditor.run_audit``.
+
+    Returns:
+        AuditResult: Copia con los DataFrames ya proyectados.
+    """
+    proyectados = {}
+    for atributo, columnas in COLUMNAS_AUDITORIA.items():
+        df = getattr(audit, atributo)
+        # reindex devuelve un DataFrame propio (no una rebanada marcada),
+        # asi _optimizar_tipos puede reasignar columnas sin advertencias
+        proyectados[atributo] = df.reindex(columns=[c for c in columnas if c in df.columns])
+    return replace(audit, **_optimizar_tipos(proyectados))
 
 
-@st.cache_data(ttl=3600)
 def cargar_reporte() -> dict[str, pd.DataFrame]:
     """Genera el reporte operativo base.
 
     Returns:
         dict[str, pd.DataFrame]: Diccionario con las vistas del reporte.
     """
-    df = cargar_datos_crudos()
-    return generar_reporte_cxc(df)
+    return _cargar_reporte_paginas(_version_datos())
 
 
-@st.cache_data(ttl=3600)
-def cargar_kpis() -> dict[str, pd.DataFrame]:
+def cargar_kpis() -> dict[str, Any]:
     """Calcula los indicadores clave de rendimiento (KPIs).
 
     Returns:
-        dict[str, pd.DataFrame]: Diccionario con los DataFrames de KPIs.
+        dict[str, Any]: Diccionario con los DataFrames de KPIs mas las
+        llaves ``indice_kpis`` (resumen indexado por nombre),
+        ``estadisticas_concentracion`` (conteos ABC),
+        ``top10_concentracion`` (clientes con mayor saldo),
+        ``resumen_abc`` (saldo por clase) y ``top10_vencido``
+        (clientes con mayor saldo vencido).
     """
-    df = cargar_datos_crudos()
-    return generar_kpis(df, KPI_PERIODO_DIAS)
+    return _cargar_kpis(_version_datos())
 
 
-@st.cache_data(ttl=3600)
-def cargar_analytics() -> dict[str, pd.DataFrame]:
+def cargar_analytics() -> dict[str, Any]:
     """Procesa el analisis avanzado de la cartera.
 
     Returns:
-        dict[str, pd.DataFrame]: Diccionario con las vistas analiticas.
+        dict[str, Any]: Diccionario con las vistas analiticas mas la
+        llave ``resumen_antiguedad`` con los totales globales.
     """
-    reporte = cargar_reporte()
-    vistas_analytics = {
-        "movimientos_abiertos_cxc": reporte.get("movimientos_abiertos_cxc", pd.DataFrame()),
-        "movimientos_totales_cxc": reporte.get("movimientos_totales_cxc", pd.DataFrame()),
-    }
-    engine = Analytics(RANGOS_ANTIGUEDAD)
-    return engine.run_analytics(vistas_analytics)
+    return _cargar_analytics(_version_datos())
 
 
-@st.cache_data(ttl=3600)
 def cargar_auditoria() -> Any:
     """Ejecuta las reglas de auditoria sobre los datos.
 
     Returns:
         Any: Objeto AuditResult con los hallazgos y resumen.
     """
-    df = cargar_datos_crudos()
-    reporte = cargar_reporte()
-    reporte_cxc_df = reporte.get("reporte_cxc", pd.DataFrame())
-    
-    auditor = Auditor(ANOMALIAS)
-    return auditor.run_audit(df, df_reporte=reporte_cxc_df)
+    return _cargar_auditoria(_version_datos())
+
+
+# ======================================================================
+# TABLAS ARROW PARA LA INTERFAZ
+# ======================================================================
+# ``st.dataframe`` serializa a Arrow en cada rerun. Las vistas que se
+# muestran sin filtrar se convierten una sola vez por version de datos
+# y se comparten como recurso, sin copiar ni volver a hashear el DataFrame.
+
+def _vistas_auditoria(version: float) -> dict[str, pd.DataFrame]:
+    """Vistas derivadas de la auditoria que se muestran como tabla."""
+    audit = _cargar_auditoria(version)
+    return {"resumen_moras_atipicas": _resumen_moras_atipicas(audit.moras_atipicas)}
+
+
+_CARGADORES_VERSIONADOS: dict[str, Callable[[float], dict[str, Any]]] = {
+    "reporte":   _cargar_reporte_paginas,
+    "kpis":      _cargar_kpis,
+    "analytics": _cargar_analytics,
+    "auditoria": _vistas_auditoria,
+}
+
+
+@st.cache_resource(ttl=3600, show_spinner=False)
+def _tabla_arrow(cargador: str, llave: str, version: float) -> pa.Table:
+    """Convierte una vista a ``pa.Table`` para una version de los datos."""
+    vista = obtener_vista(_CARGADORES_VERSIONADOS[cargador](version), llave)
+    return pa.Table.from_pandas(vista, preserve_index=False)
+
+
+def tabla_arrow(cargador: str, llave: str) -> pa.Table:
+    """Devuelve una vista ya convertida a Arrow para ``st.dataframe``.
+
+    La llave de cache son dos textos y la version de los datos, de modo
+    que un rerun sin cambios recupera la misma tabla sin recorrer el
+    DataFrame. Las categorias viajan como columnas de diccionario.
+
+    Args:
+        cargador: ``"reporte"``, ``"kpis"``, ``"analytics"`` o ``"auditoria"``.
+        llave:    Nombre de la vista dentro del cargador.
+
+    Returns:
+        pa.Table: Tabla inmutable; vacia si la vista no existe.
+    """
+    return _tabla_arrow(cargador, llave, _version_datos())
+
+
+# ======================================================================
+# CARGA EN PARALELO
+# ======================================================================
+
+@st.cache_resource
+def _obtener_pool() -> ThreadPoolExecutor:
+    """Devuelve el pool de hilos compartido por todas las sesiones.
+
+    Se crea una sola vez por proceso de Streamlit; los análisis de
+    ``cargar_todo()`` y la precarga se ejecutan sobre él.
+
+    Returns:
+        ThreadPoolExecutor: Pool con un hilo por análisis.
+    """
+    return ThreadPoolExecutor(max_workers=4, thread_name_prefix="cxc_loader")
+
+
+def _con_contexto(func: Callable[[], Any], ctx: Any) -> Callable[[], Any]:
+    """Envuelve un cargador para que corra con el contexto de la sesión.
+
+    Sin el ``ScriptRunContext`` el hilo del pool no puede usar
+    ``st.cache_data`` y Streamlit emite advertencias por cada llamada.
+
+    Args:
+        func: Cargador sin argumentos a ejecutar en el hilo.
+        ctx:  Contexto obtenido con ``get_script_run_ctx()``.
+
+    Returns:
+        Callable: Función lista para enviarse al pool.
+    """
+    def _tarea() -> Any:
+        add_script_run_ctx(threading.current_thread(), ctx)
+        return func()
+    return _tarea
+
+
+_CARGADORES: dict[str, Callable[[], Any]] = {
+    "reporte":   cargar_reporte,
+    "kpis":      cargar_kpis,
+    "analytics": cargar_analytics,
+    "auditoria": cargar_auditoria,
+}
+
+# Llave de ``st.session_state`` con los cargadores ya usados en la corrida
+_LLAVE_CARGADOS = "_cargadores_corrida"
+
+
+def reiniciar_registro_cargas() -> None:
+    """Olvida los cargadores registrados por la corrida anterior.
+
+    Se invoca al inicio de cada corrida, antes de dibujar la página
+    activa, para que ``precargar_en_segundo_plano`` solo omita lo que
+    esta corrida ya cargó.
+    """
+    st.session_state[_LLAVE_CARGADOS] = set()
+
+
+def cargar_todo(nombres: Iterable[str] = tuple(_CARGADORES)) -> dict[str, Any]:
+    """Carga varios análisis del dashboard de forma concurrente.
+
+    Extrae primero los datos crudos (una sola conexión a Firebird) y
+    después envía al pool solo los cargadores cacheados que la página
+    pide. Analytics y auditoría consumen el reporte; el candado por
+    llave de ``st.cache_data`` garantiza que este se calcule una sola
+    vez aunque varios hilos lo pidan a la vez. Con caché caliente la
+    función solo recupera los resultados ya almacenados.
+
+    Args:
+        nombres: Cargadores a ejecutar: ``reporte``, ``kpis``,
+            ``analytics`` y/o ``auditoria``. Por omisión, todos.
+
+    Returns:
+        dict[str, Any]: Una llave por cargador pedido con su resultado.
+    """
+    nombres = tuple(nombres)
+    # Los cargadores cacheados no muestran spinner propio (también corren
+    # en la precarga); el único aviso sale aquí, desde el hilo principal.
+    with st.spinner("Cargando datos..."):
+        cargar_datos_crudos()
+
+        ctx = get_script_run_ctx()
+        pool = _obtener_pool()
+        futuros = {
+            nombre: pool.submit(_con_contexto(_CARGADORES[nombre], ctx))
+            for nombre in nombres
+        }
+        datos = {nombre: futuro.result() for nombre, futuro in futuros.items()}
+    st.session_state.setdefault(_LLAVE_CARGADOS, set()).update(nombres)
+    return datos
+
+
+def _precargar(func: Callable[[], Any]) -> None:
+    """Ejecuta un cargador solo para calentar su cache; registra fallos."""
+    try:
+        func()
+    except Exception as e:
+        logger.warning("Precarga de %s fallida: %s", func.__name__, e)
+
+
+def precargar_en_segundo_plano() -> None:
+    """Calienta en el pool las caches de las demas paginas sin esperar.
+
+    Se invoca despues de dibujar la pagina activa: mientras el usuario
+    la revisa, el pool calcula los cargadores que esta corrida no uso
+    con ``cargar_todo()``, de modo que navegar a otra pagina ya encuentra
+    la cache lista. Los errores solo se registran; la pagina que los
+    necesite los mostrara al cargarlos de forma sincrona.
+    """
+    cargados = st.session_state.get(_LLAVE_CARGADOS, set())
+    ctx = get_script_run_ctx()
+    pool = _obtener_pool()
+    for nombre, func in _CARGADORES.items():
+        if nombre not in cargados:
+            pool.submit(_con_contexto(lambda func=func: _precargar(func), ctx))
+
+
+def limpiar_cache_datos() -> None:
+    """Descarta solo las caches que dependen de la base de datos.
+
+    Limpia el DataFrame crudo (memoria y disco) y los cargadores
+    de vistas. Las caches de figuras y helpers de formato se conservan:
+    su llave es el propio DataFrame, asi que se recalculan solas cuando
+    los datos cambian.
+    """
+    _extraer_datos_crudos.clear()
+    invalidar_cache_disco()
+    _tabla_arrow.clear()
+    for func in (
+        _cargar_reporte, _cargar_reporte_paginas,
+        _cargar_kpis, _cargar_analytics, _cargar_auditoria,
+    ):
+        func.clear()
 
 
 # ======================================================================
 # HELPERS DE FILTRADO
 # ======================================================================
 
+def _categorias_presentes(serie: pd.Series) -> np.ndarray:
+    """Mascara de las categorias que aparecen al menos una vez en la serie.
+
+    Cuenta los codigos enteros con ``np.bincount`` en lugar de comparar
+    los textos; los nulos (codigo -1) se ignoran.
+
+    Args:
+        serie: Serie categorica.
+
+    Returns:
+        np.ndarray: Arreglo booleano alineado con ``serie.cat.categories``.
+    """
+    codigos = serie.cat.codes.to_numpy()
+    return np.bincount(codigos[codigos >= 0], minlength=len(serie.cat.categories)) > 0
+
+
+def mascara_valores(serie: pd.Series, valores: Iterable[str]) -> np.ndarray:
+    """Mascara booleana de las filas cuyo valor esta en ``valores``.
+
+    Para series categoricas traduce los valores buscados a posiciones de
+    categoria y arma una tabla booleana indexada por codigo: la mascara
+    sale de un solo ``take`` sobre los codigos enteros, sin comparar
+    textos. Los nulos (codigo -1) caen en la ultima posicion, que siempre
+    es False. Para texto recurre a ``isin``.
+
+    Args:
+        serie:   Serie de texto o categorica.
+        valores: Valores a conservar.
+
+    Returns:
+        np.ndarray: Arreglo booleano alineado con la serie.
+    """
+    if not isinstance(serie.dtype, pd.CategoricalDtype):
+        return serie.isin(list(valores)).to_numpy()
+
+    categorias = serie.cat.categories
+    posiciones = categorias.get_indexer(list(valores))
+    tabla = np.zeros(len(categorias) + 1, dtype=bool)
+    tabla[posiciones[posiciones >= 0]] = True
+    return tabla.take(serie.cat.codes.to_numpy())
+
+
+def contar_unicos(serie: pd.Series) -> int:
+    """Cuenta los valores distintos no nulos de una serie.
+
+    Para series categoricas cuenta categorias presentes a partir de los
+    codigos enteros; para texto recurre a ``nunique``.
+
+    Args:
+        serie: Serie de texto o categorica.
+
+    Returns:
+        int: Numero de valores distintos.
+    """
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        return int(_categorias_presentes(serie).sum())
+    return int(serie.nunique())
+
+
+def _valores_unicos(serie: pd.Series) -> list[str]:
+    """Devuelve los valores unicos no nulos de una serie, ordenados.
+
+    Si la serie es categorica solo se cuentan sus codigos enteros para
+    saber que categorias aparecen; las categorias inferidas por
+    ``astype("category")`` ya vienen ordenadas, asi que no se vuelve a
+    ordenar en Python.
+
+    Args:
+        serie: Serie de texto o categorica.
+
+    Returns:
+        Lista de valores unicos ordenada alfabeticamente.
+    """
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        valores = serie.cat.categories[_categorias_presentes(serie)]
+        if not valores.is_monotonic_increasing:
+            valores = valores.sort_values()
+        return valores.tolist()
+    return sorted(serie.dropna().unique().tolist())
+
+
+@st.cache_data(ttl=3600)
 def get_clientes(df: pd.DataFrame) -> list[str]:
     """Devuelve lista ordenada de clientes unicos del DataFrame.
 
+    El resultado se cachea por contenido del DataFrame para no volver a
+    ordenar la lista en cada rerun de los filtros.
+
     Args:
         df: DataFrame con columna NOMBRE_CLIENTE.
 
@@ -129,9 +906,10 @@ def get_clientes(df: pd.DataFrame) -> list[str]:
     """
     if "NOMBRE_CLIENTE" not in df.columns:
         return []
-    return sorted(df["NOMBRE_CLIENTE"].dropna().unique().tolist())
+    return _valores_unicos(df["NOMBRE_CLIENTE"])
 
 
+@st.cache_data(ttl=3600)
 def get_vendedores(df: pd.DataFrame) -> list[str]:
     """Devuelve lista ordenada de vendedores unicos del DataFrame.
 
@@ -143,7 +921,7 @@ def get_vendedores(df: pd.DataFrame) -> list[str]:
     """
     if "VENDEDOR" not in df.columns:
         return []
-    return sorted(df["VENDEDOR"].dropna().unique().tolist())
+    return _valores_unicos(df["VENDEDOR"])
 
 
 def filtrar_por_cliente(
@@ -152,7 +930,9 @@ def filtrar_por_cliente(
 ) -> pd.DataFrame:
     """Filtra el DataFrame por lista de clientes seleccionados.
 
-    Si la lista esta vacia devuelve el DataFrame completo.
+    Si la lista esta vacia devuelve el DataFrame completo. El indexado
+    booleano ya produce un DataFrame nuevo, asi que no se copia otra vez;
+    el resultado se trata como solo lectura.
 
     Args:
         df:       DataFrame con columna NOMBRE_CLIENTE.
@@ -163,7 +943,7 @@ def filtrar_por_cliente(
     """
     if not clientes:
         return df
-    return df[df["NOMBRE_CLIENTE"].isin(clientes)].copy()
+    return df.loc[df["NOMBRE_CLIENTE"].isin(clientes).to_numpy()]
 
 
 def filtrar_por_vendedor(
@@ -172,7 +952,8 @@ def filtrar_por_vendedor(
 ) -> pd.DataFrame:
     """Filtra el DataFrame por lista de vendedores seleccionados.
 
-    Si la lista esta vacia devuelve el DataFrame completo.
+    Si la lista esta vacia devuelve el DataFrame completo. Igual que
+    ``filtrar_por_cliente``, no hace una copia adicional.
 
     Args:
         df:         DataFrame con columna VENDEDOR.
@@ -183,4 +964,4 @@ def filtrar_por_vendedor(
     """
     if not vendedores:
         return df
-    return df[df["VENDEDOR"].isin(vendedores)].copy()
\ No newline at end of file
+    return df.loc[df["VENDEDOR"].isin(vendedores).to_numpy()]
\ No newline at end of file
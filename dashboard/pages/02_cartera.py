@@ -10,6 +10,7 @@ from __future__ import annotations
 import sys
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
@@ -18,7 +19,7 @@ import streamlit as st
 ROOT = Path(__file__).resolve().parent.parent.parent
 sys.path.insert(0, str(ROOT))
 
-from dashboard.data_loader import cargar_analytics
+from dashboard.data_loader import cargar_analytics, obtener_vista, tabla_arrow
 
 # ======================================================================
 # HEADER
@@ -42,10 +43,10 @@ except Exception as e:
     st.error(f"❌ Error al cargar datos: {e}")
     st.stop()
 
-antiguedad      = analytics.get("antiguedad_cartera", pd.DataFrame())
-por_cliente     = analytics.get("antiguedad_por_cliente", pd.DataFrame())
-vencida_vigente = analytics.get("cartera_vencida_vs_vigente", pd.DataFrame())
-resumen_cliente = analytics.get("resumen_por_cliente", pd.DataFrame())
+antiguedad      = obtener_vista(analytics, "antiguedad_cartera")
+por_cliente     = obtener_vista(analytics, "antiguedad_por_cliente")
+vencida_vigente = obtener_vista(analytics, "cartera_vencida_vs_vigente")
+resumen_cliente = obtener_vista(analytics, "resumen_por_cliente")
 
 # ======================================================================
 # SECCIÓN 1: MÉTRICAS DE ANTIGÜEDAD
@@ -53,82 +54,122 @@ resumen_cliente = analytics.get("resumen_por_cliente", pd.DataFrame())
 st.subheader("Resumen Global de Antigüedad")
 
 if not antiguedad.empty:
-    total_cartera = antiguedad["IMPORTE_TOTAL"].sum()
-    n_documentos  = int(antiguedad["NUM_DOCUMENTOS"].sum())
+    resumen_ant = analytics["resumen_antiguedad"]
 
     m1, m2, m3, m4 = st.columns(4)
     with m1:
-        st.metric("Total Cartera", f"${total_cartera:,.2f}")
+        st.metric("Total Cartera", f"${resumen_ant['total_cartera']:,.2f}")
     with m2:
-        st.metric("Total Documentos", f"{n_documentos:,}")
+        st.metric("Total Documentos", f"{resumen_ant['n_documentos']:,}")
     with m3:
         # Cartera vencida = todo excepto "Vigente"
-        vencida = antiguedad[antiguedad["RANGO_ANTIGUEDAD"] != "Vigente"]["IMPORTE_TOTAL"].sum()
-        st.metric("Total Vencido", f"${vencida:,.2f}")
+        st.metric("Total Vencido", f"${resumen_ant['vencida']:,.2f}")
     with m4:
-        pct_vencido = (vencida / total_cartera * 100) if total_cartera > 0 else 0
-        st.metric("% Vencido", f"{pct_vencido:.1f}%")
+        st.metric("% Vencido", f"{resumen_ant['pct_vencido']:.1f}%")
 
     st.divider()
 
 # ======================================================================
 # SECCIÓN 2: GRÁFICAS DE ANTIGÜEDAD
 # ======================================================================
+# Las figuras se cachean por contenido del DataFrame: al volver a la
+# página no se reconstruyen mientras los datos no cambien.
+_COLORES_RANGO: dict[str, str] = {
+    "Vigente":          "#22c55e",
+    "0-30 días":        "#3b82f6",
+    "31-60 días":       "#f59e0b",
+    "61-90 días":       "#f97316",
+    "91-120 días":      "#ef4444",
+    "Más de 120 días":  "#7f1d1d",
+    "Sin fecha":        "#94a3b8",
+}
+
+
+@st.cache_data(ttl=3600)
+def _fig_importe_rango(antiguedad: pd.DataFrame) -> go.Figure:
+    """Construye la gráfica de barras de importe por rango de antigüedad."""
+    fig = px.bar(
+        antiguedad,
+        x="RANGO_ANTIGUEDAD",
+        y="IMPORTE_TOTAL",
+        color="RANGO_ANTIGUEDAD",
+        color_discrete_map=_COLORES_RANGO,
+        text="PCT_DEL_TOTAL",
+        labels={"IMPORTE_TOTAL": "Importe ($)", "RANGO_ANTIGUEDAD": "Rango"},
+    )
+    fig.update_traces(
+        texttemplate="%{text:.1f}%",
+        textposition="outside",
+    )
+    fig.update_layout(
+        showlegend=False,
+        plot_bgcolor="white",
+        paper_bgcolor="white",
+        margin=dict(t=20, b=40, l=10, r=10),
+        xaxis=dict(showgrid=False, title=""),
+        yaxis=dict(showgrid=True, gridcolor="#f1f5f9", title="Importe ($)"),
+    )
+    return fig
+
+
+@st.cache_data(ttl=3600)
+def _fig_documentos_rango(antiguedad: pd.DataFrame) -> go.Figure:
+    """Construye la dona de número de documentos por rango."""
+    fig2 = px.pie(
+        antiguedad,
+        names="RANGO_ANTIGUEDAD",
+        values="NUM_DOCUMENTOS",
+        hole=0.4,
+        color="RANGO_ANTIGUEDAD",
+        color_discrete_map=_COLORES_RANGO,
+    )
+    fig2.update_layout(
+        margin=dict(t=20, b=40, l=10, r=10),
+        paper_bgcolor="white",
+        legend=dict(orientation="v", x=1.0, y=0.5),
+    )
+    fig2.update_traces(textinfo="percent+label", textfont_size=11)
+    return fig2
+
+
+@st.cache_data(ttl=3600)
+def _fig_vencida_vigente(vencida_vigente: pd.DataFrame) -> go.Figure:
+    """Construye la gráfica de barras de cartera vencida vs vigente."""
+    fig_vv = px.bar(
+        vencida_vigente,
+        x="ESTATUS_VENCIMIENTO",
+        y="IMPORTE_TOTAL",
+        color="ESTATUS_VENCIMIENTO",
+        color_discrete_map={"VENCIDO": "#ef4444", "VIGENTE": "#22c55e"},
+        text="IMPORTE_TOTAL",
+        labels={"IMPORTE_TOTAL": "Importe ($)", "ESTATUS_VENCIMIENTO": ""},
+    )
+    fig_vv.update_traces(
+        texttemplate="$%{text:,.0f}",
+        textposition="outside",
+    )
+    fig_vv.update_layout(
+        showlegend=False,
+        plot_bgcolor="white",
+        paper_bgcolor="white",
+        margin=dict(t=40, b=20, l=10, r=10),
+        yaxis=dict(showgrid=True, gridcolor="#f1f5f9"),
+        xaxis=dict(showgrid=False),
+    )
+    return fig_vv
+
+
 graf_col1, graf_col2 = st.columns(2)
 
 with graf_col1:
     st.subheader("Importe por Rango de Antigüedad")
     if not antiguedad.empty:
-        colores = {
-            "Vigente":          "#22c55e",
-            "0-30 días":        "#3b82f6",
-            "31-60 días":       "#f59e0b",
-            "61-90 días":       "#f97316",
-            "91-120 días":      "#ef4444",
-            "Más de 120 días":  "#7f1d1d",
-            "Sin fecha":        "#94a3b8",
-        }
-        fig = px.bar(
-            antiguedad,
-            x="RANGO_ANTIGUEDAD",
-            y="IMPORTE_TOTAL",
-            color="RANGO_ANTIGUEDAD",
-            color_discrete_map=colores,
-            text="PCT_DEL_TOTAL",
-            labels={"IMPORTE_TOTAL": "Importe ($)", "RANGO_ANTIGUEDAD": "Rango"},
-        )
-        fig.update_traces(
-            texttemplate="%{text:.1f}%",
-            textposition="outside",
-        )
-        fig.update_layout(
-            showlegend=False,
-            plot_bgcolor="white",
-            paper_bgcolor="white",
-            margin=dict(t=20, b=40, l=10, r=10),
-            xaxis=dict(showgrid=False, title=""),
-            yaxis=dict(showgrid=True, gridcolor="#f1f5f9", title="Importe ($)"),
-        )
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(_fig_importe_rango(antiguedad), use_container_width=True)
 
 with graf_col2:
     st.subheader("Número de Documentos por Rango")
     if not antiguedad.empty:
-        fig2 = px.pie(
-            antiguedad,
-            names="RANGO_ANTIGUEDAD",
-            values="NUM_DOCUMENTOS",
-            hole=0.4,
-            color="RANGO_ANTIGUEDAD",
-            color_discrete_map=colores,
-        )
-        fig2.update_layout(
-            margin=dict(t=20, b=40, l=10, r=10),
-            paper_bgcolor="white",
-            legend=dict(orientation="v", x=1.0, y=0.5),
-        )
-        fig2.update_traces(textinfo="percent+label", textfont_size=11)
-        st.plotly_chart(fig2, use_container_width=True)
+        st.plotly_chart(_fig_documentos_rango(antiguedad), use_container_width=True)
 
 st.divider()
 
@@ -138,26 +179,19 @@ st.divider()
 st.subheader("Detalle por Rango de Antigüedad")
 
 if not antiguedad.empty:
-    display_ant = antiguedad.copy()
-
-    for col in ["IMPORTE_TOTAL", "IMPORTE_PROMEDIO", "IMPORTE_MAX"]:
-        if col in display_ant.columns:
-            display_ant[col] = display_ant[col].apply(lambda x: f"${x:,.2f}")
-
-    if "PCT_DEL_TOTAL" in display_ant.columns:
-        display_ant["PCT_DEL_TOTAL"] = display_ant["PCT_DEL_TOTAL"].apply(lambda x: f"{x:.2f}%")
-
+    # El formato se aplica en el frontend; los valores siguen siendo
+    # numéricos y la tabla ordena correctamente por importe.
     st.dataframe(
-        display_ant,
+        tabla_arrow("analytics", "antiguedad_cartera"),
         use_container_width=True,
         hide_index=True,
         column_config={
             "RANGO_ANTIGUEDAD":  st.column_config.TextColumn("Rango"),
             "NUM_DOCUMENTOS":    st.column_config.NumberColumn("Documentos", format="%d"),
-            "IMPORTE_TOTAL":     st.column_config.TextColumn("Importe Total"),
-            "IMPORTE_PROMEDIO":  st.column_config.TextColumn("Promedio"),
-            "IMPORTE_MAX":       st.column_config.TextColumn("Máximo"),
-            "PCT_DEL_TOTAL":     st.column_config.TextColumn("% del Total"),
+            "IMPORTE_TOTAL":     st.column_config.NumberColumn("Importe Total", format="$%,.2f"),
+            "IMPORTE_PROMEDIO":  st.column_config.NumberColumn("Promedio", format="$%,.2f"),
+            "IMPORTE_MAX":       st.column_config.NumberColumn("Máximo", format="$%,.2f"),
+            "PCT_DEL_TOTAL":     st.column_config.NumberColumn("% del Total", format="%.2f%%"),
         },
     )
 
@@ -172,76 +206,76 @@ if not vencida_vigente.empty:
     vv_col1, vv_col2 = st.columns([1, 1.5])
 
     with vv_col1:
-        for _, row in vencida_vigente.iterrows():
-            estatus = row.get("ESTATUS_VENCIMIENTO", "")
-            importe = row.get("IMPORTE_TOTAL", 0)
-            pct     = row.get("PCT_DEL_TOTAL", 0)
-            ndocs   = row.get("NUM_DOCUMENTOS", 0)
-            dias_p  = row.get("DIAS_VENCIDO_PROMEDIO", 0)
-
-            if estatus == "VENCIDO":
-                css = "alert-critico"
-                icono = "🚨"
-            else:
-                css = "alert-ok"
-                icono = "✅"
-
-            st.markdown(
-                f'<div class="{css}">'
-                f'{icono} <strong>{estatus}</strong><br>'
-                f'Importe: <strong>${importe:,.2f}</strong> ({pct:.1f}%)<br>'
-                f'Documentos: {int(ndocs):,} | '
-                f'Días vencido prom.: {dias_p:.0f}'
-                f'</div>',
-                unsafe_allow_html=True,
-            )
+        # Todas las tarjetas se arman con operaciones sobre columnas y se
+        # envían en un solo st.markdown.
+        vv = vencida_vigente
+        es_vencido = vv["ESTATUS_VENCIMIENTO"].astype(str).eq("VENCIDO").to_numpy()
+        cero = pd.Series(0, index=vv.index)
+
+        tarjetas = (
+            '<div class="' + pd.Series(np.where(es_vencido, "alert-critico", "alert-ok"), index=vv.index) + '">'
+            + pd.Series(np.where(es_vencido, "🚨", "✅"), index=vv.index)
+            + ' <strong>' + vv["ESTATUS_VENCIMIENTO"].astype(str) + '</strong><br>'
+            + 'Importe: <strong>$' + vv.get("IMPORTE_TOTAL", cero).map("{:,.2f}".format) + '</strong> '
+            + '(' + vv.get("PCT_DEL_TOTAL", cero).map("{:.1f}".format) + '%)<br>'
+            + 'Documentos: ' + vv.get("NUM_DOCUMENTOS", cero).astype(int).map("{:,}".format) + ' | '
+            + 'Días vencido prom.: ' + vv.get("DIAS_VENCIDO_PROMEDIO", cero).map("{:.0f}".format)
+            + '</div>'
+        )
+        st.markdown("".join(tarjetas), unsafe_allow_html=True)
 
     with vv_col2:
-        fig_vv = px.bar(
-            vencida_vigente,
-            x="ESTATUS_VENCIMIENTO",
-            y="IMPORTE_TOTAL",
-            color="ESTATUS_VENCIMIENTO",
-            color_discrete_map={"VENCIDO": "#ef4444", "VIGENTE": "#22c55e"},
-            text="IMPORTE_TOTAL",
-            labels={"IMPORTE_TOTAL": "Importe ($)", "ESTATUS_VENCIMIENTO": ""},
-        )
-        fig_vv.update_traces(
-            texttemplate="$%{text:,.0f}",
-            textposition="outside",
-        )
-        fig_vv.update_layout(
-            showlegend=False,
-            plot_bgcolor="white",
-            paper_bgcolor="white",
-            margin=dict(t=40, b=20, l=10, r=10),
-            yaxis=dict(showgrid=True, gridcolor="#f1f5f9"),
-            xaxis=dict(showgrid=False),
-        )
-        st.plotly_chart(fig_vv, use_container_width=True)
+        st.plotly_chart(_fig_vencida_vigente(vencida_vigente), use_container_width=True)
 
 st.divider()
 
 # ======================================================================
 # SECCIÓN 5: PIVOTE POR CLIENTE
 # ======================================================================
-st.subheader("Antigüedad Desglosada por Cliente")
+def _mascara_busqueda(nombres: pd.Series, busqueda: str) -> pd.Series:
+    """Marca las filas cuyo nombre contiene ``busqueda`` (sin distinguir mayúsculas).
 
-if not por_cliente.empty:
-    # Filtro de búsqueda
+    Si la serie es categórica la búsqueda se hace sobre las categorías
+    y después se proyecta a las filas con ``isin``.
+    """
+    if isinstance(nombres.dtype, pd.CategoricalDtype):
+        categorias = nombres.cat.categories
+        coincidencias = categorias[
+            categorias.astype(str).str.contains(busqueda, case=False, regex=False)
+        ]
+        return nombres.isin(coincidencias)
+    return nombres.str.contains(busqueda, case=False, na=False, regex=False)
+
+
+@st.fragment
+def render_pivote(por_cliente: pd.DataFrame) -> None:
+    """Dibuja el buscador y la tabla pivote de antigüedad por cliente.
+
+    Al ser un fragmento, cada búsqueda solo vuelve a ejecutar esta
+    sección y no el resto de la página.
+    """
     busqueda = st.text_input("🔍 Buscar cliente", placeholder="Escribe parte del nombre...")
 
-    df_pivote = por_cliente.copy()
     if busqueda:
-        df_pivote = df_pivote[
-            df_pivote["NOMBRE_CLIENTE"].str.contains(busqueda, case=False, na=False)
-        ]
+        df_pivote = por_cliente[_mascara_busqueda(por_cliente["NOMBRE_CLIENTE"], busqueda)]
+        tabla = df_pivote
+        n_filas = len(df_pivote)
+    else:
+        # Sin búsqueda se muestra la vista completa ya convertida a Arrow
+        tabla = tabla_arrow("analytics", "antiguedad_por_cliente")
+        n_filas = tabla.num_rows
 
     st.dataframe(
-        df_pivote,
+        tabla,
         use_container_width=True,
         hide_index=True,
     )
-    st.caption(f"Mostrando {len(df_pivote):,} de {len(por_cliente):,} clientes")
+    st.caption(f"Mostrando {n_filas:,} de {len(por_cliente):,} clientes")
+
+
+st.subheader("Antigüedad Desglosada por Cliente")
+
+if not por_cliente.empty:
+    render_pivote(por_cliente)
 else:
-    st.info("Sin datos de antigüedad por cliente disponibles.")
\ No newline at end of file
+    st.info("Sin datos de antigüedad por cliente disponibles.")
@@ -10,19 +10,22 @@ from __future__ import annotations
 import sys
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 import plotly.express as px
+import plotly.graph_objects as go
 import streamlit as st
 
 ROOT = Path(__file__).resolve().parent.parent.parent
 sys.path.insert(0, str(ROOT))
 
 from dashboard.data_loader import (
-    cargar_analytics,
-    cargar_kpis,
-    cargar_reporte,
+    cargar_todo,
+    contar_unicos,
     get_clientes,
     get_vendedores,
+    mascara_valores,
+    obtener_vista,
 )
 
 # ======================================================================
@@ -42,19 +45,27 @@ st.markdown(
 # CARGA DE DATOS
 # ======================================================================
 try:
-    analytics    = cargar_analytics()
-    kpis_data    = cargar_kpis()
-    reporte_data = cargar_reporte()
+    datos        = cargar_todo(("reporte", "kpis", "analytics"))
+    analytics    = datos["analytics"]
+    kpis_data    = datos["kpis"]
+    reporte_data = datos["reporte"]
 except Exception as e:
     st.error(f"❌ Error al cargar datos: {e}")
     st.stop()
 
-resumen_clientes   = analytics.get("resumen_por_cliente", pd.DataFrame())
-resumen_vendedores = analytics.get("resumen_por_vendedor", pd.DataFrame())
-morosidad_cliente  = kpis_data.get("kpis_morosidad_cliente", pd.DataFrame())
-limite_credito     = kpis_data.get("kpis_limite_credito", pd.DataFrame())
-facturas_vivas     = reporte_data.get("movimientos_abiertos_cxc", pd.DataFrame())
-reporte_cxc        = reporte_data.get("reporte_cxc", pd.DataFrame())
+resumen_clientes   = obtener_vista(analytics, "resumen_por_cliente")
+resumen_vendedores = obtener_vista(analytics, "resumen_por_vendedor")
+morosidad_cliente  = obtener_vista(kpis_data, "kpis_morosidad_cliente")
+limite_credito     = obtener_vista(kpis_data, "kpis_limite_credito")
+facturas_vivas     = obtener_vista(reporte_data, "movimientos_abiertos_cxc")
+cargos_vivos       = obtener_vista(reporte_data, "cargos_vivos")
+reporte_cxc        = obtener_vista(reporte_data, "reporte_cxc")
+
+# Los filtros solo quitan filas, así que el esquema de cada vista se
+# consulta una vez aquí en lugar de en cada sección.
+cols_mor = frozenset(morosidad_cliente.columns)
+cols_lc  = frozenset(limite_credito.columns)
+cols_fv  = frozenset(facturas_vivas.columns)
 
 # ======================================================================
 # FILTROS EN SIDEBAR
@@ -91,30 +102,87 @@ with st.sidebar:
 # ======================================================================
 # APLICAR FILTROS
 # ======================================================================
+_clientes_sel = frozenset(filtro_cliente)
+
+
 def _aplicar_filtros(df: pd.DataFrame) -> pd.DataFrame:
-    """Aplica los filtros del sidebar a cualquier DataFrame con NOMBRE_CLIENTE."""
+    """Aplica los filtros del sidebar a cualquier DataFrame con NOMBRE_CLIENTE.
+
+    Combina cliente y vendedor en una sola mascara booleana y la aplica
+    una vez, sin DataFrames intermedios. En columnas categoricas la
+    mascara se arma sobre los codigos enteros. El resultado es de solo lectura
+    para las secciones de abajo; si no hay filtros activos se devuelve
+    la vista original sin indexar.
+    """
     if df.empty:
         return df
-    resultado = df.copy()
 
-    if filtro_cliente and "NOMBRE_CLIENTE" in resultado.columns:
-        resultado = resultado[resultado["NOMBRE_CLIENTE"].isin(filtro_cliente)]
+    mascara = np.ones(len(df), dtype=bool)
+    if _clientes_sel and "NOMBRE_CLIENTE" in df.columns:
+        mascara &= mascara_valores(df["NOMBRE_CLIENTE"], _clientes_sel)
+    if filtro_vendedor != "Todos" and "VENDEDOR" in df.columns:
+        mascara &= mascara_valores(df["VENDEDOR"], (filtro_vendedor,))
 
-    if filtro_vendedor != "Todos" and "VENDEDOR" in resultado.columns:
-        resultado = resultado[resultado["VENDEDOR"] == filtro_vendedor]
+    return df if mascara.all() else df.loc[mascara]
 
-    return resultado
+
+def _filtrar_mora(df: pd.DataFrame) -> pd.DataFrame:
+    """Aplica el filtro de categoría de mora a una vista de facturas."""
+    if filtro_mora and not df.empty and "CATEGORIA_MORA" in df.columns:
+        return df.loc[mascara_valores(df["CATEGORIA_MORA"], filtro_mora)]
+    return df
 
 
 morosidad_filtrada = _aplicar_filtros(morosidad_cliente)
-facturas_filtradas = _aplicar_filtros(facturas_vivas)
+facturas_filtradas = _filtrar_mora(_aplicar_filtros(facturas_vivas))
+cargos_filtrados   = _filtrar_mora(_aplicar_filtros(cargos_vivos))
 reporte_filtrado   = _aplicar_filtros(reporte_cxc)
+lc_filtrado        = _aplicar_filtros(limite_credito)
 
-if solo_con_saldo and not morosidad_filtrada.empty and "SALDO_TOTAL" in morosidad_filtrada.columns:
+if solo_con_saldo and not morosidad_filtrada.empty and "SALDO_TOTAL" in cols_mor:
     morosidad_filtrada = morosidad_filtrada[morosidad_filtrada["SALDO_TOTAL"] > 0]
 
-if filtro_mora and not facturas_filtradas.empty and "CATEGORIA_MORA" in facturas_filtradas.columns:
-    facturas_filtradas = facturas_filtradas[facturas_filtradas["CATEGORIA_MORA"].isin(filtro_mora)]
+
+@st.cache_data(ttl=3600)
+def _fig_vendedores(top_vendedores: pd.DataFrame) -> go.Figure:
+    """Construye las barras de saldo pendiente por vendedor."""
+    # CORRECCIÓN APLICADA: Uso de SALDO_PENDIENTE en lugar de IMPORTE_TOTAL
+    fig_vend = px.bar(
+        top_vendedores,
+        x="VENDEDOR",
+        y="SALDO_PENDIENTE",
+        color="SALDO_PENDIENTE",
+        color_continuous_scale="Blues",
+        text_auto=".2s",
+        labels={"VENDEDOR": "Vendedor", "SALDO_PENDIENTE": "Saldo Pendiente ($)"},
+    )
+    fig_vend.update_layout(
+        showlegend=False,
+        coloraxis_showscale=False,
+        plot_bgcolor="white",
+        paper_bgcolor="white",
+        margin=dict(t=20, b=60, l=10, r=10),
+        xaxis=dict(showgrid=False),
+        yaxis=dict(showgrid=True, gridcolor="#f1f5f9"),
+    )
+    return fig_vend
+
+
+def _render_vendedores() -> None:
+    """Dibuja la sección de cartera por vendedor (no depende de los filtros)."""
+    if resumen_vendedores.empty:
+        return
+    st.divider()
+    st.subheader("Cartera por Vendedor")
+    st.plotly_chart(_fig_vendedores(resumen_vendedores.head(10)), use_container_width=True)
+
+
+# Si los filtros no dejan filas en ninguna vista se omiten las secciones
+# 1-4 completas; solo queda la distribución por vendedor.
+if morosidad_filtrada.empty and facturas_filtradas.empty and lc_filtrado.empty:
+    st.info("🔎 Ningún cliente coincide con los filtros seleccionados.")
+    _render_vendedores()
+    st.stop()
 
 # ======================================================================
 # SECCIÓN 1: RESUMEN EJECUTIVO DE CLIENTES
@@ -122,39 +190,36 @@ if filtro_mora and not facturas_filtradas.empty and "CATEGORIA_MORA" in facturas
 st.subheader("Resumen de Cartera por Cliente")
 
 if not morosidad_filtrada.empty:
+    # Ambos saldos en una sola pasada sobre las dos columnas
+    cols_saldo = [c for c in ("SALDO_TOTAL", "SALDO_VENCIDO") if c in cols_mor]
+    sumas = morosidad_filtrada[cols_saldo].sum()
+    saldo_total = sumas.get("SALDO_TOTAL", 0)
+    saldo_vencido = sumas.get("SALDO_VENCIDO", 0)
+    pct = (saldo_vencido / saldo_total * 100) if saldo_total > 0 else 0
+
     m1, m2, m3, m4 = st.columns(4)
     with m1:
         st.metric("Clientes con saldo", f"{len(morosidad_filtrada):,}")
     with m2:
-        saldo_total = morosidad_filtrada["SALDO_TOTAL"].sum() if "SALDO_TOTAL" in morosidad_filtrada.columns else 0
         st.metric("Saldo total", f"${saldo_total:,.2f}")
     with m3:
-        saldo_vencido = morosidad_filtrada["SALDO_VENCIDO"].sum() if "SALDO_VENCIDO" in morosidad_filtrada.columns else 0
         st.metric("Total vencido", f"${saldo_vencido:,.2f}")
     with m4:
-        pct = (saldo_vencido / saldo_total * 100) if saldo_total > 0 else 0
         st.metric("% Vencido", f"{pct:.1f}%")
 
     st.divider()
 
     # Tabla principal de morosidad por cliente
-    display_mor = morosidad_filtrada.copy()
-    for col in ["SALDO_TOTAL", "SALDO_VIGENTE", "SALDO_VENCIDO"]:
-        if col in display_mor.columns:
-            display_mor[col] = display_mor[col].apply(lambda x: f"${x:,.2f}")
-    if "PCT_VENCIDO" in display_mor.columns:
-        display_mor["PCT_VENCIDO"] = display_mor["PCT_VENCIDO"].apply(lambda x: f"{x:.1f}%")
-
     st.dataframe(
-        display_mor,
+        morosidad_filtrada,
         use_container_width=True,
         hide_index=True,
         column_config={
             "NOMBRE_CLIENTE":  st.column_config.TextColumn("Cliente"),
-            "SALDO_TOTAL":     st.column_config.TextColumn("Saldo Total"),
-            "SALDO_VIGENTE":   st.column_config.TextColumn("Vigente"),
-            "SALDO_VENCIDO":   st.column_config.TextColumn("Vencido"),
-            "PCT_VENCIDO":     st.column_config.TextColumn("% Vencido"),
+            "SALDO_TOTAL":     st.column_config.NumberColumn("Saldo Total", format="$%,.2f"),
+            "SALDO_VIGENTE":   st.column_config.NumberColumn("Vigente", format="$%,.2f"),
+            "SALDO_VENCIDO":   st.column_config.NumberColumn("Vencido", format="$%,.2f"),
+            "PCT_VENCIDO":     st.column_config.NumberColumn("% Vencido", format="%.1f%%"),
             "NUM_FACTURAS":    st.column_config.NumberColumn("Facturas", format="%d"),
             "NUM_VENCIDAS":    st.column_config.NumberColumn("Vencidas", format="%d"),
             "DIAS_VENCIDO_MAX":st.column_config.NumberColumn("Días Vencido Máx", format="%d"),
@@ -163,6 +228,53 @@ if not morosidad_filtrada.empty:
 
     st.divider()
 
+
+def _indices_top(valores: np.ndarray, k: int) -> np.ndarray:
+    """Posiciones de los ``k`` valores mayores, ordenadas de mayor a menor.
+
+    ``argpartition`` separa los k mayores en O(n) y solo ese subconjunto
+    se ordena. Los NaN se descartan.
+    """
+    negados = -np.nan_to_num(valores.astype(float), nan=-np.inf)
+    if len(negados) > k:
+        idx = np.argpartition(negados, k)[:k]
+    else:
+        idx = np.arange(len(negados))
+    idx = idx[np.argsort(negados[idx], kind="stable")]
+    return idx[np.isfinite(negados[idx])]
+
+
+@st.cache_data(ttl=3600)
+def _fig_top15(nombres: tuple, vigente: tuple, vencido: tuple) -> go.Figure:
+    """Construye las barras apiladas vigente/vencido de los clientes top.
+
+    Recibe tuplas con las 15 filas ya seleccionadas, de modo que la llave
+    de cache es barata de calcular y solo cambia con los filtros.
+    """
+    fig = go.Figure()
+    for valores, nombre, color in (
+        (vigente, "Vigente", "#22c55e"),
+        (vencido, "Vencido", "#ef4444"),
+    ):
+        fig.add_trace(go.Bar(
+            x=valores,
+            y=nombres,
+            name=nombre,
+            orientation="h",
+            marker_color=color,
+        ))
+    fig.update_layout(
+        plot_bgcolor="white",
+        paper_bgcolor="white",
+        margin=dict(t=20, b=20, l=150, r=20),
+        yaxis=dict(autorange="reversed"),
+        xaxis=dict(showgrid=True, gridcolor="#f1f5f9", title="Importe ($)"),
+        legend=dict(orientation="h", y=-0.15, x=0.3),
+        barmode="stack",
+    )
+    return fig
+
+
 # ======================================================================
 # SECCIÓN 2: GRÁFICA VENCIDO VS VIGENTE POR CLIENTE (Top 15)
 # ======================================================================
@@ -170,36 +282,12 @@ st.subheader("Top 15 Clientes — Vencido vs Vigente")
 
 if not morosidad_filtrada.empty:
     cols_req = ["NOMBRE_CLIENTE", "SALDO_VIGENTE", "SALDO_VENCIDO"]
-    if all(c in morosidad_filtrada.columns for c in cols_req):
-        top15 = morosidad_filtrada.nlargest(15, "SALDO_TOTAL")[cols_req].copy()
-        top15_melted = top15.melt(
-            id_vars="NOMBRE_CLIENTE",
-            value_vars=["SALDO_VIGENTE", "SALDO_VENCIDO"],
-            var_name="Tipo",
-            value_name="Importe",
-        )
-        top15_melted["Tipo"] = top15_melted["Tipo"].map({
-            "SALDO_VIGENTE": "Vigente",
-            "SALDO_VENCIDO": "Vencido",
-        })
-
-        fig = px.bar(
-            top15_melted,
-            x="Importe",
-            y="NOMBRE_CLIENTE",
-            color="Tipo",
-            orientation="h",
-            color_discrete_map={"Vigente": "#22c55e", "Vencido": "#ef4444"},
-            labels={"NOMBRE_CLIENTE": "", "Importe": "Importe ($)"},
-            barmode="stack",
-        )
-        fig.update_layout(
-            plot_bgcolor="white",
-            paper_bgcolor="white",
-            margin=dict(t=20, b=20, l=150, r=20),
-            yaxis=dict(autorange="reversed"),
-            xaxis=dict(showgrid=True, gridcolor="#f1f5f9"),
-            legend=dict(orientation="h", y=-0.15, x=0.3),
+    if cols_mor.issuperset(cols_req):
+        idx = _indices_top(morosidad_filtrada["SALDO_TOTAL"].to_numpy(), 15)
+        fig = _fig_top15(
+            tuple(morosidad_filtrada["NOMBRE_CLIENTE"].to_numpy()[idx].tolist()),
+            tuple(morosidad_filtrada["SALDO_VIGENTE"].to_numpy()[idx].tolist()),
+            tuple(morosidad_filtrada["SALDO_VENCIDO"].to_numpy()[idx].tolist()),
         )
         st.plotly_chart(fig, use_container_width=True)
 
@@ -211,10 +299,11 @@ if not morosidad_filtrada.empty:
 st.subheader("Utilización de Límite de Crédito")
 
 if not limite_credito.empty:
-    lc_filtrado = _aplicar_filtros(limite_credito)
 
     # Semáforo de alertas por nivel
-    alertas_credito = lc_filtrado["ALERTA"].value_counts() if "ALERTA" in lc_filtrado.columns else pd.Series()
+    # ALERTA es categórica: value_counts incluye niveles sin clientes, se descartan
+    alertas_credito = lc_filtrado["ALERTA"].value_counts() if "ALERTA" in cols_lc else pd.Series()
+    alertas_credito = alertas_credito[alertas_credito > 0]
 
     if not alertas_credito.empty:
         cols_alerta = st.columns(len(alertas_credito))
@@ -236,25 +325,17 @@ if not limite_credito.empty:
     st.write("")
 
     # Tabla de utilización
-    display_lc = lc_filtrado.copy()
-    for col in ["SALDO", "LIMITE_CREDITO", "DISPONIBLE"]:
-        if col in display_lc.columns:
-            display_lc[col] = display_lc[col].apply(lambda x: f"${x:,.2f}")
-    if "UTILIZACION_PCT" in display_lc.columns:
-        display_lc["UTILIZACION_PCT"] = display_lc["UTILIZACION_PCT"].apply(
-            lambda x: f"{x:.1f}%" if pd.notna(x) else "N/A"
-        )
-
+    # UTILIZACION_PCT queda numerica; los clientes sin limite (NaN) se ven en blanco
     st.dataframe(
-        display_lc,
+        lc_filtrado,
         use_container_width=True,
         hide_index=True,
         column_config={
             "NOMBRE_CLIENTE":  st.column_config.TextColumn("Cliente"),
-            "SALDO":           st.column_config.TextColumn("Saldo Actual"),
-            "LIMITE_CREDITO":  st.column_config.TextColumn("Límite de Crédito"),
-            "UTILIZACION_PCT": st.column_config.TextColumn("Utilización"),
-            "DISPONIBLE":      st.column_config.TextColumn("Disponible"),
+            "SALDO":           st.column_config.NumberColumn("Saldo Actual", format="$%,.2f"),
+            "LIMITE_CREDITO":  st.column_config.NumberColumn("Límite de Crédito", format="$%,.2f"),
+            "UTILIZACION_PCT": st.column_config.NumberColumn("Utilización", format="%.1f%%"),
+            "DISPONIBLE":      st.column_config.NumberColumn("Disponible", format="$%,.2f"),
             "ALERTA":          st.column_config.TextColumn("Nivel"),
         },
     )
@@ -270,24 +351,16 @@ else:
 st.subheader("Facturas con Saldo Pendiente")
 
 if not facturas_filtradas.empty:
-    # Solo mostrar cargos (no sus abonos parciales) para el conteo
-    cargos_vivos = facturas_filtradas[facturas_filtradas["TIPO_IMPTE"] == "C"] if "TIPO_IMPTE" in facturas_filtradas.columns else facturas_filtradas
-
-    st.caption(f"{len(cargos_vivos):,} facturas abiertas — {facturas_filtradas['NOMBRE_CLIENTE'].nunique() if 'NOMBRE_CLIENTE' in facturas_filtradas.columns else 0} clientes")
+    # Solo contar cargos (no sus abonos parciales); la separación viene del cargador
+    st.caption(f"{len(cargos_filtrados):,} facturas abiertas — {contar_unicos(facturas_filtradas['NOMBRE_CLIENTE']) if 'NOMBRE_CLIENTE' in cols_fv else 0} clientes")
 
     cols_mostrar = [
         "NOMBRE_CLIENTE", "FOLIO", "FECHA_EMISION", "FECHA_VENCIMIENTO",
         "CONCEPTO", "IMPORTE", "SALDO_FACTURA", "DELTA_MORA", "CATEGORIA_MORA",
     ]
-    cols_disponibles = [c for c in cols_mostrar if c in facturas_filtradas.columns]
-    display_fv = facturas_filtradas[cols_disponibles].copy()
-
-    for col in ["IMPORTE", "SALDO_FACTURA"]:
-        if col in display_fv.columns:
-            display_fv[col] = display_fv[col].apply(lambda x: f"${x:,.2f}" if pd.notna(x) else "")
-
+    cols_disponibles = [c for c in cols_mostrar if c in cols_fv]
     st.dataframe(
-        display_fv,
+        facturas_filtradas[cols_disponibles],
         use_container_width=True,
         hide_index=True,
         column_config={
@@ -296,8 +369,8 @@ if not facturas_filtradas.empty:
             "FECHA_EMISION":     st.column_config.DateColumn("Emisión", format="DD/MM/YYYY"),
             "FECHA_VENCIMIENTO": st.column_config.DateColumn("Vencimiento", format="DD/MM/YYYY"),
             "CONCEPTO":          st.column_config.TextColumn("Concepto"),
-            "IMPORTE":           st.column_config.TextColumn("Importe"),
-            "SALDO_FACTURA":     st.column_config.TextColumn("Saldo"),
+            "IMPORTE":           st.column_config.NumberColumn("Importe", format="$%,.2f"),
+            "SALDO_FACTURA":     st.column_config.NumberColumn("Saldo", format="$%,.2f"),
             "DELTA_MORA":        st.column_config.NumberColumn("Días Mora", format="%d"),
             "CATEGORIA_MORA":    st.column_config.TextColumn("Categoría"),
         },
@@ -305,30 +378,8 @@ if not facturas_filtradas.empty:
 else:
     st.success("✅ No hay facturas con saldo pendiente con los filtros actuales.")
 
+
 # ======================================================================
 # SECCIÓN 5: DISTRIBUCIÓN POR VENDEDOR
 # ======================================================================
-if not resumen_vendedores.empty:
-    st.divider()
-    st.subheader("Cartera por Vendedor")
-    
-    # CORRECCIÓN APLICADA: Uso de SALDO_PENDIENTE en lugar de IMPORTE_TOTAL
-    fig_vend = px.bar(
-        resumen_vendedores.head(10),
-        x="VENDEDOR",
-        y="SALDO_PENDIENTE",
-        color="SALDO_PENDIENTE",
-        color_continuous_scale="Blues",
-        text_auto=".2s",
-        labels={"VENDEDOR": "Vendedor", "SALDO_PENDIENTE": "Saldo Pendiente ($)"},
-    )
-    fig_vend.update_layout(
-        showlegend=False,
-        coloraxis_showscale=False,
-        plot_bgcolor="white",
-        paper_bgcolor="white",
-        margin=dict(t=20, b=60, l=10, r=10),
-        xaxis=dict(showgrid=False),
-        yaxis=dict(showgrid=True, gridcolor="#f1f5f9"),
-    )
-    st.plotly_chart(fig_vend, use_container_width=True)
\ No newline at end of file
+_render_vendedores()
\ No newline at end of file
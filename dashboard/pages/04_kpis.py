@@ -18,7 +18,7 @@ import streamlit as st
 ROOT = Path(__file__).resolve().parent.parent.parent
 sys.path.insert(0, str(ROOT))
 
-from dashboard.data_loader import cargar_kpis
+from dashboard.data_loader import buscar_kpi, cargar_kpis, obtener_vista
 from config.settings import KPI_PERIODO_DIAS
 
 # ======================================================================
@@ -43,10 +43,12 @@ except Exception as e:
     st.error(f"❌ Error al cargar datos: {e}")
     st.stop()
 
-kpis_resumen      = kpis_data.get("kpis_resumen", pd.DataFrame())
-concentracion     = kpis_data.get("kpis_concentracion", pd.DataFrame())
-limite_credito    = kpis_data.get("kpis_limite_credito", pd.DataFrame())
-morosidad_cliente = kpis_data.get("kpis_morosidad_cliente", pd.DataFrame())
+indice_kpis       = kpis_data["indice_kpis"]
+concentracion     = obtener_vista(kpis_data, "kpis_concentracion")
+limite_credito    = obtener_vista(kpis_data, "kpis_limite_credito")
+morosidad_cliente = obtener_vista(kpis_data, "kpis_morosidad_cliente")
+resumen_abc       = obtener_vista(kpis_data, "resumen_abc")
+top_riesgo        = obtener_vista(kpis_data, "top10_vencido")
 
 st.caption(f"Período de análisis: últimos {KPI_PERIODO_DIAS} días")
 st.divider()
@@ -55,14 +57,20 @@ st.divider()
 # ======================================================================
 # HELPERS
 # ======================================================================
+# Icono y descripción de cada clase del análisis ABC
+_DESC_ABC: dict[str, tuple[str, str]] = {
+    "A": ("🔴", "Top 80% del saldo — máxima prioridad"),
+    "B": ("🟡", "Siguiente 15% — seguimiento regular"),
+    "C": ("🟢", "Último 5% — gestión estándar"),
+}
+
+
 def _get_kpi_row(nombre: str) -> dict:
-    """Extrae fila de KPI del DataFrame resumen como diccionario."""
-    if kpis_resumen.empty:
-        return {}
-    row = kpis_resumen[kpis_resumen["KPI"].str.contains(nombre, case=False, na=False)]
-    return row.iloc[0].to_dict() if not row.empty else {}
+    """Extrae fila de KPI del resumen indexado como diccionario."""
+    return buscar_kpi(indice_kpis, nombre)
 
 
+@st.cache_data(ttl=3600)
 def _gauge(valor: float, min_val: float, max_val: float, umbral_ok: float,
            umbral_warn: float, titulo: str, unidad: str,
            invertir: bool = False) -> go.Figure:
@@ -120,6 +128,81 @@ def _gauge(valor: float, min_val: float, max_val: float, umbral_ok: float,
     return fig
 
 
+@st.cache_data(ttl=3600)
+def _fig_pareto(top20: pd.DataFrame) -> go.Figure:
+    """Construye la curva de Pareto de los primeros 20 clientes."""
+    fig_pareto = go.Figure()
+    # Barras de saldo por cliente (Top 20)
+    fig_pareto.add_trace(go.Bar(
+        x=top20["NOMBRE_CLIENTE"],
+        y=top20["SALDO"],
+        name="Saldo",
+        marker_color="#3b82f6",
+        opacity=0.8,
+        yaxis="y1",
+    ))
+    # Línea de % acumulado
+    fig_pareto.add_trace(go.Scatter(
+        x=top20["NOMBRE_CLIENTE"],
+        y=top20["PCT_ACUMULADO"],
+        name="% Acumulado",
+        line=dict(color="#ef4444", width=2),
+        mode="lines+markers",
+        yaxis="y2",
+    ))
+    # Línea de referencia 80%
+    fig_pareto.add_hline(
+        y=80, line_dash="dash", line_color="#22c55e",
+        annotation_text="80%", yref="y2",
+    )
+
+    fig_pareto.update_layout(
+        xaxis=dict(tickangle=-45, showgrid=False),
+        yaxis=dict(title="Saldo ($)", showgrid=True, gridcolor="#f1f5f9"),
+        yaxis2=dict(
+            title="% Acumulado",
+            overlaying="y", side="right",
+            range=[0, 110],
+            showgrid=False,
+        ),
+        legend=dict(orientation="h", y=1.1),
+        plot_bgcolor="white",
+        paper_bgcolor="white",
+        margin=dict(t=40, b=100, l=10, r=60),
+        height=380,
+    )
+    return fig_pareto
+
+
+@st.cache_data(ttl=3600)
+def _fig_riesgo(top_riesgo: pd.DataFrame) -> go.Figure:
+    """Construye las barras de clientes con mayor saldo vencido."""
+    fig_riesgo = px.bar(
+        top_riesgo,
+        x="SALDO_VENCIDO",
+        y="NOMBRE_CLIENTE",
+        orientation="h",
+        color="DIAS_VENCIDO_MAX",
+        color_continuous_scale=["#22c55e", "#f59e0b", "#ef4444"],
+        labels={
+            "SALDO_VENCIDO": "Saldo Vencido ($)",
+            "NOMBRE_CLIENTE": "",
+            "DIAS_VENCIDO_MAX": "Días vencido",
+        },
+        text="SALDO_VENCIDO",
+    )
+    fig_riesgo.update_traces(texttemplate="$%{text:,.0f}", textposition="outside")
+    fig_riesgo.update_layout(
+        plot_bgcolor="white",
+        paper_bgcolor="white",
+        yaxis=dict(autorange="reversed"),
+        margin=dict(t=20, b=20, l=150, r=120),
+        coloraxis_colorbar=dict(title="Días<br>vencido"),
+        height=400,
+    )
+    return fig_riesgo
+
+
 # ======================================================================
 # SECCIÓN 1: DSO
 # ======================================================================
@@ -239,99 +322,41 @@ if not concentracion.empty:
     pareto_col1, pareto_col2 = st.columns([1.5, 1])
 
     with pareto_col1:
-        # Gráfica de curva de Pareto
-        df_pareto = concentracion.copy()
-        df_pareto["RANK"] = range(1, len(df_pareto) + 1)
-
-        fig_pareto = go.Figure()
-        # Barras de saldo por cliente (Top 20)
-        top20 = df_pareto.head(20)
-        fig_pareto.add_trace(go.Bar(
-            x=top20["NOMBRE_CLIENTE"],
-            y=top20["SALDO"],
-            name="Saldo",
-            marker_color="#3b82f6",
-            opacity=0.8,
-            yaxis="y1",
-        ))
-        # Línea de % acumulado
-        fig_pareto.add_trace(go.Scatter(
-            x=top20["NOMBRE_CLIENTE"],
-            y=top20["PCT_ACUMULADO"],
-            name="% Acumulado",
-            line=dict(color="#ef4444", width=2),
-            mode="lines+markers",
-            yaxis="y2",
-        ))
-        # Línea de referencia 80%
-        fig_pareto.add_hline(
-            y=80, line_dash="dash", line_color="#22c55e",
-            annotation_text="80%", yref="y2",
-        )
-
-        fig_pareto.update_layout(
-            xaxis=dict(tickangle=-45, showgrid=False),
-            yaxis=dict(title="Saldo ($)", showgrid=True, gridcolor="#f1f5f9"),
-            yaxis2=dict(
-                title="% Acumulado",
-                overlaying="y", side="right",
-                range=[0, 110],
-                showgrid=False,
-            ),
-            legend=dict(orientation="h", y=1.1),
-            plot_bgcolor="white",
-            paper_bgcolor="white",
-            margin=dict(t=40, b=100, l=10, r=60),
-            height=380,
-        )
-        st.plotly_chart(fig_pareto, use_container_width=True)
+        st.plotly_chart(_fig_pareto(concentracion.head(20)), use_container_width=True)
 
     with pareto_col2:
         # Resumen ABC
-        if "CLASIFICACION" in concentracion.columns:
-            abc = concentracion.groupby("CLASIFICACION").agg(
-                CLIENTES=("NOMBRE_CLIENTE", "count"),
-                SALDO=("SALDO", "sum"),
-            ).reset_index()
-
-            total_saldo = concentracion["SALDO"].sum()
-            total_clientes = len(concentracion)
-
-            for _, row in abc.iterrows():
-                clase = row["CLASIFICACION"]
-                saldo = row["SALDO"]
-                clientes = row["CLIENTES"]
-                pct_s = saldo / total_saldo * 100 if total_saldo > 0 else 0
-                pct_c = clientes / total_clientes * 100 if total_clientes > 0 else 0
-
-                desc = {
-                    "A": ("🔴", "Top 80% del saldo — máxima prioridad"),
-                    "B": ("🟡", "Siguiente 15% — seguimiento regular"),
-                    "C": ("🟢", "Último 5% — gestión estándar"),
-                }.get(clase, ("⚪", ""))
-
-                icono, descripcion = desc
-                st.markdown(
-                    f"""
-                    **{icono} Clase {clase}**
-                    - {clientes} clientes ({pct_c:.1f}%)
-                    - ${saldo:,.2f} ({pct_s:.1f}% del total)
-                    - *{descripcion}*
-                    """,
+        if not resumen_abc.empty:
+            bloques = []
+            for clase, clientes, saldo, pct_c, pct_s in zip(
+                resumen_abc["CLASIFICACION"].to_numpy(),
+                resumen_abc["CLIENTES"].to_numpy(),
+                resumen_abc["SALDO"].to_numpy(),
+                resumen_abc["PCT_CLIENTES"].to_numpy(),
+                resumen_abc["PCT_SALDO"].to_numpy(),
+            ):
+                icono, descripcion = _DESC_ABC.get(clase, ("⚪", ""))
+                bloques.append(
+                    f"**{icono} Clase {clase}**\n"
+                    f"- {clientes} clientes ({pct_c:.1f}%)\n"
+                    f"- ${saldo:,.2f} ({pct_s:.1f}% del total)\n"
+                    f"- *{descripcion}*\n"
                 )
-                st.divider()
+            # Un solo bloque de markdown; "---" hace las veces de st.divider()
+            st.markdown("\n---\n".join(bloques) + "\n---")
 
     # Tabla completa de concentración
     with st.expander("Ver tabla completa de concentración"):
-        display_conc = concentracion.copy()
-        if "SALDO" in display_conc.columns:
-            display_conc["SALDO"] = display_conc["SALDO"].apply(lambda x: f"${x:,.2f}")
-        if "PCT_DEL_TOTAL" in display_conc.columns:
-            display_conc["PCT_DEL_TOTAL"] = display_conc["PCT_DEL_TOTAL"].apply(lambda x: f"{x:.2f}%")
-        if "PCT_ACUMULADO" in display_conc.columns:
-            display_conc["PCT_ACUMULADO"] = display_conc["PCT_ACUMULADO"].apply(lambda x: f"{x:.2f}%")
-
-        st.dataframe(display_conc, use_container_width=True, hide_index=True)
+        st.dataframe(
+            concentracion,
+            use_container_width=True,
+            hide_index=True,
+            column_config={
+                "SALDO":         st.column_config.NumberColumn(format="$%,.2f"),
+                "PCT_DEL_TOTAL": st.column_config.NumberColumn(format="%.2f%%"),
+                "PCT_ACUMULADO": st.column_config.NumberColumn(format="%.2f%%"),
+            },
+        )
 
 else:
     st.info("Sin datos de concentración disponibles.")
@@ -344,33 +369,8 @@ st.divider()
 st.subheader("Top 10 Clientes por Saldo Vencido")
 
 if not morosidad_cliente.empty and "SALDO_VENCIDO" in morosidad_cliente.columns:
-    top_riesgo = morosidad_cliente[morosidad_cliente["SALDO_VENCIDO"] > 0].nlargest(10, "SALDO_VENCIDO")
-
     if not top_riesgo.empty:
-        fig_riesgo = px.bar(
-            top_riesgo,
-            x="SALDO_VENCIDO",
-            y="NOMBRE_CLIENTE",
-            orientation="h",
-            color="DIAS_VENCIDO_MAX",
-            color_continuous_scale=["#22c55e", "#f59e0b", "#ef4444"],
-            labels={
-                "SALDO_VENCIDO": "Saldo Vencido ($)",
-                "NOMBRE_CLIENTE": "",
-                "DIAS_VENCIDO_MAX": "Días vencido",
-            },
-            text="SALDO_VENCIDO",
-        )
-        fig_riesgo.update_traces(texttemplate="$%{text:,.0f}", textposition="outside")
-        fig_riesgo.update_layout(
-            plot_bgcolor="white",
-            paper_bgcolor="white",
-            yaxis=dict(autorange="reversed"),
-            margin=dict(t=20, b=20, l=150, r=120),
-            coloraxis_colorbar=dict(title="Días<br>vencido"),
-            height=400,
-        )
-        st.plotly_chart(fig_riesgo, use_container_width=True)
+        st.plotly_chart(_fig_riesgo(top_riesgo), use_container_width=True)
     else:
         st.success("✅ No hay clientes con saldo vencido.")
 else:
@@ -12,12 +12,13 @@ from pathlib import Path
 
 import pandas as pd
 import plotly.express as px
+import plotly.graph_objects as go
 import streamlit as st
 
 ROOT = Path(__file__).resolve().parent.parent.parent
 sys.path.insert(0, str(ROOT))
 
-from dashboard.data_loader import cargar_auditoria
+from dashboard.data_loader import cargar_auditoria, tabla_arrow
 
 # ======================================================================
 # HEADER
@@ -50,6 +51,59 @@ cancelados       = audit.documentos_cancelados
 venc_criticos    = audit.moras_atipicas
 calidad_datos    = audit.calidad_datos
 
+# ======================================================================
+# HELPERS
+# ======================================================================
+# (llave en resumen, icono, nombre) de cada tipo de hallazgo
+_TIPOS_HALLAZGO: tuple[tuple[str, str, str], ...] = (
+    ("importes_atipicos", "📊", "Importes Atípicos"),
+    ("sin_tipo_cliente",  "👤", "Sin Tipo Cliente"),
+    ("sin_vendedor",      "👔", "Sin Vendedor"),
+    ("cancelados",        "❌", "Cancelados"),
+    ("moras_atipicas",    "⏰", "Moras Atípicas"),
+)
+
+
+@st.cache_data(ttl=3600)
+def _fig_hallazgos(conteos: tuple[tuple[str, int], ...]) -> go.Figure:
+    """Construye las barras de hallazgos por tipo (solo tipos con casos)."""
+    tipos, cantidades = (list(v) for v in zip(*conteos))
+    fig = px.bar(
+        x=tipos,
+        y=cantidades,
+        color=tipos,
+        color_discrete_sequence=["#ef4444", "#f97316", "#f59e0b", "#94a3b8", "#3b82f6"],
+        text_auto=True,
+        labels={"x": "Tipo", "y": "Cantidad", "color": "Tipo"},
+    )
+    fig.update_traces(textposition="outside")
+    fig.update_layout(
+        showlegend=False,
+        plot_bgcolor="white",
+        paper_bgcolor="white",
+        margin=dict(t=30, b=20, l=10, r=10),
+        xaxis=dict(showgrid=False),
+        yaxis=dict(showgrid=True, gridcolor="#f1f5f9"),
+    )
+    return fig
+
+
+@st.cache_data(ttl=3600)
+def _fig_atipicos(importes: pd.DataFrame) -> go.Figure:
+    """Construye el box plot de importes atípicos."""
+    fig_dist = px.box(
+        importes,
+        y="IMPORTE",
+        title="Distribución de importes atípicos",
+        color_discrete_sequence=["#ef4444"],
+    )
+    fig_dist.update_layout(
+        plot_bgcolor="white", paper_bgcolor="white",
+        margin=dict(t=40, b=20, l=10, r=10), height=250,
+    )
+    return fig_dist
+
+
 # ======================================================================
 # SECCIÓN 1: RESUMEN EJECUTIVO DE AUDITORÍA
 # ======================================================================
@@ -85,58 +139,27 @@ else:
 st.write("")
 
 # Tarjetas por tipo de hallazgo
-col1, col2, col3, col4, col5 = st.columns(5)
-
-hallazgos_config = [
-    (col1, "importes_atipicos",   "📊 Importes Atípicos",    resumen.get("importes_atipicos", 0)),
-    (col2, "sin_tipo_cliente",    "👤 Sin Tipo Cliente",     resumen.get("sin_tipo_cliente", 0)),
-    (col3, "sin_vendedor",        "👔 Sin Vendedor",         resumen.get("sin_vendedor", 0)),
-    (col4, "cancelados",          "❌ Cancelados",           resumen.get("cancelados", 0)),
-    (col5, "moras_atipicas",      "⏰ Moras Atípicas",       resumen.get("moras_atipicas", 0)),
-]
+cantidades = tuple(resumen.get(clave, 0) for clave, _, _ in _TIPOS_HALLAZGO)
 
-for col, clave, titulo, cantidad in hallazgos_config:
+for col, (_, icono, nombre), cantidad in zip(st.columns(5), _TIPOS_HALLAZGO, cantidades):
     with col:
         color = "🔴" if cantidad > 0 else "🟢"
-        st.metric(titulo, f"{color} {cantidad:,}")
+        st.metric(f"{icono} {nombre}", f"{color} {cantidad:,}")
 
 st.divider()
 
 # ======================================================================
 # SECCIÓN 2: GRÁFICA DE DISTRIBUCIÓN DE HALLAZGOS
 # ======================================================================
-if total_hallazgos > 0:
-    st.subheader("Distribución de Hallazgos por Tipo")
-
-    datos_grafica = pd.DataFrame([
-        {"Tipo": "Importes Atípicos", "Cantidad": resumen.get("importes_atipicos", 0)},
-        {"Tipo": "Sin Tipo Cliente",  "Cantidad": resumen.get("sin_tipo_cliente", 0)},
-        {"Tipo": "Sin Vendedor",      "Cantidad": resumen.get("sin_vendedor", 0)},
-        {"Tipo": "Cancelados",        "Cantidad": resumen.get("cancelados", 0)},
-        {"Tipo": "Moras Atípicas",    "Cantidad": resumen.get("moras_atipicas", 0)},
-    ])
-    datos_grafica = datos_grafica[datos_grafica["Cantidad"] > 0]
-
-    if not datos_grafica.empty:
-        fig = px.bar(
-            datos_grafica,
-            x="Tipo",
-            y="Cantidad",
-            color="Tipo",
-            color_discrete_sequence=["#ef4444", "#f97316", "#f59e0b", "#94a3b8", "#3b82f6"],
-            text="Cantidad",
-        )
-        fig.update_traces(textposition="outside")
-        fig.update_layout(
-            showlegend=False,
-            plot_bgcolor="white",
-            paper_bgcolor="white",
-            margin=dict(t=30, b=20, l=10, r=10),
-            xaxis=dict(showgrid=False),
-            yaxis=dict(showgrid=True, gridcolor="#f1f5f9"),
-        )
-        st.plotly_chart(fig, use_container_width=True)
+conteos = tuple(
+    (nombre, cantidad)
+    for (_, _, nombre), cantidad in zip(_TIPOS_HALLAZGO, cantidades)
+    if cantidad > 0
+)
 
+if conteos:
+    st.subheader("Distribución de Hallazgos por Tipo")
+    st.plotly_chart(_fig_hallazgos(conteos), use_container_width=True)
     st.divider()
 
 # ======================================================================
@@ -163,32 +186,20 @@ with tab1:
         "Puede indicar error de captura o una transacción inusualmente grande."
     )
     if not atipicos.empty:
-        cols_mostrar = [c for c in [
-            "NOMBRE_CLIENTE", "FOLIO", "CONCEPTO", "FECHA_EMISION",
-            "IMPORTE", "ZSCORE_IMPORTE", "MOTIVO",
-        ] if c in atipicos.columns]
-        display_at = atipicos[cols_mostrar].copy()
-        if "IMPORTE" in display_at.columns:
-            display_at["IMPORTE"] = display_at["IMPORTE"].apply(lambda x: f"${x:,.2f}" if pd.notna(x) else "")
-        if "ZSCORE_IMPORTE" in display_at.columns:
-            display_at["ZSCORE_IMPORTE"] = display_at["ZSCORE_IMPORTE"].apply(lambda x: f"{x:.2f}" if pd.notna(x) else "")
-
-        st.dataframe(display_at, use_container_width=True, hide_index=True)
+        st.dataframe(
+            atipicos,
+            use_container_width=True,
+            hide_index=True,
+            column_config={
+                "IMPORTE":        st.column_config.NumberColumn(format="$%,.2f"),
+                "ZSCORE_IMPORTE": st.column_config.NumberColumn(format="%.2f"),
+            },
+        )
         st.caption(f"{len(atipicos):,} importes atípicos detectados")
 
         # Mini gráfica de distribución
         if "IMPORTE" in atipicos.columns and len(atipicos) > 1:
-            fig_dist = px.box(
-                atipicos,
-                y="IMPORTE",
-                title="Distribución de importes atípicos",
-                color_discrete_sequence=["#ef4444"],
-            )
-            fig_dist.update_layout(
-                plot_bgcolor="white", paper_bgcolor="white",
-                margin=dict(t=40, b=20, l=10, r=10), height=250,
-            )
-            st.plotly_chart(fig_dist, use_container_width=True)
+            st.plotly_chart(_fig_atipicos(atipicos[["IMPORTE"]]), use_container_width=True)
     else:
         st.success("✅ No se detectaron importes atípicos.")
 
@@ -199,12 +210,8 @@ with tab2:
         "Afecta la clasificación del análisis. Verifique la captura en Microsip."
     )
     if not sin_cliente.empty:
-        cols_mostrar = [c for c in [
-            "FOLIO", "CONCEPTO", "FECHA_EMISION", "IMPORTE",
-            "NOMBRE_CLIENTE", "TIPO_CLIENTE", "VENDEDOR", "MOTIVO",
-        ] if c in sin_cliente.columns]
         st.dataframe(
-            sin_cliente[cols_mostrar],
+            sin_cliente,
             use_container_width=True,
             hide_index=True,
         )
@@ -218,12 +225,8 @@ with tab3:
         "Afecta los reportes y gráficas de la fuerza de ventas. Verifique la captura en Microsip."
     )
     if not sin_vendedor.empty:
-        cols_mostrar = [c for c in [
-            "FOLIO", "CONCEPTO", "FECHA_EMISION", "IMPORTE",
-            "NOMBRE_CLIENTE", "TIPO_CLIENTE", "VENDEDOR", "MOTIVO",
-        ] if c in sin_vendedor.columns]
         st.dataframe(
-            sin_vendedor[cols_mostrar],
+            sin_vendedor,
             use_container_width=True,
             hide_index=True,
         )
@@ -238,14 +241,14 @@ with tab4:
         "El pipeline los excluye de los cálculos, pero se listan aquí para referencia."
     )
     if not cancelados.empty:
-        cols_mostrar = [c for c in [
-            "NOMBRE_CLIENTE", "FOLIO", "CONCEPTO", "FECHA_EMISION",
-            "IMPORTE", "DIAS_HASTA_CANCELACION", "MOTIVO",
-        ] if c in cancelados.columns]
-        display_can = cancelados[cols_mostrar].copy()
-        if "IMPORTE" in display_can.columns:
-            display_can["IMPORTE"] = display_can["IMPORTE"].apply(lambda x: f"${x:,.2f}" if pd.notna(x) else "")
-        st.dataframe(display_can, use_container_width=True, hide_index=True)
+        st.dataframe(
+            cancelados,
+            use_container_width=True,
+            hide_index=True,
+            column_config={
+                "IMPORTE": st.column_config.NumberColumn(format="$%,.2f"),
+            },
+        )
         st.caption(f"{len(cancelados):,} documentos cancelados")
     else:
         st.success("✅ No se encontraron documentos cancelados.")
@@ -258,47 +261,40 @@ with tab5:
         "estadísticamente anormal comparado con la mora del resto de la cartera."
     )
     if not venc_criticos.empty:
-        # Agrupar por cliente para visualización
+        # Resumen por cliente ya agrupado y convertido a Arrow en el loader
         if "NOMBRE_CLIENTE" in venc_criticos.columns and "IMPORTE" in venc_criticos.columns:
-            resumen_vc = (
-                venc_criticos.groupby("NOMBRE_CLIENTE")
-                .agg(
-                    NUM_DOCS=("IMPORTE", "count"),
-                    IMPORTE_TOTAL=("IMPORTE", "sum"),
-                    DIAS_MAX=("DELTA_MORA", "max"),
-                )
-                .reset_index()
-                .sort_values("IMPORTE_TOTAL", ascending=False)
-            )
+            resumen_vc = tabla_arrow("auditoria", "resumen_moras_atipicas")
 
             g_col1, g_col2 = st.columns(2)
             with g_col1:
-                st.metric("Clientes con mora atípica", f"{resumen_vc['NOMBRE_CLIENTE'].nunique():,}")
+                st.metric("Clientes con mora atípica", f"{resumen_vc.num_rows:,}")
             with g_col2:
                 st.metric("Monto en mora atípica", f"${venc_criticos['IMPORTE'].sum():,.2f}")
 
             st.write("")
 
-            display_vc = resumen_vc.copy()
-            display_vc["IMPORTE_TOTAL"] = display_vc["IMPORTE_TOTAL"].apply(lambda x: f"${x:,.2f}")
             st.dataframe(
-                display_vc,
+                resumen_vc,
                 use_container_width=True,
                 hide_index=True,
                 column_config={
                     "NOMBRE_CLIENTE": st.column_config.TextColumn("Cliente"),
                     "NUM_DOCS":       st.column_config.NumberColumn("Documentos", format="%d"),
-                    "IMPORTE_TOTAL":  st.column_config.TextColumn("Importe en Riesgo"),
+                    "IMPORTE_TOTAL":  st.column_config.NumberColumn("Importe en Riesgo", format="$%,.2f"),
                     "DIAS_MAX":       st.column_config.NumberColumn("Días Mora Máx", format="%d"),
                 },
             )
 
         with st.expander("Ver todos los documentos individuales"):
-            cols_mostrar = [c for c in [
-                "NOMBRE_CLIENTE", "FOLIO", "CONCEPTO", "FECHA_VENCIMIENTO",
-                "IMPORTE", "DELTA_MORA", "ZSCORE_DELTA_MORA",
-            ] if c in venc_criticos.columns]
-            st.dataframe(venc_criticos[cols_mostrar], use_container_width=True, hide_index=True)
+            st.dataframe(
+                venc_criticos,
+                use_container_width=True,
+                hide_index=True,
+                column_config={
+                    "IMPORTE":           st.column_config.NumberColumn(format="$%,.2f"),
+                    "ZSCORE_DELTA_MORA": st.column_config.NumberColumn(format="%.2f"),
+                },
+            )
     else:
         st.success("✅ No hay moras atípicas detectadas.")
 
@@ -311,12 +307,8 @@ with tab6:
         "incompleta en Microsip o campos no utilizados."
     )
     if not calidad_datos.empty:
-        display_cd = calidad_datos.copy()
-        if "PCT_NULOS" in display_cd.columns:
-            display_cd["PCT_NULOS"] = display_cd["PCT_NULOS"].apply(lambda x: f"{x:.1f}%")
-
         st.dataframe(
-            display_cd,
+            calidad_datos,
             use_container_width=True,
             hide_index=True,
             column_config={
@@ -324,7 +316,7 @@ with tab6:
                 "TIPO_DATO":       st.column_config.TextColumn("Tipo"),
                 "TOTAL_REGISTROS": st.column_config.NumberColumn("Total", format="%d"),
                 "NULOS":           st.column_config.NumberColumn("Nulos", format="%d"),
-                "PCT_NULOS":       st.column_config.TextColumn("% Nulos"),
+                "PCT_NULOS":       st.column_config.NumberColumn("% Nulos", format="%.1f%%"),
                 "VALORES_UNICOS":  st.column_config.NumberColumn("Valores Únicos", format="%d"),
             },
         )
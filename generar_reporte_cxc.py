@@ -12,23 +12,32 @@ Dependencias:
 
 Uso:
     python generar_reporte_cxc.py
+    python generar_reporte_cxc.py --exportar-datos   # escribe data/cxc/*.parquet
 """
 
 import os
 import io
+import sys
+import pickle
+import hashlib
+import functools
+import inspect
 import tempfile
 from datetime import datetime
 
 import matplotlib
 matplotlib.use('Agg')
-import matplotlib.pyplot as plt
 import matplotlib.ticker as mticker
+from matplotlib.figure import Figure
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
 
 from reportlab.lib.pagesizes import landscape, letter
 from reportlab.lib import colors
 from reportlab.lib.units import inch, cm
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.enums import TA_CENTER, TA_RIGHT, TA_LEFT
+from reportlab.lib.enums import TA_LEFT
 from reportlab.platypus import (
     SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer,
     PageBreak, Image as RLImage, KeepTogether
@@ -41,6 +50,14 @@ from reportlab.pdfgen import canvas
 # =============================================================================
 ARCHIVO_SALIDA = "Reporte_CXC.pdf"
 
+# Directorio con las secciones en Parquet (una por archivo, particionadas
+# por moneda). Si un archivo no existe se usan los datos embebidos.
+DIRECTORIO_DATOS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "cxc")
+MONEDAS = ("MXN", "USD")
+
+# Caché en disco de las gráficas ya rasterizadas (PNG)
+DIRECTORIO_CACHE_GRAFICOS = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "charts")
+
 # Colores corporativos
 COLOR_HEADER = colors.HexColor("#003366")
 COLOR_HEADER_TEXT = colors.white
@@ -53,6 +70,15 @@ COLOR_ACCENT = colors.HexColor("#0055A4")
 CHART_COLORS = ['#003366', '#0055A4', '#4A90D9', '#7FB3E0', '#B0D4F1', '#D6E8F7']
 CHART_COLORS_2 = ['#003366', '#C0392B']  # Vigentes vs Vencidas
 
+# Rasterizado Agg: simplificar trayectorias y dividirlas en bloques
+RC_PARAMS_GRAFICOS = {
+    "path.simplify": True,
+    "path.simplify_threshold": 1.0,
+    "agg.path.chunksize": 10000,
+    "figure.autolayout": False,
+}
+matplotlib.rcParams.update(RC_PARAMS_GRAFICOS)
+
 # Tamaño de página
 PAGE_W, PAGE_H = landscape(letter)
 MARGIN = 0.6 * inch
@@ -174,6 +200,82 @@ data_cancelados_usd = [
 ]
 
 
+# Datos embebidos por sección y moneda (respaldo cuando no hay Parquet)
+_SECCIONES_EMBEBIDAS = {
+    "resumen": {"MXN": data_resumen_mxn, "USD": data_resumen_usd},
+    "antiguedad": {"MXN": data_antiguedad_mxn, "USD": data_antiguedad_usd},
+    "clientes": {"MXN": data_clientes_mxn, "USD": data_clientes_usd},
+    "vendedor": {"MXN": data_vendedor_mxn, "USD": data_vendedor_usd},
+    "concepto": {"MXN": data_concepto_mxn, "USD": data_concepto_usd},
+    "ajustes": {"MXN": data_ajustes_mxn, "USD": data_ajustes_usd},
+    "cancelados": {"MXN": data_cancelados_mxn, "USD": data_cancelados_usd},
+}
+
+
+# =============================================================================
+# FUENTE DE DATOS (Parquet por sección)
+# =============================================================================
+
+def _ruta_seccion(nombre, directorio=None):
+    """Ruta del archivo Parquet de una sección."""
+    return os.path.join(directorio or DIRECTORIO_DATOS, f"{nombre}.parquet")
+
+
+def load_columnas(nombre, moneda, columns, directorio=None):
+    """
+    Carga columnas de una sección como arreglos numpy (una por columna).
+
+    Lee ``data/cxc/{nombre}.parquet`` filtrando por moneda, de modo que
+    solo se materializan el row-group y las columnas necesarias. Si el
+    archivo no existe, devuelve los datos embebidos en este script.
+
+    Args:
+        nombre: Sección del reporte.
+        moneda: 'MXN' o 'USD'.
+        columns: Columnas a cargar.
+        directorio: Directorio alterno de los archivos Parquet.
+
+    Returns:
+        Dict columna -> np.ndarray.
+    """
+    ruta = _ruta_seccion(nombre, directorio)
+    if not os.path.exists(ruta):
+        filas = _SECCIONES_EMBEBIDAS[nombre][moneda]
+        return {c: np.array([f[c] for f in filas]) for c in columns}
+
+    tabla = pq.read_table(ruta, columns=columns, filters=[("moneda", "=", moneda)])
+    return {c: tabla.column(c).to_numpy() for c in columns}
+
+
+def exportar_secciones_parquet(directorio=None):
+    """
+    Escribe cada sección embebida como ``{nombre}.parquet``.
+
+    Cada moneda queda en su propio row-group (compresión Snappy), así el
+    filtro por moneda de ``load_columnas`` descarta el resto sin leerlo.
+
+    Args:
+        directorio: Directorio destino; por defecto DIRECTORIO_DATOS.
+    """
+    directorio = directorio or DIRECTORIO_DATOS
+    os.makedirs(directorio, exist_ok=True)
+    for nombre, por_moneda in _SECCIONES_EMBEBIDAS.items():
+        tablas = [
+            pa.Table.from_pylist(por_moneda[m]).append_column(
+                "moneda", pa.array([m] * len(por_moneda[m]), pa.string())
+            )
+            for m in MONEDAS
+        ]
+        esquema = pa.unify_schemas([t.schema for t in tablas])
+        with pq.ParquetWriter(_ruta_seccion(nombre, directorio), esquema, compression="snappy") as escritor:
+            for t in tablas:
+                for campo in esquema:
+                    if campo.name not in t.column_names:
+                        t = t.append_column(campo, pa.nulls(t.num_rows, campo.type))
+                escritor.write_table(t.select(esquema.names), row_group_size=max(t.num_rows, 1))
+    print(f"✅ Secciones exportadas en: {directorio}")
+
+
 # =============================================================================
 # UTILIDADES DE FORMATO
 # =============================================================================
@@ -192,23 +294,92 @@ def fmt_int(val):
     return f"{val:,}"
 
 
-def fmt_pct(val):
-    """Formatea porcentaje."""
-    if val is None:
-        return ""
-    return f"{val:.2f}%"
+def fmt_money_col(valores):
+    """Formatea una columna completa como moneda (nulos como vacío)."""
+    return [f"{v:,.2f}" if v is not None and v == v else "" for v in np.asarray(valores).tolist()]
+
+
+def fmt_int_col(valores):
+    """Formatea una columna completa de enteros con comas."""
+    return [f"{v:,}" if v is not None and v == v else "" for v in np.asarray(valores).tolist()]
+
+
+def fmt_pct_col(valores):
+    """Formatea una columna completa de porcentajes."""
+    return [f"{v:.2f}%" if v is not None and v == v else "" for v in np.asarray(valores).tolist()]
+
+
+def fmt_texto_col(valores):
+    """Devuelve una columna de texto como lista de str de Python."""
+    return np.asarray(valores).tolist()
 
 
 # =============================================================================
 # GENERACIÓN DE GRÁFICOS (con aspecto correcto)
 # =============================================================================
 
+@functools.lru_cache(maxsize=16)
+def _paleta(n):
+    """Primeros ``n`` colores de la paleta corporativa (inmutable)."""
+    return tuple(CHART_COLORS[:n])
+
+
+@functools.lru_cache(maxsize=None)
+def _fuente_grafico(func):
+    """Código fuente de una función de gráfico (incluye sus literales)."""
+    try:
+        return inspect.getsource(func)
+    except (OSError, TypeError):
+        return (func.__code__.co_code, func.__code__.co_consts)
+
+
+def _ruta_cache_grafico(func, args, kwargs):
+    """Ruta del PNG en caché para una llamada de gráfico."""
+    func = getattr(func, "__wrapped__", func)
+    entorno = (tuple(CHART_COLORS), sorted(RC_PARAMS_GRAFICOS.items()), matplotlib.__version__)
+    llave = hashlib.blake2b(
+        pickle.dumps((func.__name__, _fuente_grafico(func), entorno, args, sorted(kwargs.items()))),
+        digest_size=16,
+    ).hexdigest()
+    return os.path.join(DIRECTORIO_CACHE_GRAFICOS, f"{llave}.png")
+
+
+def _cache_grafico(func):
+    """
+    Guarda en disco el PNG que genera una función de gráfico.
+
+    La llave combina el nombre y el código fuente de la función, la
+    paleta, los rcParams del módulo y la versión de matplotlib con sus
+    argumentos; si los datos no cambian entre corridas se devuelve el
+    PNG guardado sin pasar por matplotlib.
+    """
+    @functools.wraps(func)
+    def envoltura(*args, **kwargs):
+        ruta = _ruta_cache_grafico(func, args, kwargs)
+        if os.path.exists(ruta):
+            with open(ruta, "rb") as f:
+                return io.BytesIO(f.read())
+
+        buf = func(*args, **kwargs)
+        try:
+            os.makedirs(DIRECTORIO_CACHE_GRAFICOS, exist_ok=True)
+            with open(ruta, "wb") as f:
+                f.write(buf.getvalue())
+        except OSError:
+            pass  # Sin caché, el reporte se genera igual
+        return buf
+
+    return envoltura
+
+
+@_cache_grafico
 def crear_grafico_pastel(labels, sizes, titulo, colores=None, figsize=(5.5, 3.5)):
     """Crea un gráfico de pastel y lo devuelve como bytes PNG."""
     if colores is None:
-        colores = CHART_COLORS[:len(labels)]
+        colores = _paleta(len(labels))
 
-    fig, ax = plt.subplots(figsize=figsize, dpi=150)
+    fig = Figure(figsize=figsize, dpi=150)
+    ax = fig.add_subplot()
 
     wedges, texts, autotexts = ax.pie(
         sizes, labels=None, autopct='%1.1f%%',
@@ -232,14 +403,15 @@ def crear_grafico_pastel(labels, sizes, titulo, colores=None, figsize=(5.5, 3.5)
 
     buf = io.BytesIO()
     fig.savefig(buf, format='png', bbox_inches='tight', dpi=150)
-    plt.close(fig)
     buf.seek(0)
     return buf
 
 
+@_cache_grafico
 def crear_grafico_barras_h(labels, values, titulo, color='#003366', figsize=(5.5, 3.5)):
     """Crea un gráfico de barras horizontales."""
-    fig, ax = plt.subplots(figsize=figsize, dpi=150)
+    fig = Figure(figsize=figsize, dpi=150)
+    ax = fig.add_subplot()
 
     y_pos = range(len(labels))
     bars = ax.barh(y_pos, values, color=color, edgecolor='white', height=0.6)
@@ -251,8 +423,9 @@ def crear_grafico_barras_h(labels, values, titulo, color='#003366', figsize=(5.5
     ax.xaxis.set_major_formatter(mticker.FuncFormatter(lambda x, p: f'${x:,.0f}'))
     ax.tick_params(axis='x', labelsize=7)
 
+    desplazamiento = np.max(values) * 0.01
     for bar, val in zip(bars, values):
-        ax.text(bar.get_width() + max(values) * 0.01, bar.get_y() + bar.get_height() / 2,
+        ax.text(bar.get_width() + desplazamiento, bar.get_y() + bar.get_height() / 2,
                 f'${val:,.0f}', va='center', fontsize=6, color='#333333')
 
     ax.set_title(titulo, fontsize=10, fontweight='bold', color='#003366', pad=10)
@@ -262,21 +435,22 @@ def crear_grafico_barras_h(labels, values, titulo, color='#003366', figsize=(5.5
 
     buf = io.BytesIO()
     fig.savefig(buf, format='png', bbox_inches='tight', dpi=150)
-    plt.close(fig)
     buf.seek(0)
     return buf
 
 
+@_cache_grafico
 def crear_grafico_barras_agrupadas(labels, vals1, vals2, label1, label2, titulo, figsize=(6, 3.5)):
     """Crea gráfico de barras agrupadas verticales."""
-    import numpy as np
-    fig, ax = plt.subplots(figsize=figsize, dpi=150)
+    fig = Figure(figsize=figsize, dpi=150)
+    ax = fig.add_subplot()
 
     x = np.arange(len(labels))
     width = 0.35
+    medio = width / 2
 
-    bars1 = ax.bar(x - width / 2, vals1, width, label=label1, color='#003366', edgecolor='white')
-    bars2 = ax.bar(x + width / 2, vals2, width, label=label2, color='#4A90D9', edgecolor='white')
+    bars1 = ax.bar(x - medio, vals1, width, label=label1, color='#003366', edgecolor='white')
+    bars2 = ax.bar(x + medio, vals2, width, label=label2, color='#4A90D9', edgecolor='white')
 
     ax.set_xticks(x)
     ax.set_xticklabels(labels, fontsize=7, rotation=25, ha='right')
@@ -291,81 +465,203 @@ def crear_grafico_barras_agrupadas(labels, vals1, vals2, label1, label2, titulo,
 
     buf = io.BytesIO()
     fig.savefig(buf, format='png', bbox_inches='tight', dpi=150)
-    plt.close(fig)
     buf.seek(0)
     return buf
 
 
+def renderizar_graficos(trabajos):
+    """
+    Genera varias gráficas independientes en este proceso.
+
+    Cada gráfica pasa por la caché de disco de su función; un pool de
+    procesos no compensa su arranque con cinco figuras pequeñas.
+
+    Args:
+        trabajos: Dict nombre -> (función, args, kwargs).
+
+    Returns:
+        Dict nombre -> BytesIO con el PNG, en el mismo orden.
+    """
+    return {
+        nombre: func(*args, **kwargs)
+        for nombre, (func, args, kwargs) in trabajos.items()
+    }
+
+
 # =============================================================================
 # CONSTRUCCIÓN DE TABLAS CON ESTILO
 # =============================================================================
 
+_ESTILO_TABLA_BASE = (
+    # Header
+    ('BACKGROUND', (0, 0), (-1, 0), COLOR_HEADER),
+    ('TEXTCOLOR', (0, 0), (-1, 0), COLOR_HEADER_TEXT),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 7),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 6),
+    ('TOPPADDING', (0, 0), (-1, 0), 6),
+    ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
+
+    # Body
+    ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+    ('FONTSIZE', (0, 1), (-1, -1), 7),
+    ('BOTTOMPADDING', (0, 1), (-1, -1), 4),
+    ('TOPPADDING', (0, 1), (-1, -1), 4),
+
+    # Grid
+    ('GRID', (0, 0), (-1, -1), 0.5, COLOR_BORDER),
+    ('LINEBELOW', (0, 0), (-1, 0), 1.5, COLOR_HEADER),
+
+    # Alignment default
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+)
+
+
 def estilo_tabla_base(num_rows, col_widths=None):
-    """Devuelve un estilo de tabla estándar corporativo."""
-    style = [
-        # Header
-        ('BACKGROUND', (0, 0), (-1, 0), COLOR_HEADER),
-        ('TEXTCOLOR', (0, 0), (-1, 0), COLOR_HEADER_TEXT),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 7),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 6),
-        ('TOPPADDING', (0, 0), (-1, 0), 6),
-        ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
-
-        # Body
-        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 1), (-1, -1), 7),
-        ('BOTTOMPADDING', (0, 1), (-1, -1), 4),
-        ('TOPPADDING', (0, 1), (-1, -1), 4),
-
-        # Grid
-        ('GRID', (0, 0), (-1, -1), 0.5, COLOR_BORDER),
-        ('LINEBELOW', (0, 0), (-1, 0), 1.5, COLOR_HEADER),
-
-        # Alignment default
-        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-    ]
+    """
+    Devuelve un estilo de tabla estándar corporativo.
+
+    La parte fija se arma una sola vez al importar el módulo; el cebreado
+    de filas es un único comando ROWBACKGROUNDS en lugar de un BACKGROUND
+    por fila.
+    """
+    style = list(_ESTILO_TABLA_BASE)
 
-    # Zebra striping
-    for i in range(1, num_rows + 1):
-        if i % 2 == 0:
-            style.append(('BACKGROUND', (0, i), (-1, i), COLOR_ROW_EVEN))
-        else:
-            style.append(('BACKGROUND', (0, i), (-1, i), COLOR_ROW_ODD))
+    # Zebra striping (fila 1 impar, fila 2 par, ...)
+    if num_rows > 0:
+        style.append(('ROWBACKGROUNDS', (0, 1), (-1, num_rows), [COLOR_ROW_ODD, COLOR_ROW_EVEN]))
 
     return style
 
 
-def crear_seccion_titulo(texto, styles):
+# Comandos adicionales compartidos por las tablas gemelas MXN/USD
+_EXTRA_NUMEROS_DESDE_COL2 = (
+    ('ALIGN', (2, 1), (-1, -1), 'RIGHT'),
+    ('ALIGN', (0, 1), (1, -1), 'LEFT'),
+)
+_EXTRA_NUMEROS_DESDE_COL3 = (
+    ('ALIGN', (3, 1), (-1, -1), 'RIGHT'),
+    ('ALIGN', (0, 1), (2, -1), 'LEFT'),
+)
+_EXTRA_FILA_TOTAL = (
+    ('BACKGROUND', (0, -1), (-1, -1), colors.HexColor("#E8EEF4")),
+    ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
+)
+_EXTRA_CLIENTES = (
+    ('ALIGN', (1, 1), (-1, -1), 'RIGHT'),
+    ('ALIGN', (0, 1), (0, -1), 'LEFT'),
+    ('FONTSIZE', (0, 0), (-1, -1), 6),
+    ('FONTSIZE', (0, 0), (-1, 0), 6.5),
+)
+
+
+@functools.lru_cache(maxsize=32)
+def _estilo_tabla(num_rows, extra):
+    """TableStyle memoizado por número de filas y comandos adicionales."""
+    return TableStyle(estilo_tabla_base(num_rows) + list(extra))
+
+
+def crear_tabla(datos, col_widths, extra=(), **kwargs):
+    """
+    Crea una tabla con el estilo corporativo más comandos adicionales.
+
+    Las tablas MXN/USD de una misma sección comparten ``extra``; si
+    además tienen el mismo número de filas reutilizan el mismo TableStyle.
+
+    Args:
+        datos: Filas de la tabla, con encabezado en la primera.
+        col_widths: Anchos de columna.
+        extra: Tupla de comandos de estilo propios de la tabla.
+        **kwargs: Argumentos adicionales para ``Table`` (p. ej. repeatRows).
+    """
+    tabla = Table(datos, colWidths=col_widths, **kwargs)
+    tabla.setStyle(_estilo_tabla(len(datos) - 1, extra))
+    return tabla
+
+
+def filas_tabla(nombre, moneda, campos, etiqueta=True):
+    """
+    Arma las filas de datos de una tabla formateando columna por columna.
+
+    Cada columna se carga y formatea en una sola pasada; las filas se
+    ensamblan al final con zip en lugar de indexar un dict por celda.
+
+    Args:
+        nombre: Sección del reporte.
+        moneda: 'MXN' o 'USD'.
+        campos: Lista de (columna, formateador de columna completa).
+        etiqueta: Si True, la primera celda de cada fila es la moneda.
+
+    Returns:
+        Lista de filas listas para ``Table``.
+    """
+    datos = load_columnas(nombre, moneda, [c for c, _ in campos])
+    columnas = [fmt(datos[c]) for c, fmt in campos]
+    if etiqueta:
+        columnas.insert(0, [moneda] * len(columnas[0]))
+    return [list(fila) for fila in zip(*columnas)]
+
+
+_ESTILOS_BASE = getSampleStyleSheet()
+
+_ESTILO_SECCION = ParagraphStyle(
+    'SeccionTitulo',
+    parent=_ESTILOS_BASE['Heading1'],
+    fontSize=13,
+    textColor=COLOR_HEADER,
+    spaceAfter=8,
+    spaceBefore=4,
+    fontName='Helvetica-Bold',
+)
+
+_ESTILO_SUBTITULO = ParagraphStyle(
+    'SubTitulo',
+    parent=_ESTILOS_BASE['Heading2'],
+    fontSize=10,
+    textColor=COLOR_ACCENT,
+    spaceAfter=4,
+    spaceBefore=8,
+    fontName='Helvetica-Bold',
+)
+
+# Estilo de párrafo para celdas de texto largo (nombres de cliente)
+_ESTILO_CELDA_IZQ = ParagraphStyle(
+    'CellLeft', parent=_ESTILOS_BASE['Normal'], fontSize=7, alignment=TA_LEFT, fontName='Helvetica',
+)
+
+
+def agregar_tablas_moneda(story, nombre, encabezados, campos, col_widths, extra, espacio=10, filas_extra=None):
+    """
+    Agrega a la historia el subtítulo y la tabla de cada moneda de una sección.
+
+    Args:
+        story: Lista de flowables del reporte.
+        nombre: Sección del reporte.
+        encabezados: Fila de encabezados (igual para ambas monedas).
+        campos: Lista de (columna, formateador), como en ``filas_tabla``.
+        col_widths: Anchos de columna.
+        extra: Comandos de estilo adicionales (ver ``crear_tabla``).
+        espacio: Separación en puntos entre la tabla MXN y la USD.
+        filas_extra: Dict moneda -> filas a añadir al final (p. ej. totales).
+    """
+    for i, moneda in enumerate(MONEDAS):
+        if i:
+            story.append(Spacer(1, espacio))
+        story.append(crear_subtitulo(f"Moneda: {moneda}"))
+        datos = [encabezados] + filas_tabla(nombre, moneda, campos)
+        if filas_extra:
+            datos += filas_extra[moneda]
+        story.append(crear_tabla(datos, col_widths, extra))
+
+
+def crear_seccion_titulo(texto):
     """Crea un título de sección."""
-    return Paragraph(
-        texto,
-        ParagraphStyle(
-            'SeccionTitulo',
-            parent=styles['Heading1'],
-            fontSize=13,
-            textColor=COLOR_HEADER,
-            spaceAfter=8,
-            spaceBefore=4,
-            fontName='Helvetica-Bold',
-        )
-    )
+    return Paragraph(texto, _ESTILO_SECCION)
 
 
-def crear_subtitulo(texto, styles):
+def crear_subtitulo(texto):
     """Crea un subtítulo de moneda."""
-    return Paragraph(
-        texto,
-        ParagraphStyle(
-            'SubTitulo',
-            parent=styles['Heading2'],
-            fontSize=10,
-            textColor=COLOR_ACCENT,
-            spaceAfter=4,
-            spaceBefore=8,
-            fontName='Helvetica-Bold',
-        )
-    )
+    return Paragraph(texto, _ESTILO_SUBTITULO)
 
 
 # =============================================================================
@@ -378,6 +674,8 @@ class HeaderFooter(canvas.Canvas):
     def __init__(self, *args, **kwargs):
         canvas.Canvas.__init__(self, *args, **kwargs)
         self._saved_page_states = []
+        # Una sola fecha para todas las páginas del reporte
+        self._fecha_str = datetime.now().strftime("%d/%m/%Y %H:%M")
 
     def showPage(self):
         self._saved_page_states.append(dict(self.__dict__))
@@ -403,8 +701,7 @@ class HeaderFooter(canvas.Canvas):
         self.drawString(MARGIN, PAGE_H - 30, "REPORTE DE CUENTAS POR COBRAR")
 
         self.setFont('Helvetica', 9)
-        fecha_str = datetime.now().strftime("%d/%m/%Y %H:%M")
-        self.drawRightString(PAGE_W - MARGIN, PAGE_H - 30, f"Fecha: {fecha_str}")
+        self.drawRightString(PAGE_W - MARGIN, PAGE_H - 30, f"Fecha: {self._fecha_str}")
 
         # Línea decorativa bajo header
         self.setStrokeColor(COLOR_ACCENT)
@@ -435,8 +732,36 @@ class HeaderFooter(canvas.Canvas):
 def generar_reporte(archivo_salida=ARCHIVO_SALIDA):
     """Genera el reporte PDF completo."""
 
+    # Columnas del resumen para totales y gráficos
+    res_mxn = load_columnas("resumen", "MXN", ["estatus", "num_docs", "importe_total", "saldo_pendiente"])
+    res_usd = load_columnas("resumen", "USD", ["estatus", "num_docs", "importe_total", "saldo_pendiente"])
+
+    # Gráficas: todas son independientes, se generan antes de armar el PDF
+    labels_mxn = np.char.replace(res_mxn["estatus"].astype(str), "_", " ")
+    labels_usd = np.char.replace(res_usd["estatus"].astype(str), "_", " ")
+
+    ant = load_columnas("antiguedad", "MXN", ["rango", "importe_total"])
+    labels_ag = np.char.replace(np.char.replace(ant["rango"].astype(str), "FACTURAS_", ""), "_", " ")
+
+    cli = load_columnas("clientes", "MXN", ["cliente", "saldo"])
+    top_cli = np.argsort(-cli["saldo"], kind="stable")[:8]
+    labels_tc = [nombre[:30] for nombre in cli["cliente"][top_cli]]
+
+    vend = load_columnas("vendedor", "MXN", ["vendedor", "total_cargos", "total_abonos"])
+    labels_v = [nombre[:25] for nombre in vend["vendedor"]]
+
+    graficos = renderizar_graficos({
+        "saldo_mxn": (crear_grafico_pastel, (labels_mxn, res_mxn["saldo_pendiente"], "Distribución Saldo MXN", CHART_COLORS_2), {"figsize": (4.5, 3.0)}),
+        "saldo_usd": (crear_grafico_pastel, (labels_usd, res_usd["saldo_pendiente"], "Distribución Saldo USD", CHART_COLORS_2), {"figsize": (4.5, 3.0)}),
+        "antiguedad": (crear_grafico_barras_h, (labels_ag, ant["importe_total"], "Antigüedad de Saldos MXN"), {"color": '#003366', "figsize": (7, 3.2)}),
+        "top_clientes": (crear_grafico_barras_h, (labels_tc, cli["saldo"][top_cli], "Top Clientes por Saldo Pendiente (MXN)"), {"color": '#003366', "figsize": (8, 3.5)}),
+        "vendedores": (crear_grafico_barras_agrupadas, (labels_v, vend["total_cargos"], vend["total_abonos"], "Total Cargos", "Total Abonos", "Cargos vs Abonos por Vendedor (MXN)"), {"figsize": (8, 3.5)}),
+    })
+
+    # ReportLab arma el PDF completo en memoria; se escribe a disco una vez
+    salida = io.BytesIO()
     doc = SimpleDocTemplate(
-        archivo_salida,
+        salida,
         pagesize=landscape(letter),
         leftMargin=MARGIN,
         rightMargin=MARGIN,
@@ -444,82 +769,40 @@ def generar_reporte(archivo_salida=ARCHIVO_SALIDA):
         bottomMargin=MARGIN + 20,  # Espacio para footer
     )
 
-    styles = getSampleStyleSheet()
     story = []
 
     usable_width = PAGE_W - 2 * MARGIN
 
-    # Estilos de párrafo para celdas
-    cell_style_right = ParagraphStyle('CellRight', parent=styles['Normal'], fontSize=7, alignment=TA_RIGHT, fontName='Helvetica')
-    cell_style_left = ParagraphStyle('CellLeft', parent=styles['Normal'], fontSize=7, alignment=TA_LEFT, fontName='Helvetica')
-    cell_style_center = ParagraphStyle('CellCenter', parent=styles['Normal'], fontSize=7, alignment=TA_CENTER, fontName='Helvetica')
-    header_style = ParagraphStyle('HeaderCell', parent=styles['Normal'], fontSize=7, alignment=TA_CENTER, fontName='Helvetica-Bold', textColor=colors.white)
-
     # =====================================================================
     # PÁGINA 1: Resumen General (Vigentes vs Vencidas) + Gráficos
     # =====================================================================
-    story.append(crear_seccion_titulo("1. RESUMEN POR ESTATUS DE VENCIMIENTO", styles))
+    story.append(crear_seccion_titulo("1. RESUMEN POR ESTATUS DE VENCIMIENTO"))
     story.append(Spacer(1, 6))
 
-    # --- Tabla MXN ---
-    story.append(crear_subtitulo("Moneda: MXN", styles))
     headers_resumen = ["MONEDA", "ESTATUS_VENCIMIENTO", "NUM_DOCUMENTOS", "IMPORTE_TOTAL", "SALDO_PENDIENTE", "PCT_DEL_TOTAL"]
-    tabla_data = [headers_resumen]
-    for r in data_resumen_mxn:
-        tabla_data.append(["MXN", r["estatus"], fmt_int(r["num_docs"]), fmt_money(r["importe_total"]), fmt_money(r["saldo_pendiente"]), fmt_pct(r["pct"])])
+    campos_resumen = [
+        ("estatus", fmt_texto_col),
+        ("num_docs", fmt_int_col),
+        ("importe_total", fmt_money_col),
+        ("saldo_pendiente", fmt_money_col),
+        ("pct", fmt_pct_col),
+    ]
     # Totales
-    total_docs = sum(r["num_docs"] for r in data_resumen_mxn)
-    total_importe = sum(r["importe_total"] for r in data_resumen_mxn)
-    total_saldo = sum(r["saldo_pendiente"] for r in data_resumen_mxn)
-    tabla_data.append(["", "TOTAL", fmt_int(total_docs), fmt_money(total_importe), fmt_money(total_saldo), "100.00%"])
+    totales_resumen = {
+        moneda: [["", "TOTAL", fmt_int(int(res["num_docs"].sum())), fmt_money(res["importe_total"].sum()),
+                  fmt_money(res["saldo_pendiente"].sum()), "100.00%"]]
+        for moneda, res in (("MXN", res_mxn), ("USD", res_usd))
+    }
 
     col_w = [0.8*inch, 2.0*inch, 1.3*inch, 1.5*inch, 1.5*inch, 1.2*inch]
-    t = Table(tabla_data, colWidths=col_w)
-    s = estilo_tabla_base(len(tabla_data) - 1)
-    s.extend([
-        ('ALIGN', (2, 1), (-1, -1), 'RIGHT'),
-        ('ALIGN', (0, 1), (1, -1), 'LEFT'),
-        ('BACKGROUND', (0, -1), (-1, -1), colors.HexColor("#E8EEF4")),
-        ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
-    ])
-    t.setStyle(TableStyle(s))
-    story.append(t)
-    story.append(Spacer(1, 10))
-
-    # --- Tabla USD ---
-    story.append(crear_subtitulo("Moneda: USD", styles))
-    tabla_data_usd = [headers_resumen]
-    for r in data_resumen_usd:
-        tabla_data_usd.append(["USD", r["estatus"], fmt_int(r["num_docs"]), fmt_money(r["importe_total"]), fmt_money(r["saldo_pendiente"]), fmt_pct(r["pct"])])
-    total_docs_usd = sum(r["num_docs"] for r in data_resumen_usd)
-    total_importe_usd = sum(r["importe_total"] for r in data_resumen_usd)
-    total_saldo_usd = sum(r["saldo_pendiente"] for r in data_resumen_usd)
-    tabla_data_usd.append(["", "TOTAL", fmt_int(total_docs_usd), fmt_money(total_importe_usd), fmt_money(total_saldo_usd), "100.00%"])
-
-    t2 = Table(tabla_data_usd, colWidths=col_w)
-    s2 = estilo_tabla_base(len(tabla_data_usd) - 1)
-    s2.extend([
-        ('ALIGN', (2, 1), (-1, -1), 'RIGHT'),
-        ('ALIGN', (0, 1), (1, -1), 'LEFT'),
-        ('BACKGROUND', (0, -1), (-1, -1), colors.HexColor("#E8EEF4")),
-        ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
-    ])
-    t2.setStyle(TableStyle(s2))
-    story.append(t2)
+    agregar_tablas_moneda(story, "resumen", headers_resumen, campos_resumen, col_w,
+                          _EXTRA_NUMEROS_DESDE_COL2 + _EXTRA_FILA_TOTAL, filas_extra=totales_resumen)
     story.append(Spacer(1, 15))
 
     # --- Gráficos lado a lado ---
-    labels_mxn = [r["estatus"].replace("_", " ") for r in data_resumen_mxn]
-    sizes_mxn = [r["saldo_pendiente"] for r in data_resumen_mxn]
-    chart1_buf = crear_grafico_pastel(labels_mxn, sizes_mxn, "Distribución Saldo MXN", CHART_COLORS_2, figsize=(4.5, 3.0))
-
-    labels_usd = [r["estatus"].replace("_", " ") for r in data_resumen_usd]
-    sizes_usd = [r["saldo_pendiente"] for r in data_resumen_usd]
-    chart2_buf = crear_grafico_pastel(labels_usd, sizes_usd, "Distribución Saldo USD", CHART_COLORS_2, figsize=(4.5, 3.0))
-
     # Imagen proporcional (sin deformar)
-    img1 = RLImage(chart1_buf, width=4.2*inch, height=2.8*inch, kind='proportional')
-    img2 = RLImage(chart2_buf, width=4.2*inch, height=2.8*inch, kind='proportional')
+    img1 = RLImage(graficos["saldo_mxn"], width=4.2*inch, height=2.8*inch, kind='proportional')
+    img2 = RLImage(graficos["saldo_usd"], width=4.2*inch, height=2.8*inch, kind='proportional')
 
     chart_table = Table([[img1, img2]], colWidths=[usable_width / 2, usable_width / 2])
     chart_table.setStyle(TableStyle([('ALIGN', (0, 0), (-1, -1), 'CENTER'), ('VALIGN', (0, 0), (-1, -1), 'MIDDLE')]))
@@ -530,48 +813,23 @@ def generar_reporte(archivo_salida=ARCHIVO_SALIDA):
     # =====================================================================
     # PÁGINA 2: Antigüedad de Saldos + Gráficos
     # =====================================================================
-    story.append(crear_seccion_titulo("2. ANTIGÜEDAD DE SALDOS", styles))
+    story.append(crear_seccion_titulo("2. ANTIGÜEDAD DE SALDOS"))
     story.append(Spacer(1, 6))
 
-    # --- Tabla MXN ---
-    story.append(crear_subtitulo("Moneda: MXN", styles))
     headers_antig = ["MONEDA", "RANGO_ANTIGUEDAD", "NUM_DOCUMENTOS", "IMPORTE_TOTAL", "PCT_DEL_TOTAL"]
-    tabla_ant = [headers_antig]
-    for r in data_antiguedad_mxn:
-        tabla_ant.append(["MXN", r["rango"], fmt_int(r["num_docs"]), fmt_money(r["importe_total"]), fmt_pct(r["pct"])])
+    campos_ant = [
+        ("rango", fmt_texto_col),
+        ("num_docs", fmt_int_col),
+        ("importe_total", fmt_money_col),
+        ("pct", fmt_pct_col),
+    ]
 
     col_ant = [0.8*inch, 2.5*inch, 1.3*inch, 1.5*inch, 1.2*inch]
-    t_ant = Table(tabla_ant, colWidths=col_ant)
-    s_ant = estilo_tabla_base(len(tabla_ant) - 1)
-    s_ant.extend([
-        ('ALIGN', (2, 1), (-1, -1), 'RIGHT'),
-        ('ALIGN', (0, 1), (1, -1), 'LEFT'),
-    ])
-    t_ant.setStyle(TableStyle(s_ant))
-    story.append(t_ant)
-    story.append(Spacer(1, 10))
-
-    # --- Tabla USD ---
-    story.append(crear_subtitulo("Moneda: USD", styles))
-    tabla_ant_usd = [headers_antig]
-    for r in data_antiguedad_usd:
-        tabla_ant_usd.append(["USD", r["rango"], fmt_int(r["num_docs"]), fmt_money(r["importe_total"]), fmt_pct(r["pct"])])
-
-    t_ant_usd = Table(tabla_ant_usd, colWidths=col_ant)
-    s_ant_usd = estilo_tabla_base(len(tabla_ant_usd) - 1)
-    s_ant_usd.extend([
-        ('ALIGN', (2, 1), (-1, -1), 'RIGHT'),
-        ('ALIGN', (0, 1), (1, -1), 'LEFT'),
-    ])
-    t_ant_usd.setStyle(TableStyle(s_ant_usd))
-    story.append(t_ant_usd)
+    agregar_tablas_moneda(story, "antiguedad", headers_antig, campos_ant, col_ant, _EXTRA_NUMEROS_DESDE_COL2)
     story.append(Spacer(1, 15))
 
     # --- Gráfico de antigüedad MXN ---
-    labels_ag = [r["rango"].replace("FACTURAS_", "").replace("_", " ") for r in data_antiguedad_mxn]
-    vals_ag = [r["importe_total"] for r in data_antiguedad_mxn]
-    chart_ag = crear_grafico_barras_h(labels_ag, vals_ag, "Antigüedad de Saldos MXN", color='#003366', figsize=(7, 3.2))
-    img_ag = RLImage(chart_ag, width=6.5*inch, height=3.0*inch, kind='proportional')
+    img_ag = RLImage(graficos["antiguedad"], width=6.5*inch, height=3.0*inch, kind='proportional')
 
     chart_ag_table = Table([[img_ag]], colWidths=[usable_width])
     chart_ag_table.setStyle(TableStyle([('ALIGN', (0, 0), (-1, -1), 'CENTER')]))
@@ -582,52 +840,38 @@ def generar_reporte(archivo_salida=ARCHIVO_SALIDA):
     # =====================================================================
     # PÁGINA 3: Detalle por Cliente MXN
     # =====================================================================
-    story.append(crear_seccion_titulo("3. DETALLE POR CLIENTE — MXN", styles))
+    story.append(crear_seccion_titulo("3. DETALLE POR CLIENTE — MXN"))
     story.append(Spacer(1, 6))
 
     headers_cli = ["CLIENTE", "ST", "DOCS", "FACT. PAGADAS", "VIGENTES",
                    "VENC 0-30", "VENC 31-60", "VENC 61-90", "VENC 91-120",
                    "VENC +120", "TOTAL CARGO", "ABONO", "SALDO PEND."]
 
-    tabla_cli = [headers_cli]
-    for c in data_clientes_mxn:
-        tabla_cli.append([
-            Paragraph(c["cliente"], cell_style_left),
-            c["status"],
-            fmt_int(c["docs"]),
-            fmt_money(c["facturas_pagadas"]),
-            fmt_money(c["vigentes"]),
-            fmt_money(c["vencidas_0_30"]),
-            fmt_money(c["vencidas_31_60"]),
-            fmt_money(c["vencidas_61_90"]),
-            fmt_money(c["vencidas_91_120"]),
-            fmt_money(c["vencidas_120"]),
-            fmt_money(c["total_cargo"]),
-            fmt_money(c["abono"]),
-            fmt_money(c["saldo"]),
-        ])
+    campos_cli = [
+        ("cliente", lambda col: [Paragraph(n, _ESTILO_CELDA_IZQ) for n in col.tolist()]),
+        ("status", fmt_texto_col),
+        ("docs", fmt_int_col),
+        ("facturas_pagadas", fmt_money_col),
+        ("vigentes", fmt_money_col),
+        ("vencidas_0_30", fmt_money_col),
+        ("vencidas_31_60", fmt_money_col),
+        ("vencidas_61_90", fmt_money_col),
+        ("vencidas_91_120", fmt_money_col),
+        ("vencidas_120", fmt_money_col),
+        ("total_cargo", fmt_money_col),
+        ("abono", fmt_money_col),
+        ("saldo", fmt_money_col),
+    ]
+    tabla_cli = [headers_cli] + filas_tabla("clientes", "MXN", campos_cli, etiqueta=False)
 
     col_cli = [1.9*inch, 0.3*inch, 0.4*inch, 0.9*inch, 0.7*inch,
                0.8*inch, 0.7*inch, 0.7*inch, 0.7*inch,
                0.7*inch, 0.9*inch, 0.9*inch, 0.9*inch]
-    t_cli = Table(tabla_cli, colWidths=col_cli, repeatRows=1)
-    s_cli = estilo_tabla_base(len(tabla_cli) - 1)
-    s_cli.extend([
-        ('ALIGN', (1, 1), (-1, -1), 'RIGHT'),
-        ('ALIGN', (0, 1), (0, -1), 'LEFT'),
-        ('FONTSIZE', (0, 0), (-1, -1), 6),
-        ('FONTSIZE', (0, 0), (-1, 0), 6.5),
-    ])
-    t_cli.setStyle(TableStyle(s_cli))
-    story.append(t_cli)
+    story.append(crear_tabla(tabla_cli, col_cli, _EXTRA_CLIENTES, repeatRows=1))
     story.append(Spacer(1, 12))
 
     # --- Gráfico top clientes MXN ---
-    top_cli = sorted(data_clientes_mxn, key=lambda x: x["saldo"], reverse=True)[:8]
-    labels_tc = [c["cliente"][:30] for c in top_cli]
-    vals_tc = [c["saldo"] for c in top_cli]
-    chart_tc = crear_grafico_barras_h(labels_tc, vals_tc, "Top Clientes por Saldo Pendiente (MXN)", color='#003366', figsize=(8, 3.5))
-    img_tc = RLImage(chart_tc, width=7.5*inch, height=3.2*inch, kind='proportional')
+    img_tc = RLImage(graficos["top_clientes"], width=7.5*inch, height=3.2*inch, kind='proportional')
     story.append(img_tc)
 
     story.append(PageBreak())
@@ -635,82 +879,47 @@ def generar_reporte(archivo_salida=ARCHIVO_SALIDA):
     # =====================================================================
     # PÁGINA 4: Detalle por Cliente USD
     # =====================================================================
-    story.append(crear_seccion_titulo("4. DETALLE POR CLIENTE — USD", styles))
+    story.append(crear_seccion_titulo("4. DETALLE POR CLIENTE — USD"))
     story.append(Spacer(1, 6))
 
     headers_cli_usd = ["CLIENTE", "STATUS", "DOCS", "TOTAL_CARGO", "ABONO", "SALDO_PENDIENTE"]
-    tabla_cli_usd = [headers_cli_usd]
-    for c in data_clientes_usd:
-        tabla_cli_usd.append([
-            c["cliente"], c["status"], fmt_int(c["docs"]),
-            fmt_money(c["total_cargo"]), fmt_money(c["abono"]), fmt_money(c["saldo"])
-        ])
+    campos_cli_usd = [
+        ("cliente", fmt_texto_col),
+        ("status", fmt_texto_col),
+        ("docs", fmt_int_col),
+        ("total_cargo", fmt_money_col),
+        ("abono", fmt_money_col),
+        ("saldo", fmt_money_col),
+    ]
+    tabla_cli_usd = [headers_cli_usd] + filas_tabla("clientes", "USD", campos_cli_usd, etiqueta=False)
 
     col_cli_usd = [2.8*inch, 0.6*inch, 0.6*inch, 1.3*inch, 1.3*inch, 1.3*inch]
-    t_cli_usd = Table(tabla_cli_usd, colWidths=col_cli_usd)
-    s_cli_usd = estilo_tabla_base(len(tabla_cli_usd) - 1)
-    s_cli_usd.extend([
-        ('ALIGN', (2, 1), (-1, -1), 'RIGHT'),
-        ('ALIGN', (0, 1), (1, -1), 'LEFT'),
-    ])
-    t_cli_usd.setStyle(TableStyle(s_cli_usd))
-    story.append(t_cli_usd)
+    story.append(crear_tabla(tabla_cli_usd, col_cli_usd, _EXTRA_NUMEROS_DESDE_COL2))
 
     story.append(PageBreak())
 
     # =====================================================================
     # PÁGINA 5: Resumen por Vendedor
     # =====================================================================
-    story.append(crear_seccion_titulo("5. RESUMEN POR VENDEDOR", styles))
+    story.append(crear_seccion_titulo("5. RESUMEN POR VENDEDOR"))
     story.append(Spacer(1, 6))
 
-    # --- Tabla MXN ---
-    story.append(crear_subtitulo("Moneda: MXN", styles))
     headers_vend = ["MONEDA", "VENDEDOR", "NUM_CARGOS", "NUM_ABONOS", "TOTAL_CARGOS", "TOTAL_ABONOS", "SALDO_PENDIENTE"]
-    tabla_vend = [headers_vend]
-    for v in data_vendedor_mxn:
-        tabla_vend.append(["MXN", v["vendedor"], fmt_int(v["num_cargos"]), fmt_int(v["num_abonos"]),
-                           fmt_money(v["total_cargos"]), fmt_money(v["total_abonos"]), fmt_money(v["saldo"])])
+    campos_vend = [
+        ("vendedor", fmt_texto_col),
+        ("num_cargos", fmt_int_col),
+        ("num_abonos", fmt_int_col),
+        ("total_cargos", fmt_money_col),
+        ("total_abonos", fmt_money_col),
+        ("saldo", fmt_money_col),
+    ]
 
     col_vend = [0.6*inch, 2.5*inch, 0.9*inch, 0.9*inch, 1.4*inch, 1.4*inch, 1.3*inch]
-    t_vend = Table(tabla_vend, colWidths=col_vend)
-    s_vend = estilo_tabla_base(len(tabla_vend) - 1)
-    s_vend.extend([
-        ('ALIGN', (2, 1), (-1, -1), 'RIGHT'),
-        ('ALIGN', (0, 1), (1, -1), 'LEFT'),
-    ])
-    t_vend.setStyle(TableStyle(s_vend))
-    story.append(t_vend)
-    story.append(Spacer(1, 10))
-
-    # --- Tabla USD ---
-    story.append(crear_subtitulo("Moneda: USD", styles))
-    tabla_vend_usd = [headers_vend]
-    for v in data_vendedor_usd:
-        tabla_vend_usd.append(["USD", v["vendedor"], fmt_int(v["num_cargos"]), fmt_int(v["num_abonos"]),
-                               fmt_money(v["total_cargos"]), fmt_money(v["total_abonos"]), fmt_money(v["saldo"])])
-
-    t_vend_usd = Table(tabla_vend_usd, colWidths=col_vend)
-    s_vend_usd = estilo_tabla_base(len(tabla_vend_usd) - 1)
-    s_vend_usd.extend([
-        ('ALIGN', (2, 1), (-1, -1), 'RIGHT'),
-        ('ALIGN', (0, 1), (1, -1), 'LEFT'),
-    ])
-    t_vend_usd.setStyle(TableStyle(s_vend_usd))
-    story.append(t_vend_usd)
+    agregar_tablas_moneda(story, "vendedor", headers_vend, campos_vend, col_vend, _EXTRA_NUMEROS_DESDE_COL2)
     story.append(Spacer(1, 15))
 
     # --- Gráfico vendedor MXN ---
-    labels_v = [v["vendedor"][:25] for v in data_vendedor_mxn]
-    cargos_v = [v["total_cargos"] for v in data_vendedor_mxn]
-    abonos_v = [v["total_abonos"] for v in data_vendedor_mxn]
-    chart_v = crear_grafico_barras_agrupadas(
-        labels_v, cargos_v, abonos_v,
-        "Total Cargos", "Total Abonos",
-        "Cargos vs Abonos por Vendedor (MXN)",
-        figsize=(8, 3.5)
-    )
-    img_v = RLImage(chart_v, width=7.5*inch, height=3.2*inch, kind='proportional')
+    img_v = RLImage(graficos["vendedores"], width=7.5*inch, height=3.2*inch, kind='proportional')
     story.append(img_v)
 
     story.append(PageBreak())
@@ -718,139 +927,68 @@ def generar_reporte(archivo_salida=ARCHIVO_SALIDA):
     # =====================================================================
     # PÁGINA 6: Resumen por Concepto
     # =====================================================================
-    story.append(crear_seccion_titulo("6. RESUMEN POR CONCEPTO", styles))
+    story.append(crear_seccion_titulo("6. RESUMEN POR CONCEPTO"))
     story.append(Spacer(1, 6))
 
-    # --- Tabla MXN ---
-    story.append(crear_subtitulo("Moneda: MXN", styles))
     headers_conc = ["MONEDA", "CONCEPTO", "NUM_CARGOS", "NUM_ABONOS", "TOTAL_CARGOS", "TOTAL_ABONOS"]
-    tabla_conc = [headers_conc]
-    for c in data_concepto_mxn:
-        tabla_conc.append(["MXN", c["concepto"], fmt_int(c["num_cargos"]), fmt_int(c["num_abonos"]),
-                           fmt_money(c["total_cargos"]), fmt_money(c["total_abonos"])])
+    campos_conc = [
+        ("concepto", fmt_texto_col),
+        ("num_cargos", fmt_int_col),
+        ("num_abonos", fmt_int_col),
+        ("total_cargos", fmt_money_col),
+        ("total_abonos", fmt_money_col),
+    ]
 
     col_conc = [0.6*inch, 2.5*inch, 1.0*inch, 1.0*inch, 1.5*inch, 1.5*inch]
-    t_conc = Table(tabla_conc, colWidths=col_conc)
-    s_conc = estilo_tabla_base(len(tabla_conc) - 1)
-    s_conc.extend([
-        ('ALIGN', (2, 1), (-1, -1), 'RIGHT'),
-        ('ALIGN', (0, 1), (1, -1), 'LEFT'),
-    ])
-    t_conc.setStyle(TableStyle(s_conc))
-    story.append(t_conc)
-    story.append(Spacer(1, 10))
-
-    # --- Tabla USD ---
-    story.append(crear_subtitulo("Moneda: USD", styles))
-    tabla_conc_usd = [headers_conc]
-    for c in data_concepto_usd:
-        tabla_conc_usd.append(["USD", c["concepto"], fmt_int(c["num_cargos"]), fmt_int(c["num_abonos"]),
-                               fmt_money(c["total_cargos"]), fmt_money(c["total_abonos"])])
-
-    t_conc_usd = Table(tabla_conc_usd, colWidths=col_conc)
-    s_conc_usd = estilo_tabla_base(len(tabla_conc_usd) - 1)
-    s_conc_usd.extend([
-        ('ALIGN', (2, 1), (-1, -1), 'RIGHT'),
-        ('ALIGN', (0, 1), (1, -1), 'LEFT'),
-    ])
-    t_conc_usd.setStyle(TableStyle(s_conc_usd))
-    story.append(t_conc_usd)
+    agregar_tablas_moneda(story, "concepto", headers_conc, campos_conc, col_conc, _EXTRA_NUMEROS_DESDE_COL2)
 
     story.append(PageBreak())
 
     # =====================================================================
     # PÁGINA 7: Ajustes y Cancelados
     # =====================================================================
-    story.append(crear_seccion_titulo("7. REGISTROS DE AJUSTE", styles))
+    story.append(crear_seccion_titulo("7. REGISTROS DE AJUSTE"))
     story.append(Spacer(1, 6))
 
     headers_aj = ["MONEDA", "TIPO_REGISTRO", "CONCEPTO", "NUM_REGISTROS", "IMPORTE_TOTAL", "IMPUESTO_TOTAL", "MONTO_TOTAL"]
-
-    # --- Ajustes MXN ---
-    story.append(crear_subtitulo("Moneda: MXN", styles))
-    tabla_aj = [headers_aj]
-    for a in data_ajustes_mxn:
-        tabla_aj.append(["MXN", a["tipo"], a["concepto"], fmt_int(a["num_registros"]),
-                         fmt_money(a["importe_total"]), fmt_money(a["impuesto_total"]), fmt_money(a["monto_total"])])
+    campos_aj = [
+        ("tipo", fmt_texto_col),
+        ("concepto", fmt_texto_col),
+        ("num_registros", fmt_int_col),
+        ("importe_total", fmt_money_col),
+        ("impuesto_total", fmt_money_col),
+        ("monto_total", fmt_money_col),
+    ]
 
     col_aj = [0.6*inch, 1.2*inch, 1.5*inch, 1.0*inch, 1.3*inch, 1.2*inch, 1.3*inch]
-    t_aj = Table(tabla_aj, colWidths=col_aj)
-    s_aj = estilo_tabla_base(len(tabla_aj) - 1)
-    s_aj.extend([
-        ('ALIGN', (3, 1), (-1, -1), 'RIGHT'),
-        ('ALIGN', (0, 1), (2, -1), 'LEFT'),
-    ])
-    t_aj.setStyle(TableStyle(s_aj))
-    story.append(t_aj)
-    story.append(Spacer(1, 8))
-
-    # --- Ajustes USD ---
-    story.append(crear_subtitulo("Moneda: USD", styles))
-    tabla_aj_usd = [headers_aj]
-    for a in data_ajustes_usd:
-        tabla_aj_usd.append(["USD", a["tipo"], a["concepto"], fmt_int(a["num_registros"]),
-                             fmt_money(a["importe_total"]), fmt_money(a["impuesto_total"]), fmt_money(a["monto_total"])])
-
-    t_aj_usd = Table(tabla_aj_usd, colWidths=col_aj)
-    s_aj_usd = estilo_tabla_base(len(tabla_aj_usd) - 1)
-    s_aj_usd.extend([
-        ('ALIGN', (3, 1), (-1, -1), 'RIGHT'),
-        ('ALIGN', (0, 1), (2, -1), 'LEFT'),
-    ])
-    t_aj_usd.setStyle(TableStyle(s_aj_usd))
-    story.append(t_aj_usd)
+    agregar_tablas_moneda(story, "ajustes", headers_aj, campos_aj, col_aj, _EXTRA_NUMEROS_DESDE_COL3, espacio=8)
 
     story.append(Spacer(1, 25))
 
     # =====================================================================
     # Continúa en misma página: Cancelados
     # =====================================================================
-    story.append(crear_seccion_titulo("8. REGISTROS CANCELADOS", styles))
+    story.append(crear_seccion_titulo("8. REGISTROS CANCELADOS"))
     story.append(Spacer(1, 6))
 
-    # --- Cancelados MXN ---
-    story.append(crear_subtitulo("Moneda: MXN", styles))
-    tabla_canc = [headers_aj]
-    for c in data_cancelados_mxn:
-        tabla_canc.append(["MXN", c["tipo"], c["concepto"], fmt_int(c["num_registros"]),
-                           fmt_money(c["importe_total"]), fmt_money(c["impuesto_total"]), fmt_money(c["monto_total"])])
-
-    t_canc = Table(tabla_canc, colWidths=col_aj)
-    s_canc = estilo_tabla_base(len(tabla_canc) - 1)
-    s_canc.extend([
-        ('ALIGN', (3, 1), (-1, -1), 'RIGHT'),
-        ('ALIGN', (0, 1), (2, -1), 'LEFT'),
-    ])
-    t_canc.setStyle(TableStyle(s_canc))
-    story.append(t_canc)
-    story.append(Spacer(1, 8))
-
-    # --- Cancelados USD ---
-    story.append(crear_subtitulo("Moneda: USD", styles))
-    tabla_canc_usd = [headers_aj]
-    for c in data_cancelados_usd:
-        tabla_canc_usd.append(["USD", c["tipo"], c["concepto"], fmt_int(c["num_registros"]),
-                               fmt_money(c["importe_total"]), fmt_money(c["impuesto_total"]), fmt_money(c["monto_total"])])
-
-    t_canc_usd = Table(tabla_canc_usd, colWidths=col_aj)
-    s_canc_usd = estilo_tabla_base(len(tabla_canc_usd) - 1)
-    s_canc_usd.extend([
-        ('ALIGN', (3, 1), (-1, -1), 'RIGHT'),
-        ('ALIGN', (0, 1), (2, -1), 'LEFT'),
-    ])
-    t_canc_usd.setStyle(TableStyle(s_canc_usd))
-    story.append(t_canc_usd)
+    agregar_tablas_moneda(story, "cancelados", headers_aj, campos_aj, col_aj, _EXTRA_NUMEROS_DESDE_COL3, espacio=8)
 
     # =====================================================================
     # CONSTRUIR PDF
     # =====================================================================
     doc.build(story, canvasmaker=HeaderFooter)
+    pdf = salida.getbuffer()
+    with open(archivo_salida, "wb") as f:
+        f.write(pdf)
     print(f"\n✅ Reporte generado exitosamente: {archivo_salida}")
-    print(f"   Tamaño: {os.path.getsize(archivo_salida) / 1024:.1f} KB")
+    print(f"   Tamaño: {pdf.nbytes / 1024:.1f} KB")
 
 
 # =============================================================================
 # PUNTO DE ENTRADA
 # =============================================================================
 if __name__ == "__main__":
-    generar_reporte()
\ No newline at end of file
+    if "--exportar-datos" in sys.argv:
+        exportar_secciones_parquet()
+    else:
+        generar_reporte()
\ No newline at end of file
@@ -22,19 +22,21 @@ from __future__ import annotations
 import argparse
 import logging
 import sys
-from datetime import datetime, time as dt_time
+from datetime import date, datetime, time as dt_time, timedelta
 from pathlib import Path
 from typing import Any
 
 import numpy as np
 import pandas as pd
-from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
+from pandas.api.types import (
+    is_bool, is_bool_dtype, is_datetime64_any_dtype, is_float, is_integer, is_numeric_dtype, is_scalar,
+)
 
 sys.path.insert(0, str(Path(__file__).resolve().parent))
 
 from config.settings import (
     ANOMALIAS,
-    EXCEL_ENGINE,
+    EXCEL_ENGINE_KWARGS,
     EXCEL_NOMBRES,
     FIREBIRD_CONFIG,
     KPI_PERIODO_DIAS,
@@ -48,7 +50,6 @@ from src.db_connector import FirebirdConnector
 from src.data_transformer import DataTransformer
 from src.kpis import generar_kpis
 from src.reporte_cxc import agregar_bandas_grupo, generar_reporte_cxc
-from src.reporte_pdf import generar_reporte_pdf
 
 # ======================================================================
 # LOGGING
@@ -102,54 +103,73 @@ COLS_COLOR_SALDOS = {"SALDO_PENDIENTE", "SALDO_VIGENTE", "SALDO_VENCIDO", "SALDO
 
 PESTANAS_PROTEGIDAS: set[str] = {"registros_totales_cxc"}
 
-_CANCELADO_VALUES: list[Any] = ["S", "SI", "s", "si", 1, True, "1"]
+_CANCELADO_VALUES: frozenset[Any] = frozenset({"S", "SI", "s", "si", 1, True, "1"})
 
-# Tipografía unificada a Cambria con recuperación del efecto Muted para los ceros
+# Tipografía unificada a Cambria con recuperación del efecto Muted para los ceros.
+# Fuentes, rellenos, bordes y alineaciones son propiedades de formato de
+# xlsxwriter; _FormatosLibro las combina en un formato por celda.
 _FONT_NAME = "Cambria"
-_HEADER_FONT = Font(name=_FONT_NAME, bold=True, color="FFFFFF", size=11)
-_FONT_TOTAL = Font(name=_FONT_NAME, bold=True, size=11)
-_FONT_NORMAL = Font(name=_FONT_NAME, size=11)
-_FONT_MUTED = Font(name=_FONT_NAME, color="808080", size=11)
+_HEADER_FONT: dict[str, Any] = {"font_name": _FONT_NAME, "bold": True, "font_color": "#FFFFFF", "font_size": 11}
+_FONT_TOTAL: dict[str, Any] = {"font_name": _FONT_NAME, "bold": True, "font_size": 11}
+_FONT_NORMAL: dict[str, Any] = {"font_name": _FONT_NAME, "font_size": 11}
+_FONT_MUTED: dict[str, Any] = {"font_name": _FONT_NAME, "font_color": "#808080", "font_size": 11}
 
-_HEADER_FILL: PatternFill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
-_CALC_HEADER_FILL: PatternFill = PatternFill(start_color="548235", end_color="548235", fill_type="solid")
+_HEADER_FILL = "#4472C4"
+_CALC_HEADER_FILL = "#548235"
 
-_BAND_FILL: PatternFill = PatternFill(start_color="F2F2F2", end_color="F2F2F2", fill_type="solid")
-_WHITE_FILL: PatternFill = PatternFill(start_color="FFFFFF", end_color="FFFFFF", fill_type="solid")
+_BAND_FILL = "#F2F2F2"
+_WHITE_FILL = "#FFFFFF"
+_GROUP_FILL = "#D9E2F3"
 
-_FILL_TOTAL = PatternFill(start_color="A6A6A6", end_color="A6A6A6", fill_type="solid")
-_FILL_ZERO  = PatternFill(start_color="D9D9D9", end_color="D9D9D9", fill_type="solid")
+_FILL_TOTAL = "#A6A6A6"
+_FILL_ZERO  = "#D9D9D9"
 
 # Rellenos semánticos formales para bloques
-FILL_AZUL     = PatternFill(start_color="D9E1F2", end_color="D9E1F2", fill_type="solid")
-FILL_VERDE    = PatternFill(start_color="E2EFDA", end_color="E2EFDA", fill_type="solid")
-FILL_AMARILLO = PatternFill(start_color="FFF2CC", end_color="FFF2CC", fill_type="solid")
-FILL_ROJO     = PatternFill(start_color="FCE4D6", end_color="FCE4D6", fill_type="solid")
+FILL_AZUL     = "#D9E1F2"
+FILL_VERDE    = "#E2EFDA"
+FILL_AMARILLO = "#FFF2CC"
+FILL_ROJO     = "#FCE4D6"
 
 # Clasificacion ABC
-_FILL_A = PatternFill(start_color="E2EFDA", end_color="E2EFDA", fill_type="solid")
-_FILL_B = PatternFill(start_color="FFF2CC", end_color="FFF2CC", fill_type="solid")
-_FILL_C = PatternFill(start_color="FCE4D6", end_color="FCE4D6", fill_type="solid")
-
-_HEADER_ALIGNMENT: Alignment = Alignment(horizontal="center", vertical="center")
-_THIN_BORDER: Border = Border(
-    left=Side(style="thin", color="B4C6E7"), right=Side(style="thin", color="B4C6E7"),
-    top=Side(style="thin", color="B4C6E7"), bottom=Side(style="thin", color="B4C6E7"),
-)
+_FILLS_CLASIFICACION: dict[str, str] = {"A": FILL_VERDE, "B": FILL_AMARILLO, "C": FILL_ROJO}
+
+# Color base por columna en hojas sin bandas de grupo
+_FILLS_COLUMNA: dict[str, str] = {
+    **dict.fromkeys(["TOTAL_CARGOS", "TOTAL_CARGOS_CANCELADOS", "LIMITE_CREDITO"], FILL_AZUL),
+    **dict.fromkeys(["TOTAL_ABONOS", "TOTAL_ABONOS_CANCELADOS", "SALDO_VIGENTE", "DISPONIBLE", "FACTURAS_PAGADAS"], FILL_VERDE),
+    **dict.fromkeys(["SALDO_PENDIENTE", "SALDO_TOTAL", "SALDO", "IMPORTE_AJUSTE"], FILL_AMARILLO),
+    **dict.fromkeys(["SALDO_VENCIDO", "DIAS_VENCIDO_MAX", "PCT_VENCIDO"], FILL_ROJO),
+}
+_COLUMNAS_SALDO_CERO: list[str] = ["SALDO_PENDIENTE", "SALDO_TOTAL", "SALDO", "IMPORTE_AJUSTE"]
+
+_HEADER_ALIGNMENT: dict[str, Any] = {"align": "center", "valign": "vcenter"}
+_WRAP_ALIGNMENT: dict[str, Any] = {"text_wrap": True, "align": "center", "valign": "vcenter"}
+_THIN_BORDER: dict[str, Any] = {"border": 1, "border_color": "#B4C6E7"}
+
+# Columnas de texto largo: ancho fijo con ajuste de linea
+_COLUMNAS_TEXTO_LARGO: set[str] = {"INTERPRETACION", "MOTIVO"}
+
+# Formatos que DataFrame.to_excel asigna a fechas sin formato de columna
+_FORMATO_FECHA_HORA = "YYYY-MM-DD HH:MM:SS"
+_FORMATO_FECHA = "YYYY-MM-DD"
 
-COLUMNAS_CALCULADAS_CXC: set[str] = {
+# Filas que se convierten a la vez al escribir una hoja
+_FILAS_POR_BLOQUE = 5_000
+
+# En mayusculas: _escribir_hoja las compara directo con el encabezado
+COLUMNAS_CALCULADAS_CXC: frozenset[str] = frozenset({
     "SALDO_FACTURA", "SALDO_CLIENTE", "DELTA_RECAUDO", "ZSCORE_DELTA_RECAUDO",
     "ATIPICO_DELTA_RECAUDO", "CATEGORIA_RECAUDO", "DELTA_MORA",
     "ZSCORE_DELTA_MORA", "ATIPICO_DELTA_MORA", "CATEGORIA_MORA",
     "ZSCORE_IMPORTE", "ATIPICO_IMPORTE",
-}
+})
 
 # ======================================================================
 # PREPARACION DE DATOS
 # ======================================================================
 
 def _formatear_hora(valor: Any) -> str:
-    if valor is None or (isinstance(valor, float) and pd.isna(valor)):
+    if valor is None or (isinstance(valor, float) and valor != valor):
         return ""
     if isinstance(valor, dt_time):
         return valor.strftime("%H:%M:%S")
@@ -157,13 +177,23 @@ def _formatear_hora(valor: Any) -> str:
         return valor.strftime("%H:%M:%S")
     return str(valor)
 
+def _formatear_horas(serie: pd.Series) -> pd.Series:
+    if pd.api.types.is_datetime64_any_dtype(serie):
+        return serie.dt.strftime("%H:%M:%S").fillna("")
+    # Una hora del dia tiene a lo sumo 86,400 valores distintos: se formatea
+    # cada valor unico una vez y se reparte por codigo (-1 = nulo = "")
+    codigos, unicos = pd.factorize(serie)
+    formateados = np.array([_formatear_hora(v) for v in unicos] + [""], dtype=object)
+    return pd.Series(formateados[codigos], index=serie.index)
+
 def _normalizar_fechas_hora(df: pd.DataFrame) -> pd.DataFrame:
-    df = df.copy()
+    # Copia superficial: las columnas se reemplazan, nunca se escriben en sitio
+    df = df.copy(deep=False)
     for col in ["FECHA_EMISION", "FECHA_VENCIMIENTO"]:
-        if col in df.columns:
+        if col in df.columns and not is_datetime64_any_dtype(df[col]):
             df[col] = pd.to_datetime(df[col], errors="coerce")
     if "HORA" in df.columns:
-        df["HORA"] = df["HORA"].apply(_formatear_hora)
+        df["HORA"] = _formatear_horas(df["HORA"])
     return df
 
 def preparar_registros_totales(df: pd.DataFrame) -> pd.DataFrame:
@@ -172,14 +202,16 @@ def preparar_registros_totales(df: pd.DataFrame) -> pd.DataFrame:
 def _filtrar_por_acreditar(df_totales: pd.DataFrame) -> pd.DataFrame:
     if "TIPO_IMPTE" not in df_totales.columns:
         return pd.DataFrame()
-    tipo_norm = df_totales["TIPO_IMPTE"].astype(str).str.strip().str.upper()
-    mask_tipo_a = tipo_norm == "A"
+    # TIPO_IMPTE tiene pocos valores distintos: se normaliza cada uno una sola vez
+    codigos, unicos = pd.factorize(df_totales["TIPO_IMPTE"])
+    es_a = np.append([str(v).strip().upper() == "A" for v in unicos], False)
+    mask_tipo_a = es_a[codigos]
     
     if "CANCELADO" in df_totales.columns:
         mask_activos = ~df_totales["CANCELADO"].isin(_CANCELADO_VALUES)
-        resultado = df_totales[mask_tipo_a & mask_activos].copy()
+        resultado = df_totales[mask_tipo_a & mask_activos]
     else:
-        resultado = df_totales[mask_tipo_a].copy()
+        resultado = df_totales[mask_tipo_a]
         
     if "_BAND_GROUP" in resultado.columns:
         resultado = resultado.drop(columns=["_BAND_GROUP"])
@@ -190,7 +222,7 @@ def _filtrar_por_acreditar(df_totales: pd.DataFrame) -> pd.DataFrame:
 def _filtrar_cancelados(df_totales: pd.DataFrame) -> pd.DataFrame:
     if "CANCELADO" not in df_totales.columns:
         return pd.DataFrame()
-    resultado = df_totales[df_totales["CANCELADO"].isin(_CANCELADO_VALUES)].copy()
+    resultado = df_totales[df_totales["CANCELADO"].isin(_CANCELADO_VALUES)]
     
     if "_BAND_GROUP" in resultado.columns:
         resultado = resultado.drop(columns=["_BAND_GROUP"])
@@ -202,216 +234,234 @@ def _filtrar_cancelados(df_totales: pd.DataFrame) -> pd.DataFrame:
 # FORMATO EXCEL — FUNCIONES INTERNAS
 # ======================================================================
 
-def _aplicar_formato_encabezado(ws: Any, n_cols: int, calc_cols: set[str] | None = None) -> None:
-    calc_upper: set[str] = {c.upper() for c in calc_cols} if calc_cols else set()
-    for col_idx in range(1, n_cols + 1):
-        cell = ws.cell(row=1, column=col_idx)
-        nombre = str(cell.value).upper() if cell.value else ""
-        cell.font = _HEADER_FONT
-        cell.fill = _CALC_HEADER_FILL if nombre in calc_upper else _HEADER_FILL
-        cell.alignment = _HEADER_ALIGNMENT
-        cell.border = _THIN_BORDER
-
-def _aplicar_bordes_y_fuente(ws: Any, n_filas: int, n_cols: int) -> None:
-    for row_idx in range(2, n_filas + 2):
-        for col_idx in range(1, n_cols + 1):
-            cell = ws.cell(row=row_idx, column=col_idx)
-            cell.border = _THIN_BORDER
-            cell.font = _FONT_NORMAL
-
-def _aplicar_formatos_columna(ws: Any, columnas: list[str], n_filas: int, df: pd.DataFrame) -> None:
-    for col_idx, col_name in enumerate(columnas, start=1):
-        col_upper = str(col_name).upper()
-        es_moneda = (
-            col_upper in COLUMNAS_MONEDA
-            or any(col_upper.startswith(p) for p in _COLUMNAS_MONEDA_PREFIJOS)
-        )
-        if es_moneda:
-            for row_idx in range(2, n_filas + 2):
-                ws.cell(row=row_idx, column=col_idx).number_format = "#,##0.00"
-        elif col_upper in COLUMNAS_ENTERO:
-            for row_idx in range(2, n_filas + 2):
-                ws.cell(row=row_idx, column=col_idx).number_format = "#,##0"
-        elif col_upper in COLUMNAS_FECHA:
-            for row_idx in range(2, n_filas + 2):
-                ws.cell(row=row_idx, column=col_idx).number_format = "DD/MM/YYYY"
-        elif col_upper in COLUMNAS_PORCENTAJE:
-            for row_idx in range(2, n_filas + 2):
-                aplicar = True
-                if col_upper == "VALOR" and "UNIDAD" in df.columns:
-                    unidad = df.iloc[row_idx - 2].get("UNIDAD", "")
-                    if str(unidad).strip() != "%":
-                        aplicar = False
-                
-                if aplicar:
-                    ws.cell(row=row_idx, column=col_idx).number_format = "0.00%"
-
-def _aplicar_estilos_semanticos(ws: Any, df: pd.DataFrame, columnas: list[str]) -> None:
-    n_cols = len(columnas)
-    has_clasif = "CLASIFICACION" in df.columns
-
-    col_fills = {}
-    for c_idx, col_name in enumerate(columnas, start=1):
-        col_upper = col_name.upper()
-        if col_upper in COLS_COLOR_CARGOS:
-            col_fills[c_idx] = FILL_AZUL
-        elif col_upper in COLS_COLOR_ABONOS:
-            col_fills[c_idx] = FILL_VERDE
-        elif col_upper in COLS_COLOR_SALDOS:
-            col_fills[c_idx] = FILL_AMARILLO
-        else:
-            col_fills[c_idx] = _WHITE_FILL
+class _FormatosLibro:
+    """Formatos xlsxwriter de un libro, uno por combinacion de estilo.
+
+    xlsxwriter asigna el estilo al escribir cada celda; se crea un
+    ``Format`` por combinacion distinta y se reutiliza en todo el libro.
+    """
+
+    def __init__(self, libro: Any) -> None:
+        self.libro = libro
+        self._cache: dict[tuple[Any, ...], Any] = {}
+
+    def obtener(
+        self, relleno: str, fuente: dict[str, Any],
+        num_format: str | None = None, alineacion: dict[str, Any] | None = None,
+    ) -> Any:
+        llave = (relleno, id(fuente), num_format, id(alineacion))
+        formato = self._cache.get(llave)
+        if formato is None:
+            props: dict[str, Any] = {**_THIN_BORDER, **fuente, "pattern": 1, "bg_color": relleno}
+            if num_format:
+                props["num_format"] = num_format
+            if alineacion:
+                props.update(alineacion)
+            formato = self._cache[llave] = self.libro.add_format(props)
+        return formato
+
+def _valor_celda(val: Any) -> tuple[Any, str | None]:
+    # Misma conversion que DataFrame.to_excel: nulos vacios, inf como texto
+    if is_scalar(val) and pd.isna(val):
+        return "", None
+    if is_float(val):
+        if np.isposinf(val):
+            return "inf", None
+        if np.isneginf(val):
+            return "-inf", None
+        return float(val), None
+    if is_integer(val):
+        return int(val), None
+    if is_bool(val):
+        return bool(val), None
+    if isinstance(val, datetime):
+        return val, _FORMATO_FECHA_HORA
+    if isinstance(val, date):
+        return val, _FORMATO_FECHA
+    if isinstance(val, timedelta):
+        return val.total_seconds() / 86400, "0"
+    return str(val), None
+
+def _formato_numero_columna(col_name: str, df: pd.DataFrame) -> str | list[str | None] | None:
+    col_upper = col_name.upper()
+    es_moneda = (
+        col_upper in COLUMNAS_MONEDA
+        or col_upper.startswith(_COLUMNAS_MONEDA_PREFIJOS)
+    )
+    if es_moneda:
+        return "#,##0.00"
+    if col_upper in COLUMNAS_ENTERO:
+        return "#,##0"
+    if col_upper in COLUMNAS_FECHA:
+        return "DD/MM/YYYY"
+    if col_upper in COLUMNAS_PORCENTAJE:
+        if col_upper == "VALOR" and "UNIDAD" in df.columns:
+            return ["0.00%" if str(u).strip() == "%" else None for u in df["UNIDAD"].tolist()]
+        return "0.00%"
+    return None
+
+def _es_cero(val: Any) -> bool:
+    if val is None or str(val).strip() == "":
+        return False
+    try:
+        return float(val) == 0.0
+    except (TypeError, ValueError):
+        return False
 
-    for r_idx, row in enumerate(df.itertuples(index=False), start=2):
-        row_dict = dict(zip(columnas, row))
-        
-        is_total = str(row_dict.get(columnas[0], "")).strip().upper() == "TOTAL"
-        
-        is_zero = False
-        for saldo_col in ["SALDO_PENDIENTE", "SALDO_TOTAL", "SALDO", "IMPORTE_AJUSTE"]:
-            if saldo_col in row_dict:
-                val = row_dict[saldo_col]
-                if val is not None and str(val).strip() != "":
-                    try:
-                        if float(val) == 0.0: is_zero = True
-                    except: pass
-                    
-        clasif = str(row_dict.get("CLASIFICACION", ""))
-
-        for c_idx, col in enumerate(columnas, start=1):
-            cell = ws.cell(row=r_idx, column=c_idx)
-            
-            # 1. Aplicar color semántico base por columna
-            if col in ["TOTAL_CARGOS", "TOTAL_CARGOS_CANCELADOS", "LIMITE_CREDITO"]:
-                cell.fill = FILL_AZUL
-            elif col in ["TOTAL_ABONOS", "TOTAL_ABONOS_CANCELADOS", "SALDO_VIGENTE", "DISPONIBLE", "FACTURAS_PAGADAS"]:
-                cell.fill = FILL_VERDE
-            elif col in ["SALDO_PENDIENTE", "SALDO_TOTAL", "SALDO", "IMPORTE_AJUSTE"]:
-                cell.fill = FILL_AMARILLO
-            elif col in ["SALDO_VENCIDO", "DIAS_VENCIDO_MAX", "PCT_VENCIDO"]:
-                cell.fill = FILL_ROJO
-            else:
-                # Bandas alternas base
-                if r_idx % 2 == 0: cell.fill = _BAND_FILL
-                else: cell.fill = _WHITE_FILL
-
-            # 2. Overrides (Fuerzan sobre la columna)
-            if clasif == "A": cell.fill = FILL_VERDE
-            elif clasif == "B": cell.fill = FILL_AMARILLO
-            elif clasif == "C": cell.fill = FILL_ROJO
-
-            # 3. Muted Rows (Cuentas Saldadas): recuperando el font atenuado gris
-            if is_zero:
-                cell.fill = _FILL_ZERO
-                cell.font = _FONT_MUTED
-
-            # 4. Total row overrides everything
-            if is_total:
-                cell.fill = _FILL_TOTAL
-                cell.font = _FONT_TOTAL
-
-def _aplicar_bandas_alternas(ws: Any, band_data: Any, n_cols: int) -> None:
-    for i, band_value in enumerate(band_data):
-        row_idx = i + 2
-        fill = PatternFill(start_color="D9E2F3", end_color="D9E2F3", fill_type="solid") if int(band_value) == 0 else _WHITE_FILL
-        for col_idx in range(1, n_cols + 1):
-            ws.cell(row=row_idx, column=col_idx).fill = fill
-
-def _autoajustar_ancho_columnas(ws: Any) -> None:
-    for col_cells in ws.columns:
-        max_length = 0
-        col_letter = col_cells[0].column_letter
-        header_val = col_cells[0].value
-        
-        if header_val:
-            max_length = len(str(header_val))
-            
-        for cell in col_cells[1:]:
-            if cell.value is None or str(cell.value).strip() == "":
-                continue
-            fmt = cell.number_format or ""
-            val = cell.value
-            if "DD/MM/YYYY" in fmt or "YYYY" in fmt:
-                cell_len = 10
-            elif "#,##0" in fmt or "0.00" in fmt:
-                try:
-                    cell_len = len(f"{float(val):,.2f}")
-                except (ValueError, TypeError):
-                    cell_len = len(str(val))
-            elif "%" in fmt:
-                try:
-                    cell_len = len(f"{float(val)*100:.2f}%")
-                except (ValueError, TypeError):
-                    cell_len = len(str(val))
-            else:
-                cell_len = len(str(val))
-            if cell_len > max_length:
-                max_length = cell_len
-                
-        # Centrado horizontal y vertical para Interpretacion y Motivo
-        if str(header_val).upper() in ["INTERPRETACION", "MOTIVO"]:
-            ws.column_dimensions[col_letter].width = 60
-            for cell in col_cells:
-                cell.alignment = Alignment(wrap_text=True, vertical="center", horizontal="center")
+def _estilos_semanticos(df: pd.DataFrame, columnas: list[str]) -> list[tuple[str | None, dict[str, Any]]]:
+    # Relleno que fuerza toda la fila (o None) y fuente de cada fila
+    n_filas = len(df)
+    primera = df.iloc[:, 0].tolist() if columnas else [""] * n_filas
+    clasif = df["CLASIFICACION"].tolist() if "CLASIFICACION" in df.columns else [""] * n_filas
+    saldos = [df[c].tolist() for c in _COLUMNAS_SALDO_CERO if c in df.columns]
+
+    estilos: list[tuple[str | None, dict[str, Any]]] = []
+    for i in range(n_filas):
+        if str(primera[i]).strip().upper() == "TOTAL":
+            estilos.append((_FILL_TOTAL, _FONT_TOTAL))
+        elif any(_es_cero(s[i]) for s in saldos):
+            estilos.append((_FILL_ZERO, _FONT_MUTED))
         else:
-            # Ajuste mas holgado (x1.3) para tipografía Cambria, para evitar que corte nombres de columna largos
-            adjusted_width = int(max_length * 1.3) + 5
-            ws.column_dimensions[col_letter].width = min(max(adjusted_width, 14), 70)
+            estilos.append((_FILLS_CLASIFICACION.get(str(clasif[i])), _FONT_NORMAL))
+    return estilos
+
+def _bloques(df: pd.DataFrame) -> Any:
+    # Columnas de un bloque de filas como listas de Python, un bloque a la vez
+    for inicio in range(0, len(df), _FILAS_POR_BLOQUE):
+        bloque = df.iloc[inicio:inicio + _FILAS_POR_BLOQUE]
+        yield inicio, bloque, [bloque.iloc[:, j].tolist() for j in range(bloque.shape[1])]
+
+def _formato_celda(fmt_col: str | list[str | None] | None, i: int, fmt: str | None) -> str | None:
+    # El formato de columna manda; sin el queda el de to_excel (fechas)
+    if isinstance(fmt_col, list):
+        return fmt_col[i] or fmt
+    return fmt_col or fmt
+
+def _anchos_columnas(df: pd.DataFrame, columnas: list[str], num_formats: list[Any]) -> list[int]:
+    largos = [len(c) for c in columnas]
+    pendientes: list[int] = []
+    for j, fmt_col in enumerate(num_formats):
+        serie = df.iloc[:, j]
+        # Con formato numerico el texto crece con |valor|: basta medir los extremos
+        if isinstance(fmt_col, str) and is_numeric_dtype(serie) and not is_bool_dtype(serie):
+            extremos = [v for v in (serie.max(), serie.min()) if not pd.isna(v)]
+            largos[j] = max([largos[j], *(_largo_celda(v, fmt_col) for v in extremos)])
+        elif is_datetime64_any_dtype(serie) and (fmt_col is None or (isinstance(fmt_col, str) and "YYYY" in fmt_col)):
+            if serie.notna().any():
+                largos[j] = max(largos[j], 10)
+        else:
+            pendientes.append(j)
+
+    if pendientes:
+        for inicio, _, valores in _bloques(df):
+            for j in pendientes:
+                for k, v in enumerate(valores[j]):
+                    val, fmt = _valor_celda(v)
+                    if str(val).strip():
+                        largos[j] = max(largos[j], _largo_celda(val, _formato_celda(num_formats[j], inicio + k, fmt)))
+    return largos
+
+def _largo_celda(val: Any, fmt: str | None) -> int:
+    fmt = fmt or ""
+    if "YYYY" in fmt:
+        return 10
+    if "#,##0" in fmt or "0.00" in fmt:
+        try:
+            return len(f"{float(val):,.2f}")
+        except (ValueError, TypeError):
+            return len(str(val))
+    if "%" in fmt:
+        try:
+            return len(f"{float(val)*100:.2f}%")
+        except (ValueError, TypeError):
+            return len(str(val))
+    return len(str(val))
 
 def _extraer_banda(df: pd.DataFrame) -> tuple[pd.DataFrame, Any]:
     if "_BAND_GROUP" in df.columns:
-        band_data = df["_BAND_GROUP"].values.copy()
+        band_data = df["_BAND_GROUP"].to_numpy()
         return df.drop(columns=["_BAND_GROUP"]), band_data
     return df, None
 
 def _escribir_hoja(
-    writer: Any, nombre_hoja: str, df: pd.DataFrame, band_data: Any = None,
-    protegida: bool = False, password: str = "prac", calc_cols: set[str] | None = None,
+    formatos: _FormatosLibro, nombre_hoja: str, df: pd.DataFrame, band_data: Any = None,
+    protegida: bool = False, password: str = "prac", calc_cols: frozenset[str] | None = None,
 ) -> None:
     sheet_name = nombre_hoja[:31]
-    df.to_excel(writer, sheet_name=sheet_name, index=False)
-    ws = writer.sheets[sheet_name]
+    ws = formatos.libro.add_worksheet(sheet_name)
     n_filas = len(df)
     n_cols = len(df.columns)
     columnas = [str(c) for c in df.columns]
-    
-    _aplicar_formato_encabezado(ws, n_cols, calc_cols=calc_cols)
-    _aplicar_bordes_y_fuente(ws, n_filas, n_cols)
-    _aplicar_formatos_columna(ws, columnas, n_filas, df)
-    
+
+    # Las filas se escriben en orden y con su estilo final (constant_memory)
+    calc_upper = calc_cols or frozenset()
+    texto_largo = [c.upper() in _COLUMNAS_TEXTO_LARGO for c in columnas]
+
+    for col_idx, col_name in enumerate(columnas):
+        relleno = _CALC_HEADER_FILL if col_name.upper() in calc_upper else _HEADER_FILL
+        alineacion = _WRAP_ALIGNMENT if texto_largo[col_idx] else _HEADER_ALIGNMENT
+        ws.write(0, col_idx, _valor_celda(df.columns[col_idx])[0], formatos.obtener(relleno, _HEADER_FONT, None, alineacion))
+
+    # Formatos y anchos se calculan de la columna completa; las celdas se
+    # convierten y escriben por bloques de filas
+    num_formats = [_formato_numero_columna(c, df) for c in columnas]
+    alineaciones = [_WRAP_ALIGNMENT if t else None for t in texto_largo]
+
+    for col_idx, largo in enumerate(_anchos_columnas(df, columnas, num_formats)):
+        if texto_largo[col_idx]:
+            ws.set_column(col_idx, col_idx, 60)
+        else:
+            # Ajuste mas holgado (x1.3) para tipografía Cambria, para evitar que corte nombres de columna largos
+            ws.set_column(col_idx, col_idx, min(max(int(largo * 1.3) + 5, 14), 70))
+
     if band_data is not None:
-        _aplicar_bandas_alternas(ws, band_data, n_cols)
+        fills_columna: list[str | None] = [None] * n_cols
     else:
-        _aplicar_estilos_semanticos(ws, df, columnas)
-        
-    _autoajustar_ancho_columnas(ws)
-    ws.sheet_view.showGridLines = False
-    
+        fills_columna = [_FILLS_COLUMNA.get(c) for c in columnas]
+
+    for inicio, bloque, valores in _bloques(df):
+        if band_data is not None:
+            rellenos = np.where(np.asarray(band_data[inicio:inicio + len(bloque)]).astype(int) == 0, _GROUP_FILL, _WHITE_FILL).tolist()
+            estilos_fila = [(relleno, _FONT_NORMAL) for relleno in rellenos]
+        else:
+            estilos_fila = _estilos_semanticos(bloque, columnas)
+
+        for k, (fila_fill, fuente) in enumerate(estilos_fila):
+            i = inicio + k
+            banda = _BAND_FILL if i % 2 == 0 else _WHITE_FILL
+            for col_idx in range(n_cols):
+                val, fmt = _valor_celda(valores[col_idx][k])
+                relleno = fila_fill or fills_columna[col_idx] or banda
+                formato = formatos.obtener(relleno, fuente, _formato_celda(num_formats[col_idx], i, fmt), alineaciones[col_idx])
+                ws.write(i + 1, col_idx, val, formato)
+
+    ws.hide_gridlines(2)
+
     if protegida:
-        ws.protection.sheet = True
-        ws.protection.password = password
-        
+        ws.protect(password)
+
     logger.info("  Hoja '%s': %d filas%s", sheet_name, n_filas, " (protegida)" if protegida else "")
 
 def _exportar_excel(
     dataframes: dict[str, pd.DataFrame], nombre_base: str, timestamp: str, output_dir: Path,
-    orden_hojas: list[str], cols_calc_por_hoja: dict[str, set[str]] | None = None,
+    orden_hojas: list[str], cols_calc_por_hoja: dict[str, frozenset[str]] | None = None,
 ) -> Path:
     output_dir.mkdir(parents=True, exist_ok=True)
     filepath = output_dir / f"{nombre_base}_{timestamp}.xlsx"
     cols_calc_por_hoja = cols_calc_por_hoja or {}
-    
-    with pd.ExcelWriter(filepath, engine=EXCEL_ENGINE) as writer:
+
+    with pd.ExcelWriter(filepath, engine="xlsxwriter", engine_kwargs=EXCEL_ENGINE_KWARGS) as writer:
+        formatos = _FormatosLibro(writer.book)
         for nombre_hoja in orden_hojas:
             df = dataframes.get(nombre_hoja)
             if df is None or not isinstance(df, pd.DataFrame) or df.empty:
                 continue
-            df, band_data = _extraer_banda(df.copy())
+            df, band_data = _extraer_banda(df)
             protegida = nombre_hoja in PESTANAS_PROTEGIDAS
             password = SHEET_PASSWORDS.get(nombre_hoja, "")
             calc_cols = cols_calc_por_hoja.get(nombre_hoja)
-            _escribir_hoja(writer, nombre_hoja, df, band_data, protegida, password, calc_cols=calc_cols)
-            
+            _escribir_hoja(formatos, nombre_hoja, df, band_data, protegida, password, calc_cols=calc_cols)
+
     logger.info("Excel exportado: %s", filepath)
     return filepath
 
@@ -551,9 +601,8 @@ def run_pipeline(skip_audit: bool = False, skip_analytics: bool = False, skip_kp
         logger.info("=" * 60)
         logger.info("PASO 3: Auditoria y deteccion de anomalias")
         logger.info("=" * 60)
-        reporte_cxc_df = resultado_reporte.get("reporte_cxc", pd.DataFrame())
         auditor = Auditor(ANOMALIAS)
-        audit_result = auditor.run_audit(df, df_reporte=reporte_cxc_df)
+        audit_result = auditor.run_audit(df, df_reporte=resultado_reporte.get("reporte_cxc", pd.DataFrame()))
         auditoria = {
             "calidad_datos":     audit_result.calidad_datos,
             "importes_atipicos": audit_result.importes_atipicos,
@@ -563,6 +612,10 @@ def run_pipeline(skip_audit: bool = False, skip_analytics: bool = False, skip_kp
             "sin_vendedor":      audit_result.sin_vendedor,
         }
 
+    # El crudo y el reporte intermedio ya no se usan: se liberan antes de los
+    # pasos que mas memoria ocupan (analisis, PDF y exportacion)
+    del df, resultado_reporte
+
     analisis: dict[str, pd.DataFrame] = {}
     if not skip_analytics:
         logger.info("=" * 60)
@@ -590,6 +643,9 @@ def run_pipeline(skip_audit: bool = False, skip_analytics: bool = False, skip_kp
         logger.info("PASO 4b: Generando PDF de analisis")
         logger.info("=" * 60)
         try:
+            # Import diferido: matplotlib/reportlab solo se cargan si hay PDF
+            from src.reporte_pdf import generar_reporte_pdf
+
             ts_legible = datetime.now().strftime("%Y-%m-%d %H:%M")
             pdf_path = OUTPUT_DIR / f"{EXCEL_NOMBRES['pdf']}_{timestamp}.pdf"
             generar_reporte_pdf(analisis_pdf, pdf_path, ts_legible)
@@ -27,7 +27,7 @@ import pandas as pd
 
 logger = logging.getLogger(__name__)
 
-_CANCELADO_VALUES: list[Any] = ["S", "SI", "s", "si", 1, True, "1"]
+_CANCELADO_VALUES: frozenset[Any] = frozenset({"S", "SI", "s", "si", 1, True, "1"})
 """Valores que Microsip usa para marcar documentos como cancelados."""
 
 
@@ -8,6 +8,7 @@ from pathlib import Path
 from typing import Any, Generator
 
 import pandas as pd
+import pyarrow as pa
 
 logger = logging.getLogger(__name__)
 
@@ -24,6 +25,9 @@ class FirebirdConnector:
             parámetros de conexión a la base de datos.
     """
 
+    # Filas leídas del cursor en cada llamada a fetchmany
+    TAMANO_LOTE: int = 50_000
+
     def __init__(self, config: dict[str, str | int]) -> None:
         """Inicializa el conector con la configuración proporcionada.
 
@@ -113,6 +117,13 @@ class FirebirdConnector:
     def execute_query(self, sql: str) -> pd.DataFrame:
         """Ejecuta una consulta SQL y devuelve los resultados en un DataFrame.
 
+        Las filas se leen del cursor en lotes de ``TAMANO_LOTE`` y cada lote
+        se convierte de inmediato a una tabla Arrow columnar, de modo que
+        nunca se mantiene en memoria la lista completa de tuplas. Si algún
+        lote trae tipos que Arrow no puede representar (por ejemplo una
+        columna con valores mixtos), ese lote y los siguientes se construyen
+        con el constructor normal de pandas.
+
         Args:
             sql (str): La cadena de la consulta SQL a ejecutar. Debe ser
                 preferentemente una consulta de selección simple para ocultar
@@ -121,17 +132,67 @@ class FirebirdConnector:
         Returns:
             pd.DataFrame: Un DataFrame de pandas con los resultados de la consulta.
         """
+        lotes_arrow: list[pa.Table] = []
+        lotes_pandas: list[pd.DataFrame] = []
+
         with self.connect() as conn:
             logger.info("Ejecutando consulta (%d caracteres)...", len(sql))
             cursor = conn.cursor()
             cursor.execute(sql)
             cols = [desc[0] for desc in cursor.description]
-            rows = cursor.fetchall()
+            while True:
+                rows = cursor.fetchmany(self.TAMANO_LOTE)
+                if not rows:
+                    break
+                if not lotes_pandas:
+                    try:
+                        lotes_arrow.append(self._lote_a_arrow(rows, cols))
+                        continue
+                    except (pa.ArrowInvalid, pa.ArrowTypeError) as e:
+                        logger.warning("Lote no convertible a Arrow, se usa pandas: %s", e)
+                lotes_pandas.append(pd.DataFrame(rows, columns=cols))
             cursor.close()
-            df = pd.DataFrame(rows, columns=cols)
-            logger.info("Consulta ejecutada - %d filas x %d columnas", *df.shape)
+
+        partes: list[pd.DataFrame] = []
+        if lotes_arrow:
+            try:
+                tablas = [pa.concat_tables(lotes_arrow, promote_options="permissive")]
+            except (pa.ArrowInvalid, pa.ArrowTypeError) as e:
+                # Lotes con tipos incompatibles entre sí: se unen en pandas
+                logger.warning("Lotes Arrow incompatibles, se unen en pandas: %s", e)
+                tablas = lotes_arrow
+            partes.extend(
+                t.to_pandas(split_blocks=True, coerce_temporal_nanoseconds=True)
+                for t in tablas
+            )
+        partes.extend(lotes_pandas)
+
+        if not partes:
+            df = pd.DataFrame(columns=cols)
+        elif len(partes) == 1:
+            df = partes[0]
+        else:
+            df = pd.concat(partes, ignore_index=True)
+        logger.info("Consulta ejecutada - %d filas x %d columnas", *df.shape)
         return df
 
+    @staticmethod
+    def _lote_a_arrow(rows: list[tuple], cols: list[str]) -> pa.Table:
+        """Transpone un lote de filas del cursor a una tabla Arrow.
+
+        Args:
+            rows (list[tuple]): Filas devueltas por ``fetchmany``.
+            cols (list[str]): Nombres de las columnas del cursor.
+
+        Returns:
+            pa.Table: Tabla columnar con el lote.
+
+        Raises:
+            pa.ArrowInvalid: Si alguna columna mezcla tipos incompatibles.
+        """
+        columnas = zip(*rows)
+        return pa.Table.from_arrays([pa.array(col) for col in columnas], names=cols)
+
     def execute_sql_file(self, sql_path: str | Path) -> pd.DataFrame:
         """Lee y ejecuta el contenido de un archivo SQL.
 
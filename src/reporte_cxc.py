@@ -306,7 +306,7 @@ def _seleccionar_columnas(df: pd.DataFrame, columnas: list[str]) -> pd.DataFrame
     cols: list[str] = [c for c in columnas if c in df.columns]
     return df[cols].copy()
 
-_CANCELADO_VALUES: list[Any] = ["S", "SI", "s", "si", 1, True, "1"]
+_CANCELADO_VALUES: frozenset[Any] = frozenset({"S", "SI", "s", "si", 1, True, "1"})
 
 def _obtener_por_acreditar(df: pd.DataFrame) -> pd.DataFrame:
     if "TIPO_IMPTE" not in df.columns:
@@ -377,6 +377,44 @@ def _calcular_saldo_cliente(df: pd.DataFrame) -> pd.DataFrame:
 # FUNCIONES INTERNAS — METRICAS DE CICLO (CON INTEGRACIÓN DINÁMICA)
 # ======================================================================
 
+def _clasificar_rangos(
+    dias: Any,
+    rangos: list[tuple[int | None, int | None, str]],
+    default: str = "",
+) -> np.ndarray:
+    """Etiqueta cada valor de dias con el rango que lo contiene.
+
+    Los rangos de settings estan ordenados y no se traslapan, asi que
+    basta una busqueda binaria sobre los limites superiores por valor en
+    lugar de evaluar una mascara completa por rango con ``np.select``.
+    Si los rangos no cumplen esa condicion se usa ``np.select``.
+
+    Args:
+        dias: Serie o arreglo de dias; NaN recibe ``default``.
+        rangos: Tuplas ``(min, max, etiqueta)``; None es extremo abierto.
+        default: Etiqueta para valores fuera de todos los rangos.
+
+    Returns:
+        Arreglo de etiquetas alineado con ``dias``.
+    """
+    bajos = np.array([-np.inf if lo is None else lo for lo, _, _ in rangos], dtype=float)
+    altos = np.array([np.inf if hi is None else hi for _, hi, _ in rangos], dtype=float)
+    etiquetas = np.array([label for _, _, label in rangos] + [default], dtype=object)
+    valores = np.asarray(dias, dtype=float)
+
+    if np.all(bajos <= altos) and np.all(altos[:-1] < bajos[1:]):
+        # NaN y valores sobre el ultimo maximo caen en len(rangos)
+        idx = np.searchsorted(altos, valores, side="left")
+        fuera = idx == len(rangos)
+        idx[fuera] = 0
+        fuera |= valores < bajos[idx]
+        idx[fuera] = len(rangos)
+        return etiquetas[idx]
+
+    condiciones = [(valores >= lo) & (valores <= hi) for lo, hi in zip(bajos, altos)]
+    return np.select(condiciones, etiquetas[:-1], default=default)
+
+
 def _calcular_metricas_ciclo(df: pd.DataFrame) -> pd.DataFrame:
     df = df.copy()
     hoy = pd.Timestamp.now().normalize()
@@ -399,18 +437,7 @@ def _calcular_metricas_ciclo(df: pd.DataFrame) -> pd.DataFrame:
         recaudo_dias = ((fecha_ultimo.values - df.loc[pagadas, "FECHA_VENCIMIENTO"].values) / np.timedelta64(1, "D"))
         df.loc[pagadas, "DELTA_RECAUDO"] = recaudo_dias
 
-        cond_recaudo = []
-        cat_recaudo = []
-        for min_d, max_d, label in RANGOS_RECAUDO:
-            if min_d is None and max_d is not None:
-                cond_recaudo.append(recaudo_dias <= max_d)
-            elif max_d is None and min_d is not None:
-                cond_recaudo.append(recaudo_dias >= min_d)
-            else:
-                cond_recaudo.append((recaudo_dias >= min_d) & (recaudo_dias <= max_d))
-            cat_recaudo.append(label)
-
-        df.loc[pagadas, "CATEGORIA_RECAUDO"] = np.select(cond_recaudo, cat_recaudo, default="")
+        df.loc[pagadas, "CATEGORIA_RECAUDO"] = _clasificar_rangos(recaudo_dias, RANGOS_RECAUDO)
 
     # DELTA_MORA
     abiertas = es_cargo & (df["SALDO_FACTURA"] > 0)
@@ -419,18 +446,7 @@ def _calcular_metricas_ciclo(df: pd.DataFrame) -> pd.DataFrame:
         mora_dias = (hoy - df.loc[abiertas, "FECHA_VENCIMIENTO"]).dt.days
         df.loc[abiertas, "DELTA_MORA"] = mora_dias
 
-        cond_mora = []
-        cat_mora = []
-        for min_d, max_d, label in RANGOS_ANTIGUEDAD:
-            if min_d is None and max_d is not None:
-                cond_mora.append(mora_dias <= max_d)
-            elif max_d is None and min_d is not None:
-                cond_mora.append(mora_dias >= min_d)
-            else:
-                cond_mora.append((mora_dias >= min_d) & (mora_dias <= max_d))
-            cat_mora.append(label)
-
-        df.loc[abiertas, "CATEGORIA_MORA"] = np.select(cond_mora, cat_mora, default="")
+        df.loc[abiertas, "CATEGORIA_MORA"] = _clasificar_rangos(mora_dias, RANGOS_ANTIGUEDAD)
 
     return df
 
@@ -121,7 +121,8 @@ def _crear_tabla_estilo_financiero(df: pd.DataFrame, col_widths: list[float] | N
         fila_formateada = []
         for col_name, val in zip(df.columns, row):
             col_upper = str(col_name).upper()
-            if pd.isna(val):
+            # NaN/NaT son distintos de sí mismos: evita pd.isna por celda
+            if val is None or val is pd.NA or val != val:
                 fila_formateada.append("")
             elif "PCT" in col_upper or col_upper == "VALOR" and isinstance(val, (float, int)) and val <= 1.0:
                 try:
@@ -227,7 +228,7 @@ def _seccion_vencido_vs_vigente(df: pd.DataFrame, moneda: str, story: list[Any])
     )
     story.append(Paragraph(texto, _STYLE_BODY))
 
-    df_plot = df[df["ESTATUS_VENCIMIENTO"].str.upper() != "TOTAL"].copy()
+    df_plot = df[df["ESTATUS_VENCIMIENTO"].str.upper() != "TOTAL"]
     
     if not df_plot.empty and df_plot["SALDO_PENDIENTE"].sum() > 0:
         fig, ax = plt.subplots(figsize=(8, 3.5))
@@ -271,7 +272,7 @@ def _seccion_antiguedad(df: pd.DataFrame, moneda: str, story: list[Any]) -> None
     )
     story.append(Paragraph(texto, _STYLE_BODY))
 
-    df_plot = df[df["RANGO_ANTIGUEDAD"].str.upper() != "TOTAL"].copy()
+    df_plot = df[df["RANGO_ANTIGUEDAD"].str.upper() != "TOTAL"]
     
     if not df_plot.empty and df_plot["SALDO_PENDIENTE"].sum() > 0:
         fig, ax = plt.subplots(figsize=(10, 3.5))
@@ -326,9 +327,9 @@ def _seccion_concentracion(df: pd.DataFrame, moneda: str, story: list[Any]) -> N
     )
     story.append(Paragraph(texto, _STYLE_BODY))
 
-    df_plot = df[df["NOMBRE_CLIENTE"].str.upper() != "TOTAL"].copy()
+    df_plot = df[df["NOMBRE_CLIENTE"].str.upper() != "TOTAL"]
     if not df_plot.empty:
-        top_n = df_plot.head(10).copy()
+        top_n = df_plot.head(10)
         fig, ax1 = plt.subplots(figsize=(10, 3.5))
         
         ax1.bar(
@@ -110,6 +110,7 @@ def main() -> int:
         "pandas": "pandas",
         "numpy": "numpy",
         "openpyxl": "openpyxl",
+        "xlsxwriter": "xlsxwriter",
         "streamlit": "streamlit",
         "dotenv": "dotenv",
     }
@@ -381,25 +381,89 @@ class TestNivel1:
     # EXPORTACION EXCEL
     # ------------------------------------------------------------------
     def test_exportacion_excel(self) -> None:
-        _subheader("main.py - exportar_cuatro_exceles()")
+        _subheader("main.py - exportar_tres_exceles()")
         try:
             import tempfile
-            from main import exportar_cuatro_exceles
-
-            cxc = {"movimientos_abiertos_cxc": pd.DataFrame({"A": [1]})}
+            from openpyxl import load_workbook
+            from main import exportar_tres_exceles
+
+            hoy = pd.Timestamp(datetime.now().date())
+            cxc = {
+                "registros_por_acreditar_cxc": pd.DataFrame({
+                    "FOLIO":         ["FAC-0001", "REC-0002", "FAC-0003"],
+                    "IMPORTE":       [1500.0, -250.5, 98765.43],
+                    "FECHA_EMISION": [hoy, hoy, hoy],
+                    "_BAND_GROUP":   [0, 0, 1],
+                }),
+            }
             audit = {"calidad_datos": pd.DataFrame({"B": [2]})}
-            analisis = {"antiguedad_cartera": pd.DataFrame({"C": [3]})}
-            kpis = {"kpis_resumen": pd.DataFrame({"D": [4]})}
+            analisis = {
+                "antiguedad_por_cliente_mxn": pd.DataFrame({
+                    "NOMBRE_CLIENTE": ["EMPRESA ALPHA SA", "COMERCIAL BETA SC", "TOTAL"],
+                    "SALDO":          [1234.5, 0.0, 1234.5],
+                    "CLASIFICACION":  ["A", "B", ""],
+                    "NUM_FACTURAS":   [3, 1, 4],
+                }),
+            }
+            kpis = {
+                "kpis_resumen_mxn": pd.DataFrame({
+                    "KPI":    ["DSO", "CEI"],
+                    "VALOR":  [45.2, 0.85],
+                    "UNIDAD": ["dias", "%"],
+                }),
+            }
+
+            def relleno(celda) -> str:
+                return str(celda.fill.fgColor.rgb)[-6:]
+
+            def ancho(ws, letra: str) -> float:
+                return ws.column_dimensions[letra].width
 
             with tempfile.TemporaryDirectory() as tmpdir:
                 tmp_path = Path(tmpdir)
-                archivos = exportar_cuatro_exceles(
+                archivos = exportar_tres_exceles(
                     cxc, audit, analisis, kpis, "TEST", tmp_path
                 )
 
-                self._assert(len(archivos) == 4, "Cuatro archivos independientes generados")
+                self._assert(len(archivos) == 3, "Tres archivos independientes generados")
                 self._assert(all(p.exists() for p in archivos), "Archivos fisicamente escritos")
 
+                # Hoja con bandas de grupo
+                ws = load_workbook(archivos[0])["registros_por_acreditar_cxc"]
+                self._assert(
+                    [c.value for c in ws[1]] == ["FOLIO", "IMPORTE", "FECHA_EMISION"],
+                    "Columna _BAND_GROUP omitida del encabezado",
+                )
+                self._assert(
+                    [relleno(ws.cell(r, 1)) for r in (2, 3, 4)] == ["D9E2F3", "D9E2F3", "FFFFFF"],
+                    "Relleno alterno por grupo de banda",
+                )
+                self._assert(ws.cell(2, 2).number_format == "#,##0.00", "Formato moneda en IMPORTE")
+                self._assert(ws.cell(2, 3).number_format == "DD/MM/YYYY", "Formato fecha en FECHA_EMISION")
+                self._assert(not ws.protection.sheet, "Hoja por acreditar sin proteccion")
+                self._assert(abs(ancho(ws, "B") - 16) < 1, "Ancho de IMPORTE segun su valor mas largo")
+                self._assert(abs(ancho(ws, "C") - 21) < 1, "Ancho de FECHA_EMISION segun su encabezado")
+
+                libro_analisis = load_workbook(archivos[1])
+
+                # Hoja con rellenos semanticos (clasificacion, saldo cero, TOTAL)
+                ws = libro_analisis["antiguedad_por_cliente_mxn"]
+                self._assert(relleno(ws.cell(2, 1)) == "E2EFDA", "Clasificacion A en verde")
+                self._assert(relleno(ws.cell(3, 2)) == "D9D9D9", "Fila con saldo cero en gris")
+                self._assert(ws.cell(3, 2).font.color.rgb[-6:] == "808080", "Saldo cero con fuente atenuada")
+                self._assert(
+                    relleno(ws.cell(4, 1)) == "A6A6A6" and ws.cell(4, 1).font.b,
+                    "Fila TOTAL resaltada en negritas",
+                )
+                self._assert(ws.cell(2, 2).number_format == "#,##0.00", "Formato moneda en SALDO")
+                self._assert(ws.cell(2, 4).number_format == "#,##0", "Formato entero en NUM_FACTURAS")
+                self._assert(abs(ancho(ws, "A") - 27) < 1, "Ancho de NOMBRE_CLIENTE segun su contenido")
+
+                # Hoja de KPIs: VALOR toma el formato de su UNIDAD
+                ws = libro_analisis["kpis_resumen_mxn"]
+                self._assert(ws.cell(2, 2).number_format == "General", "VALOR en dias sin formato porcentual")
+                self._assert(ws.cell(3, 2).number_format == "0.00%", "VALOR con UNIDAD % como porcentaje")
+
         except Exception as e:
             _fail("Error en exportacion Excel", traceback.format_exc())
             self.failed += 1